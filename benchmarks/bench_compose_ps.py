@@ -0,0 +1,79 @@
+"""
+Benchmark ComposeTools.compose_ps: compose CLI subprocess vs Docker API labels.
+
+Seeds a compose project in the fake daemon, then times both paths. The CLI
+path is only measured when `docker compose` / `docker-compose` is installed;
+it talks to the same fake daemon through DOCKER_HOST.
+
+Usage:
+    python -m benchmarks.bench_compose_ps --services 5 --replicas 3 --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.fake_daemon import FakeDockerDaemon
+from tools.compose_tools import ComposeTools
+
+
+def _time(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, samples
+
+
+def _report(label: str, samples) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    print(f"{label:<6} {statistics.median(ordered) * 1000:>10.2f} {p95 * 1000:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--services", type=int, default=5)
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--containers", type=int, default=200, help="unrelated containers")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as project_dir, \
+            FakeDockerDaemon(containers=args.containers) as daemon:
+        with open(os.path.join(project_dir, "compose.yaml"), "w") as f:
+            f.write("name: benchproj\nservices: {}\n")
+        daemon.add_compose_project(
+            "benchproj", project_dir, [f"svc{i}" for i in range(args.services)], args.replicas
+        )
+        os.environ["DOCKER_HOST"] = f"unix://{daemon.socket_path}"
+
+        tools = ComposeTools()
+        try:
+            has_cli = bool(tools._compose_cmd)
+        except RuntimeError:
+            has_cli = False
+            print("compose CLI not installed; measuring API path only")
+
+        print(f"{'path':<6} {'p50_ms':>10} {'p95_ms':>10}")
+        api_rows, api_samples = _time(
+            lambda: tools.compose_ps(project_dir, all_containers=True, use_api=True), args.runs
+        )
+        _report("api", api_samples)
+        if has_cli:
+            cli_rows, cli_samples = _time(
+                lambda: tools.compose_ps(project_dir, all_containers=True), args.runs
+            )
+            _report("cli", cli_samples)
+            if sorted(r.get("id") for r in cli_rows) != sorted(r["id"] for r in api_rows):
+                print("warning: CLI and API paths returned different containers")
+        print(f"rows={len(api_rows)}")
+        tools.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark ContainerTools.get_container_list against a fake daemon.
+
+Compares API round-trips and latency of the batched listing with the previous
+per-container approach (containers.list + container.image.tags).
+
+Usage:
+    python -m benchmarks.bench_container_list --containers 400 --images 40
+"""
+
+import argparse
+import os
+import time
+
+import docker
+
+from benchmarks.fake_daemon import FakeDockerDaemon
+from tools.container_tools import ContainerTools
+
+
+def _legacy_list(client: docker.DockerClient):
+    return [
+        {
+            "id": c.id,
+            "name": c.name,
+            "status": c.status,
+            "image": c.image.tags[0] if c.image.tags else "unknown",
+        }
+        for c in client.containers.list(all=True)
+    ]
+
+
+def _measure(daemon: FakeDockerDaemon, fn):
+    daemon.reset_counts()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    return result, elapsed, daemon.total_requests()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--containers", type=int, default=400)
+    parser.add_argument("--images", type=int, default=40)
+    args = parser.parse_args()
+
+    with FakeDockerDaemon(containers=args.containers, images=args.images) as daemon:
+        os.environ["DOCKER_HOST"] = f"unix://{daemon.socket_path}"
+        tools = ContainerTools()
+        client = docker.from_env()
+        try:
+            legacy, legacy_s, legacy_calls = _measure(daemon, lambda: _legacy_list(client))
+            batched, batched_s, batched_calls = _measure(daemon, tools.get_container_list)
+        finally:
+            client.close()
+            tools.close()
+
+    assert legacy == batched, "batched listing differs from per-container listing"
+    print(f"containers={args.containers} images={args.images}")
+    print(f"{'path':<10} {'api_calls':>10} {'seconds':>10}")
+    print(f"{'legacy':<10} {legacy_calls:>10} {legacy_s:>10.4f}")
+    print(f"{'batched':<10} {batched_calls:>10} {batched_s:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Benchmark every public method of the container, image, network and volume tools.
+
+For each size N the fake daemon is started in a child process (so only
+client-side time and allocations are measured here) and seeded with N
+containers, images, networks and volumes. Each method is called once cold,
+then --runs more times for latency percentiles; one extra call under
+tracemalloc records the peak client-side allocation. API round-trips are
+counted by the daemon per endpoint.
+
+Methods that change state get fresh targets from an untimed setup step
+(e.g. a new container to remove). The prune methods run last, since they
+delete part of the seeded state. Results are written as JSON; pass an
+earlier file as --baseline to print the differences.
+
+Usage:
+    python -m benchmarks.bench_tools --sizes 10,1000,10000 --output results.json
+    python -m benchmarks.bench_tools --sizes 1000 --methods list,info --baseline results.json
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.fake_daemon import FakeDaemonProcess, _hex_id
+from tools.container_tools import ContainerTools
+from tools.docker_client import ClientRegistry
+from tools.image_tools import ImageTools
+from tools.network_tools import NetworkTools
+from tools.volume_tools import VolumeTools
+
+
+TOOL_CLASSES = (ContainerTools, ImageTools, NetworkTools, VolumeTools)
+BACKUP_FILES = 8
+BACKUP_FILE_SIZE = 128 * 1024
+
+
+class Env:
+    """Per-size state shared by the cases: the daemon proxy, tools and target names."""
+
+    def __init__(self, fake: FakeDaemonProcess, size: int, workdir: str, tools: Dict[type, Any]):
+        self.fake = fake
+        self.size = size
+        self.workdir = workdir
+        self.tools = tools
+        self._counter = itertools.count()
+        mid = size // 2
+        # Even-numbered seeded containers are running and mount a volume.
+        running = mid - mid % 2
+        self.running = f"container-{running}"
+        self.running_id = _hex_id("container", running)
+        self.container = f"container-{mid}"
+        self.image = f"image{mid}:latest"
+        self.network = f"network-{mid}"
+        self.volume = f"volume-{mid}"
+        self.data_volume = "bench-data"
+        self.backup_file: Optional[str] = None
+        self.backup_dir: Optional[str] = None
+
+    def unique(self, prefix: str) -> str:
+        return f"{prefix}-{next(self._counter)}"
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+    def new_volume(self) -> str:
+        name = self.unique("vol")
+        self.fake.add_volume(name)
+        return name
+
+    def containers(self, count: int, state: str) -> Dict[str, Any]:
+        """Seed labelled containers for the batch methods; returns their label selector."""
+        label = self.unique("batch")
+        for _ in range(count):
+            self.fake.add_container(self.unique("batch-c"), state=state, labels={"bench": label})
+        return {"label": f"bench={label}"}
+
+    def network_with_container(self) -> Dict[str, Any]:
+        name = self.unique("net")
+        network_id = self.fake.add_network(name)
+        self.fake.connect_network(network_id, self.running_id)
+        return {"network_identifier": name, "container_identifier": self.running}
+
+    def backup(self) -> Dict[str, Any]:
+        if self.backup_file is None:
+            self.backup_file = self.path("restore-source.tar.gz")
+            self.tools[VolumeTools].backup_volume(self.data_volume, self.backup_file)
+        return {"volume_identifier": self.data_volume, "backup_path": self.backup_file}
+
+    def backups(self) -> Dict[str, Any]:
+        if self.backup_dir is None:
+            self.backup_dir = self.path("restore-batch")
+            self.tools[VolumeTools].backup_volumes(self.backup_dir, [self.data_volume, self.volume])
+        return {"backup_dir": self.backup_dir}
+
+
+Setup = Callable[[Env], Dict[str, Any]]
+
+
+class Case(NamedTuple):
+    tool: type
+    method: str
+    setup: Setup = lambda env: {}
+    teardown: Optional[Callable[[Env, Dict[str, Any]], None]] = None
+    skip: Optional[str] = None
+
+
+def _watch(env: Env) -> Dict[str, Any]:
+    env.tools[ContainerTools].watch_container_stats([env.running])
+    return {"container_identifier": env.running}
+
+
+def _unwatch(env: Env, kwargs: Dict[str, Any]) -> None:
+    env.tools[ContainerTools].unwatch_container_stats([env.running])
+
+
+CASES: List[Case] = [
+    # ContainerTools
+    Case(ContainerTools, "get_container_list"),
+    Case(ContainerTools, "get_container_info", lambda env: {"container_identifier": env.container}),
+    Case(ContainerTools, "get_container_logs", lambda env: {"container_identifier": env.running}),
+    Case(ContainerTools, "stream_container_logs", lambda env: {"container_identifier": env.running}),
+    Case(ContainerTools, "get_container_stats", lambda env: {"container_identifier": env.running}),
+    Case(ContainerTools, "watch_container_stats", lambda env: {"container_identifiers": [env.running]},
+         teardown=_unwatch),
+    Case(ContainerTools, "unwatch_container_stats",
+         lambda env: {"container_identifiers": [_watch(env)["container_identifier"]]}),
+    Case(ContainerTools, "get_container_stats_summary", _watch, teardown=_unwatch),
+    Case(ContainerTools, "run_container", lambda env: {"image": env.image, "name": env.unique("run")}),
+    Case(ContainerTools, "start_container",
+         lambda env: {"container_identifier": env.fake.add_container(env.unique("start"), state="exited")}),
+    Case(ContainerTools, "stop_container",
+         lambda env: {"container_identifier": env.fake.add_container(env.unique("stop"))}),
+    Case(ContainerTools, "restart_container",
+         lambda env: {"container_identifier": env.fake.add_container(env.unique("restart"))}),
+    Case(ContainerTools, "remove_container",
+         lambda env: {"container_identifier": env.fake.add_container(env.unique("rm"), state="exited")}),
+    Case(ContainerTools, "start_containers", lambda env: env.containers(5, "exited")),
+    Case(ContainerTools, "stop_containers", lambda env: env.containers(5, "running")),
+    Case(ContainerTools, "restart_containers", lambda env: env.containers(5, "running")),
+    Case(ContainerTools, "remove_containers", lambda env: env.containers(5, "exited")),
+    Case(ContainerTools, "exec_in_container",
+         lambda env: {"container_identifier": env.running, "command": "echo hello"}),
+    Case(ContainerTools, "stream_exec",
+         lambda env: {"container_identifier": env.running, "command": "echo hello"}),
+    # ImageTools
+    Case(ImageTools, "get_image_list"),
+    Case(ImageTools, "get_image_info", lambda env: {"image_identifier": env.image}),
+    Case(ImageTools, "get_image_history", lambda env: {"image_identifier": env.image}),
+    Case(ImageTools, "get_image_disk_usage"),
+    Case(ImageTools, "pull_image", lambda env: {"image_name": env.unique("pulled")}),
+    Case(ImageTools, "iter_pull_progress", lambda env: {"reference": env.unique("pulled") + ":1.0"}),
+    Case(ImageTools, "pull_images",
+         lambda env: {"references": [env.unique("pulled") for _ in range(3)]}),
+    Case(ImageTools, "remove_image",
+         lambda env: {"image_identifier": env.fake.add_image(env.unique("rmimg") + ":latest")}),
+    Case(ImageTools, "search_images", lambda env: {"term": "nginx"}),
+    # NetworkTools
+    Case(NetworkTools, "get_network_list"),
+    Case(NetworkTools, "get_network_info", lambda env: {"network_identifier": env.network}),
+    Case(NetworkTools, "create_network", lambda env: {"name": env.unique("net")}),
+    Case(NetworkTools, "remove_network",
+         lambda env: {"network_identifier": env.fake.add_network(env.unique("net"))}),
+    Case(NetworkTools, "connect_container",
+         lambda env: {"network_identifier": env.fake.add_network(env.unique("net")),
+                      "container_identifier": env.running}),
+    Case(NetworkTools, "disconnect_container", lambda env: env.network_with_container()),
+    # VolumeTools
+    Case(VolumeTools, "get_volume_list"),
+    Case(VolumeTools, "get_volume_info", lambda env: {"volume_identifier": env.volume}),
+    Case(VolumeTools, "create_volume", lambda env: {"name": env.unique("vol")}),
+    Case(VolumeTools, "remove_volume",
+         lambda env: {"volume_identifier": env.new_volume()}),
+    Case(VolumeTools, "get_volumes_by_container", lambda env: {"container_identifier": env.running}),
+    Case(VolumeTools, "get_volume_usage", lambda env: {"volume_identifier": env.volume}),
+    Case(VolumeTools, "get_all_volume_usage"),
+    Case(VolumeTools, "backup_volume",
+         lambda env: {"volume_identifier": env.data_volume, "backup_path": env.path(env.unique("b") + ".tar.gz")}),
+    Case(VolumeTools, "restore_volume", lambda env: env.backup()),
+    Case(VolumeTools, "backup_volumes",
+         lambda env: {"backup_dir": env.path(env.unique("batch")), "volume_identifiers": [env.data_volume, env.volume]}),
+    Case(VolumeTools, "restore_volumes", lambda env: env.backups()),
+    Case(VolumeTools, "backup_volume_incremental",
+         lambda env: {"volume_identifier": env.data_volume, "store_dir": env.path("chunks")}),
+    Case(VolumeTools, "restore_volume_incremental",
+         lambda env: {"volume_identifier": env.data_volume, "store_dir": env.path("chunks")}),
+    # Last: these delete seeded objects.
+    Case(ContainerTools, "prune_containers"),
+    Case(NetworkTools, "prune_networks"),
+    Case(VolumeTools, "prune_volumes"),
+]
+
+
+def uncovered_methods() -> List[str]:
+    """Public tool methods without a case (reported, so new methods are not silently missed)."""
+    covered = {(case.tool, case.method) for case in CASES}
+    return [
+        f"{cls.__name__}.{name}"
+        for cls in TOOL_CLASSES
+        for name, _ in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_") and name != "close" and (cls, name) not in covered
+    ]
+
+
+def _call(env: Env, case: Case, kwargs: Dict[str, Any]) -> Any:
+    result = getattr(env.tools[case.tool], case.method)(**kwargs)
+    if inspect.isgenerator(result):
+        result = list(result)
+    return result
+
+
+def _items(result: Any) -> Optional[int]:
+    return len(result) if isinstance(result, (list, dict, str)) else None
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[max(int(round(len(ordered) * fraction)) - 1, 0)]
+
+
+def _measure(env: Env, case: Case, kwargs: Dict[str, Any], trace: bool = False) -> Dict[str, Any]:
+    """One call: latency, round-trips by endpoint and (when tracing) peak allocation."""
+    env.fake.reset_counts()
+    if trace:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = _call(env, case, kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+        if case.teardown is not None:
+            case.teardown(env, kwargs)
+    endpoints = env.fake.endpoint_counts()
+    return {
+        "seconds": elapsed,
+        "endpoints": endpoints,
+        "api_calls": sum(endpoints.values()),
+        "peak_bytes": peak,
+        "items": _items(result),
+    }
+
+
+def run_case(env: Env, case: Case, runs: int) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"size": env.size, "class": case.tool.__name__, "method": case.method}
+    if case.skip:
+        record["skipped"] = case.skip
+        return record
+    try:
+        first = _measure(env, case, case.setup(env))
+        samples = [_measure(env, case, case.setup(env)) for _ in range(runs)]
+        traced = _measure(env, case, case.setup(env), trace=True)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    seconds = sorted(sample["seconds"] for sample in samples) or [first["seconds"]]
+    record.update({
+        "runs": len(samples),
+        "first_ms": round(first["seconds"] * 1000, 3),
+        "first_api_calls": first["api_calls"],
+        "min_ms": round(seconds[0] * 1000, 3),
+        "p50_ms": round(statistics.median(seconds) * 1000, 3),
+        "p95_ms": round(_percentile(seconds, 0.95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(seconds) * 1000, 3),
+        "api_calls": statistics.median(s["api_calls"] for s in samples) if samples else first["api_calls"],
+        "endpoints": (samples[-1] if samples else first)["endpoints"],
+        "peak_kib": round(traced["peak_bytes"] / 1024, 1),
+        "items": first["items"],
+    })
+    return record
+
+
+def run_size(size: int, cases: List[Case], runs: int, events: bool) -> List[Dict[str, Any]]:
+    fake = FakeDaemonProcess(
+        containers=size, images=size, networks=size, volumes=size, stats_interval=0.2, pull_layers=2,
+    )
+    with fake, tempfile.TemporaryDirectory(prefix="bench-tools-") as workdir:
+        # Helper image for the volume backup/restore containers, and some data to copy.
+        fake.add_image("alpine:latest", emit=False)
+        fake.add_volume("bench-data", emit=False)
+        for n in range(BACKUP_FILES):
+            fake.put_volume_file("bench-data", f"file{n}.bin", os.urandom(BACKUP_FILE_SIZE))
+        os.environ["DOCKER_HOST"] = f"unix://{fake.socket_path}"
+        os.environ["DOCKER_MCP_EVENTS"] = "1" if events else "0"
+        registry = ClientRegistry()
+        tools = {cls: cls(registry) for cls in TOOL_CLASSES}
+        if events:
+            registry.event_hub().wait_connected(5)
+        env = Env(fake, size, workdir, tools)
+        try:
+            results = []
+            for case in cases:
+                record = run_case(env, case, runs)
+                results.append(record)
+                _print_row(record)
+            return results
+        finally:
+            for instance in tools.values():
+                instance.close()
+            registry.close()
+
+
+def _print_row(record: Dict[str, Any]) -> None:
+    name = f"{record['class']}.{record['method']}"
+    if "p50_ms" not in record:
+        print(f"{record['size']:>6} {name:<45} {record.get('skipped') or record.get('error')}")
+        return
+    print(
+        f"{record['size']:>6} {name:<45} {record['first_ms']:>9.2f} {record['p50_ms']:>9.2f} "
+        f"{record['p95_ms']:>9.2f} {record['api_calls']:>6g} {record['peak_kib']:>10.1f}"
+    )
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    """Print p50 latency, round-trip and peak-memory changes against an earlier run."""
+    old = {(r["size"], r["class"], r["method"]): r for r in baseline.get("results", []) if "p50_ms" in r}
+    print(f"\n{'size':>6} {'method':<45} {'p50_ms':>19} {'api_calls':>13} {'peak_kib':>21}")
+    for record in results:
+        before = old.get((record["size"], record["class"], record["method"]))
+        if before is None or "p50_ms" not in record:
+            continue
+        name = f"{record['class']}.{record['method']}"
+        print(
+            f"{record['size']:>6} {name:<45} "
+            f"{before['p50_ms']:>8.2f} -> {record['p50_ms']:>8.2f} "
+            f"{before['api_calls']:>5g} -> {record['api_calls']:>5g} "
+            f"{before['peak_kib']:>9.1f} -> {record['peak_kib']:>9.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,1000", help="comma-separated object counts, e.g. 10,1000,10000")
+    parser.add_argument("--runs", type=int, default=5, help="timed calls per method after the cold one")
+    parser.add_argument("--methods", default="", help="only methods containing one of these comma-separated words")
+    parser.add_argument("--no-events", action="store_true", help="disable the event-driven caches (DOCKER_MCP_EVENTS=0)")
+    parser.add_argument("--output", default="bench_tools.json", help="JSON results file ('-' for stdout)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    words = [w for w in args.methods.split(",") if w]
+    cases = [case for case in CASES if not words or any(w in case.method for w in words)]
+    missing = uncovered_methods()
+    if missing:
+        print(f"warning: no benchmark case for {', '.join(missing)}", file=sys.stderr)
+
+    print(f"{'size':>6} {'method':<45} {'first_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'calls':>6} {'peak_kib':>10}")
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        results.extend(run_size(size, cases, args.runs, events=not args.no_events))
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "events": not args.no_events,
+            "sizes": args.sizes,
+            "uncovered": missing,
+        },
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
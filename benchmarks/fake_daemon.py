@@ -0,0 +1,1287 @@
+"""
+Minimal fake Docker Engine API server for benchmarks.
+
+Serves a small subset of the Engine API over a unix socket from seeded,
+in-memory state and counts every request by endpoint, so benchmarks can
+report API round-trips without a real daemon.
+"""
+
+import base64
+import fnmatch
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import re
+import socket
+import socketserver
+import struct
+import tarfile
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+API_VERSION = "1.43"
+LOG_LINES = 1000
+# Size of the base layer every seeded image shares (see image history).
+BASE_LAYER_SIZE = 7_000_000
+BASE_LAYER_DIFF_ID = "sha256:" + hashlib.sha256(b"base layer").hexdigest()
+_VERSION_PREFIX = re.compile(r"^/v\d+\.\d+")
+
+# Stand-in registry served by /images/search: (name, description, stars, official).
+SEARCH_CATALOG = [
+    ("nginx", "Official build of Nginx.", 19000, True),
+    ("redis", "Redis is an open source key-value store.", 12000, True),
+    ("postgres", "The PostgreSQL object-relational database system.", 13000, True),
+    ("python", "Python is an interpreted, interactive, object-oriented language.", 9000, True),
+    ("alpine", "A minimal Docker image based on Alpine Linux.", 10000, True),
+    ("ubuntu", "Ubuntu is a Debian-based Linux operating system.", 16000, True),
+] + [
+    (f"{user}/{repo}", f"Community {repo} image by {user}.", (37 * i) % 2000, False)
+    for i, (user, repo) in enumerate(
+        (user, repo)
+        for user in ("acme", "bitnami", "linuxserver", "jdoe", "example")
+        for repo in ("nginx", "nginx-proxy", "redis", "redis-cluster", "postgres", "python", "python-dev", "alpine")
+    )
+]
+
+
+def _hex_id(kind: str, index: int) -> str:
+    return hashlib.sha256(f"{kind}-{index}".encode()).hexdigest()
+
+
+class FakeDockerDaemon:
+    """
+    In-memory Docker daemon state plus a unix-socket HTTP server.
+
+    Args:
+        containers: Number of containers to seed
+        images: Number of tagged images to seed (containers are spread across them)
+        volumes: Number of volumes to seed (every other container mounts one)
+        networks: Number of user networks to seed besides bridge/host/none
+                  (containers are connected to them round-robin)
+    """
+
+    def __init__(
+        self,
+        containers: int = 10,
+        images: int = 5,
+        volumes: int = 0,
+        networks: int = 0,
+        stats_interval: float = 1.0,
+        stop_delay: float = 0.0,
+        pull_layers: int = 3,
+        layer_size: int = 4_000_000,
+        search_latency: float = 0.0,
+    ):
+        self.search_latency = search_latency
+        self.pull_layers = pull_layers
+        self.layer_size = layer_size
+        self.stats_interval = stats_interval
+        self.stop_delay = stop_delay
+        self.images: Dict[str, Dict[str, Any]] = {}
+        self.containers: Dict[str, Dict[str, Any]] = {}
+        self.volumes: Dict[str, Dict[str, Any]] = {}
+        self.networks: Dict[str, Dict[str, Any]] = {}
+        # Volume contents: {volume_name: {relative_path: bytes}}
+        self.volume_files: Dict[str, Dict[str, bytes]] = {}
+        self.execs: Dict[str, Dict[str, Any]] = {}
+        # Wrapped execs by pidfile path, so a "kill $(cat pidfile)" exec can find them.
+        self._exec_pidfiles: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tmpdir: Optional[str] = None
+        self.socket_path: Optional[str] = None
+        self._event_queues: List[queue.Queue] = []
+        self._seed(containers, max(images, 1), volumes, networks)
+
+    def _seed(self, n_containers: int, n_images: int, n_volumes: int = 0, n_networks: int = 0) -> None:
+        image_ids = []
+        for i in range(n_images):
+            image_id = "sha256:" + _hex_id("image", i)
+            image_ids.append(image_id)
+            self.images[image_id] = {
+                "Id": image_id,
+                "RepoTags": [f"image{i}:latest"],
+                "RepoDigests": [],
+                "Created": 1700000000 + i,
+                "Size": 10_000_000 + i,
+                "VirtualSize": 10_000_000 + i,
+                "Labels": {},
+                "Containers": -1,
+                "ParentId": "",
+                "SharedSize": -1,
+            }
+        for i in range(n_volumes):
+            self.add_volume(f"volume-{i}", emit=False)
+        for name, driver in (("bridge", "bridge"), ("host", "host"), ("none", "null")):
+            self.add_network(name, driver=driver, emit=False)
+        user_networks = [self.add_network(f"network-{i}", emit=False) for i in range(n_networks)]
+        volume_names = list(self.volumes)
+        for i in range(n_containers):
+            container_id = _hex_id("container", i)
+            image_id = image_ids[i % n_images]
+            mounts = []
+            if volume_names and i % 2 == 0:
+                # Every other container mounts one volume; some volumes stay unused.
+                mounts.append(self._volume_mount(volume_names[(i // 2) % len(volume_names)], "/data"))
+            self.containers[container_id] = {
+                "Id": container_id,
+                "Name": f"container-{i}",
+                "ImageID": image_id,
+                "Image": self.images[image_id]["RepoTags"][0],
+                "State": "running" if i % 2 == 0 else "exited",
+                "Created": 1700000000 + i,
+                "Labels": {},
+                "Mounts": mounts,
+                "Ports": [],
+            }
+            if user_networks:
+                self.connect_network(user_networks[i % len(user_networks)], container_id, emit=False)
+
+    def _volume_mount(self, volume_name: str, destination: str) -> Dict[str, Any]:
+        return {
+            "Type": "volume",
+            "Name": volume_name,
+            "Source": self.volumes[volume_name]["Mountpoint"],
+            "Destination": destination,
+            "Driver": "local",
+            "Mode": "z",
+            "RW": True,
+            "Propagation": "",
+        }
+
+    # -- server lifecycle -------------------------------------------------
+
+    def start(self) -> str:
+        """Start serving and return the ``unix://`` base URL."""
+        self._tmpdir = tempfile.mkdtemp(prefix="fake-docker-")
+        self.socket_path = os.path.join(self._tmpdir, "docker.sock")
+        self._serve()
+        return f"unix://{self.socket_path}"
+
+    def restart(self) -> None:
+        """Drop every connection and listen again on the same socket (a daemon restart)."""
+        self._shutdown_server()
+        self._serve()
+
+    def stop(self) -> None:
+        self._shutdown_server()
+        if self._tmpdir:
+            os.rmdir(self._tmpdir)
+            self._tmpdir = None
+
+    def _serve(self) -> None:
+        daemon = self
+
+        class Handler(_Handler):
+            fake = daemon
+
+        self._server = _ThreadingUnixServer(self.socket_path, Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _shutdown_server(self) -> None:
+        self.close_event_streams()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server.close_requests()
+            self._server = None
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "FakeDockerDaemon":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.request_counts.clear()
+
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def endpoint_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.request_counts)
+
+    # -- mutations and events ---------------------------------------------
+
+    def emit(self, event_type: str, action: str, actor_id: str, **attributes: str) -> None:
+        """Publish an event to every open /events stream."""
+        now = time.time()
+        event = {
+            "Type": event_type,
+            "Action": action,
+            "Actor": {"ID": actor_id, "Attributes": attributes},
+            "time": int(now),
+            "timeNano": int(now * 1e9),
+        }
+        with self._lock:
+            queues = list(self._event_queues)
+        for q in queues:
+            q.put(event)
+
+    def close_event_streams(self) -> None:
+        """Terminate open /events streams (simulates a dropped connection)."""
+        with self._lock:
+            queues, self._event_queues = self._event_queues, []
+        for q in queues:
+            q.put(None)
+
+    def add_container(
+        self,
+        name: str,
+        image_id: Optional[str] = None,
+        state: str = "running",
+        labels: Optional[Dict[str, str]] = None,
+        ports: Optional[List[Dict[str, Any]]] = None,
+        volumes: Optional[Dict[str, str]] = None,
+    ) -> str:
+        image_id = image_id or next(iter(self.images))
+        container_id = _hex_id("container", len(self.containers) + 1_000_000)
+        self.containers[container_id] = {
+            "Id": container_id,
+            "Name": name,
+            "ImageID": image_id,
+            "Image": (self.images[image_id]["RepoTags"] or [image_id])[0],
+            "State": state,
+            "Created": int(time.time()),
+            "Labels": dict(labels or {}),
+            "Mounts": [self._volume_mount(v, dest) for v, dest in (volumes or {}).items()],
+            "Ports": list(ports or []),
+        }
+        self.emit("container", "create", container_id, name=name)
+        return container_id
+
+    def add_volume(self, name: str, labels: Optional[Dict[str, str]] = None, emit: bool = True) -> None:
+        self.volumes[name] = {
+            "Name": name,
+            "Driver": "local",
+            "Mountpoint": f"/var/lib/docker/volumes/{name}/_data",
+            "Scope": "local",
+            "CreatedAt": "2023-11-14T22:13:20Z",
+            "Labels": dict(labels or {}),
+            "Options": {},
+        }
+        self.volume_files.setdefault(name, {})
+        if emit:
+            self.emit("volume", "create", name, driver="local")
+
+    def add_network(
+        self,
+        name: str,
+        driver: str = "bridge",
+        labels: Optional[Dict[str, str]] = None,
+        internal: bool = False,
+        attachable: bool = False,
+        emit: bool = True,
+    ) -> str:
+        network_id = _hex_id("network", len(self.networks))
+        subnet = len(self.networks) % 250
+        self.networks[network_id] = {
+            "Name": name,
+            "Id": network_id,
+            "Created": "2023-11-14T22:13:20.000000000Z",
+            "Scope": "local",
+            "Driver": driver,
+            "EnableIPv6": False,
+            "IPAM": {"Driver": "default", "Options": None,
+                     "Config": [{"Subnet": f"172.{16 + subnet // 16}.{subnet % 16 * 16}.0/20"}]},
+            "Internal": internal,
+            "Attachable": attachable,
+            "Ingress": False,
+            "Containers": {},
+            "Options": {},
+            "Labels": dict(labels or {}),
+        }
+        if emit:
+            self.emit("network", "create", network_id, name=name, type=driver)
+        return network_id
+
+    def remove_network(self, network_id: str) -> None:
+        network = self.networks.pop(network_id)
+        self.emit("network", "destroy", network_id, name=network["Name"], type=network["Driver"])
+
+    def connect_network(self, network_id: str, container_id: str, emit: bool = True) -> None:
+        network = self.networks[network_id]
+        endpoints = network["Containers"]
+        endpoints[container_id] = {
+            "Name": self.containers[container_id]["Name"],
+            "EndpointID": _hex_id("endpoint", len(endpoints)),
+            "MacAddress": "02:42:ac:11:00:%02x" % (len(endpoints) % 256),
+            "IPv4Address": f"10.0.{len(endpoints) // 250}.{len(endpoints) % 250 + 2}/16",
+            "IPv6Address": "",
+        }
+        if emit:
+            self.emit("network", "connect", network_id, container=container_id,
+                      name=network["Name"], type=network["Driver"])
+
+    def disconnect_network(self, network_id: str, container_id: str) -> None:
+        network = self.networks[network_id]
+        network["Containers"].pop(container_id, None)
+        self.emit("network", "disconnect", network_id, container=container_id,
+                  name=network["Name"], type=network["Driver"])
+
+    def add_image(self, tag: str, size: int = 10_000_000, emit: bool = True) -> str:
+        image_id = "sha256:" + _hex_id("image", len(self.images) + 1_000_000)
+        self.images[image_id] = {
+            "Id": image_id, "RepoTags": [tag], "RepoDigests": [],
+            "Created": int(time.time()), "Size": size, "VirtualSize": size,
+            "Labels": {}, "Containers": -1, "ParentId": "", "SharedSize": -1,
+        }
+        if emit:
+            self.emit("image", "tag", image_id, name=tag)
+        return image_id
+
+    def remove_volume(self, name: str) -> None:
+        self.volumes.pop(name)
+        self.volume_files.pop(name, None)
+        self.emit("volume", "destroy", name, driver="local")
+
+    def _image_history(self, img: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Top layer specific to the image on a base layer shared by all images."""
+        tag = (img["RepoTags"] or ["<missing>"])[0]
+        own = max(img["Size"] - BASE_LAYER_SIZE, 0)
+        return [
+            {"Id": img["Id"], "Created": img["Created"], "CreatedBy": '/bin/sh -c #(nop)  CMD ["app"]',
+             "Tags": img["RepoTags"], "Size": 0, "Comment": ""},
+            {"Id": "<missing>", "Created": img["Created"], "CreatedBy": f"/bin/sh -c install {tag}",
+             "Tags": None, "Size": own, "Comment": ""},
+            {"Id": "<missing>", "Created": 1690000000, "CreatedBy": "/bin/sh -c #(nop) ADD file:base in / ",
+             "Tags": None, "Size": min(img["Size"], BASE_LAYER_SIZE), "Comment": ""},
+        ]
+
+    @staticmethod
+    def _image_rootfs(img: Dict[str, Any]) -> Dict[str, Any]:
+        """Layer diff IDs matching _image_history(): the shared base, then the image's own layer."""
+        own = "sha256:" + hashlib.sha256(img["Id"].encode()).hexdigest()
+        return {"Type": "layers", "Layers": [BASE_LAYER_DIFF_ID, own]}
+
+    def _prune(self, kind: str) -> Tuple[int, Any]:
+        if kind == "containers":
+            deleted = [cid for cid, c in list(self.containers.items()) if c["State"] != "running"]
+            for cid in deleted:
+                self.remove_container(cid)
+            return 200, {"ContainersDeleted": deleted, "SpaceReclaimed": 0}
+        if kind == "networks":
+            deleted = [
+                n["Name"] for n in list(self.networks.values())
+                if not n["Containers"] and n["Name"] not in ("bridge", "host", "none")
+            ]
+            for network_id in [i for i, n in self.networks.items() if n["Name"] in deleted]:
+                self.remove_network(network_id)
+            return 200, {"NetworksDeleted": deleted}
+        refs = self._volume_refs()
+        deleted = [name for name in list(self.volumes) if not refs[name]]
+        reclaimed = sum(len(d) for name in deleted for d in self.volume_files.get(name, {}).values())
+        for name in deleted:
+            self.remove_volume(name)
+        return 200, {"VolumesDeleted": deleted, "SpaceReclaimed": reclaimed}
+
+    def remove_image(self, image_id: str) -> None:
+        image = self.images.pop(image_id)
+        for tag in image["RepoTags"]:
+            self.emit("image", "untag", image_id, name=tag)
+        self.emit("image", "delete", image_id, name=image_id)
+
+    def add_compose_project(
+        self, project: str, working_dir: str, services: List[str], replicas: int = 1
+    ) -> List[str]:
+        """Seed containers labelled the way docker compose labels them."""
+        ids = []
+        for service in services:
+            for n in range(1, replicas + 1):
+                ids.append(self.add_container(
+                    f"{project}-{service}-{n}",
+                    labels={
+                        "com.docker.compose.project": project,
+                        "com.docker.compose.project.working_dir": working_dir,
+                        "com.docker.compose.service": service,
+                        "com.docker.compose.container-number": str(n),
+                        "com.docker.compose.oneoff": "False",
+                    },
+                    ports=[{"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8000 + len(ids), "Type": "tcp"}],
+                ))
+        return ids
+
+    def remove_container(self, container_id: str) -> None:
+        c = self.containers.pop(container_id)
+        self.emit("container", "destroy", container_id, name=c["Name"])
+
+    def rename_container(self, container_id: str, new_name: str) -> None:
+        c = self.containers[container_id]
+        old_name, c["Name"] = c["Name"], new_name
+        self.emit("container", "rename", container_id, name=new_name, oldName="/" + old_name)
+
+    def put_volume_file(self, volume_name: str, path: str, data: bytes) -> None:
+        self.volume_files[volume_name][path.lstrip("/")] = data
+
+    def _create_container(self, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Any]:
+        config = json.loads(body or b"{}")
+        image_ref = config.get("Image", "")
+        image = self._find(self.images, image_ref, "Id")
+        if image is None:
+            return 404, {"message": f"No such image: {image_ref}"}
+        binds = (config.get("HostConfig") or {}).get("Binds") or []
+        name = query.get("name", [""])[0] or f"helper-{len(self.containers)}"
+        container_id = self.add_container(name, image_id=image["Id"], state="created",
+                                          labels=config.get("Labels") or {})
+        for bind in binds:
+            source, destination = bind.split(":")[:2]
+            if source not in self.volumes:
+                self.add_volume(source)
+            self.containers[container_id]["Mounts"].append(self._volume_mount(source, destination))
+        return 201, {"Id": container_id, "Warnings": []}
+
+    def _volume_at(self, c: Dict[str, Any], path: str) -> Tuple[Optional[str], str]:
+        """Volume mounted at or above path in container c, plus the path inside it."""
+        for mount in c["Mounts"]:
+            dest = mount["Destination"].rstrip("/")
+            if path == dest or path.startswith(dest + "/"):
+                return mount.get("Name"), path[len(dest):].strip("/")
+        return None, ""
+
+    # -- representations --------------------------------------------------
+
+    def _container_summary(self, c: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "Id": c["Id"],
+            "Names": ["/" + c["Name"]],
+            "Image": c["Image"],
+            "ImageID": c["ImageID"],
+            "Command": "sleep infinity",
+            "Created": c["Created"],
+            "State": c["State"],
+            "Status": "Up 1 hour" if c["State"] == "running" else "Exited (0)",
+            "Ports": c["Ports"],
+            "Labels": c["Labels"],
+            "Mounts": c["Mounts"],
+        }
+
+    def _container_inspect(self, c: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "Id": c["Id"],
+            "Name": "/" + c["Name"],
+            "Created": "2023-11-14T22:13:20Z",
+            "Image": c["ImageID"],
+            "State": {"Status": c["State"], "Running": c["State"] == "running"},
+            "Config": {"Image": c["Image"], "Labels": c["Labels"], "Tty": False},
+            "Mounts": c["Mounts"],
+            "NetworkSettings": {"Ports": {}},
+        }
+
+    def _find(self, table: Dict[str, Dict[str, Any]], ref: str, name_key: str):
+        ref = unquote(ref)
+        if ref in table:
+            return table[ref]
+        bare = ref.split(":", 1)[1] if ref.startswith("sha256:") else ref
+        for obj in table.values():
+            obj_id = obj["Id"].split(":", 1)[-1]
+            if obj.get(name_key) == ref.lstrip("/") or obj_id.startswith(bare):
+                return obj
+            tags = obj.get("RepoTags") or []
+            if ref in tags or f"{ref}:latest" in tags:
+                return obj
+        return None
+
+    def _volume_refs(self) -> Counter:
+        """Number of containers mounting each volume."""
+        return Counter(
+            name for c in self.containers.values()
+            for name in {m.get("Name") for m in c["Mounts"]} if name
+        )
+
+    @staticmethod
+    def _network_dangling(network: Dict[str, Any]) -> bool:
+        return not network["Containers"] and network["Name"] not in ("bridge", "host", "none")
+
+    def _system_df(self) -> Dict[str, Any]:
+        refs = self._volume_refs()
+        volumes = []
+        for name, volume in self.volumes.items():
+            usage = {"Size": sum(len(d) for d in self.volume_files.get(name, {}).values()), "RefCount": refs[name]}
+            volumes.append(dict(volume, UsageData=usage))
+        image_refs = Counter(c["ImageID"] for c in self.containers.values())
+        # Every image sits on the shared base layer (see _image_history()).
+        shared = len(self.images) > 1
+        images = [
+            dict(img, Containers=image_refs[img["Id"]],
+                 SharedSize=min(img["Size"], BASE_LAYER_SIZE) if shared else 0)
+            for img in self.images.values()
+        ]
+        own_sizes = sum(max(img["Size"] - BASE_LAYER_SIZE, 0) for img in self.images.values())
+        base_size = max((min(img["Size"], BASE_LAYER_SIZE) for img in self.images.values()), default=0)
+        return {
+            "LayersSize": own_sizes + base_size,
+            "Images": images,
+            "Containers": [self._container_summary(c) for c in self.containers.values()],
+            "Volumes": volumes,
+            "BuildCache": [],
+        }
+
+    # -- exec ---------------------------------------------------------------
+
+    def _create_exec(self, ref: str, body: bytes) -> Tuple[int, Any]:
+        c = self._find(self.containers, ref, "Name")
+        if c is None:
+            return 404, {"message": f"No such container: {ref}"}
+        if c["State"] != "running":
+            return 409, {"message": f"Container {c['Id']} is not running"}
+        config = json.loads(body or b"{}")
+        exec_id = _hex_id("exec", len(self.execs))
+        self.execs[exec_id] = {
+            "ID": exec_id, "ContainerID": c["Id"], "Cmd": config.get("Cmd") or [],
+            "Running": False, "ExitCode": None, "killed": threading.Event(),
+        }
+        return 201, {"Id": exec_id}
+
+    def run_exec(self, exec_id: str, write) -> None:
+        """
+        Run an exec's command, writing (stream_id, bytes) through write. A tiny
+        interpreter: echo, warn (stderr), yes (endless output), sleep N and
+        "a ; b" sequences, plus the sh -c pidfile wrapper/kill scripts used by
+        ContainerTools.stream_exec.
+        """
+        ex = self.execs[exec_id]
+        ex["Running"] = True
+        cmd = list(ex["Cmd"])
+        try:
+            if cmd[:2] == ["sh", "-c"] and len(cmd) >= 4 and '"$@" &' in cmd[2]:
+                self._exec_pidfiles[cmd[3]] = ex
+                try:
+                    ex["ExitCode"] = self._run_command(ex, cmd[4:], write)
+                finally:
+                    self._exec_pidfiles.pop(cmd[3], None)
+            elif cmd[:2] == ["sh", "-c"] and len(cmd) >= 4 and "kill -KILL" in cmd[2]:
+                target = self._exec_pidfiles.get(cmd[3])
+                if target is not None:
+                    target["killed"].set()
+                ex["ExitCode"] = 0
+            else:
+                ex["ExitCode"] = self._run_command(ex, cmd, write)
+        finally:
+            ex["Running"] = False
+
+    @classmethod
+    def _run_command(cls, ex: Dict[str, Any], args: List[str], write) -> int:
+        if ";" in args:
+            # "a ; b": run in sequence, like sh; a killed step ends the sequence.
+            split = args.index(";")
+            code = cls._run_command(ex, args[:split], write)
+            if ex["killed"].is_set():
+                return code
+            return cls._run_command(ex, args[split + 1:], write)
+        name = args[0] if args else ""
+        if name == "echo":
+            write(1, (" ".join(args[1:]) + "\n").encode())
+            return 0
+        if name == "warn":
+            write(2, (" ".join(args[1:]) + "\n").encode())
+            return 1
+        if name == "yes":
+            while not ex["killed"].is_set():
+                write(1, b"y\n" * 2048)
+                time.sleep(0.001)
+            return 137
+        if name == "sleep":
+            return 137 if ex["killed"].wait(float(args[1])) else 0
+        write(2, f"sh: {name}: not found\n".encode())
+        return 127
+
+    def _stats_sample(self, c: Dict[str, Any], tick: int) -> Dict[str, Any]:
+        return {
+            "read": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": 1_500_000 * (tick + 1) + 500_000 * ((tick + 1) // 2)},
+                "system_cpu_usage": 100_000_000 * (tick + 1),
+            },
+            "precpu_stats": {
+                "cpu_usage": {"total_usage": 1_500_000 * tick + 500_000 * (tick // 2)},
+                "system_cpu_usage": 100_000_000 * tick,
+            },
+            "memory_stats": {"usage": 50_000_000 + 1_000 * tick, "limit": 2_000_000_000},
+            "networks": {"eth0": {"rx_bytes": 1_500 * tick, "tx_bytes": 700 * tick}},
+        }
+
+    def _matches_filters(
+        self,
+        obj: Dict[str, Any],
+        query: Dict[str, List[str]],
+        dangling: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> bool:
+        """Apply the subset of Engine API ``filters`` the fake understands."""
+        raw = query.get("filters", [""])[0]
+        if not raw:
+            return True
+        filters = json.loads(raw)
+        for key, wanted in filters.items():
+            values = list(wanted) if isinstance(wanted, (dict, list)) else [wanted]
+            labels = obj.get("Labels") or {}
+            if key == "label":
+                for selector in values:
+                    k, _, v = selector.partition("=")
+                    if k not in labels or (v and labels[k] != v):
+                        return False
+            elif key == "status" and obj.get("State") not in values:
+                return False
+            elif key == "name" and not any(v in obj.get("Name", "") for v in values):
+                return False
+            elif key == "id" and not any(obj["Id"].startswith(v) for v in values):
+                return False
+            elif key == "dangling" and dangling is not None:
+                if dangling(obj) != (values[0] in ("1", "true", "True")):
+                    return False
+            elif key == "reference":
+                refs = [r for tag in obj.get("RepoTags") or [] for r in (tag, tag.rsplit(":", 1)[0])]
+                if not any(fnmatch.fnmatchcase(r, v) for r in refs for v in values):
+                    return False
+        return True
+
+    def _network_request(self, method: str, parts: List[str], body: bytes) -> Tuple[int, Any]:
+        if parts == ["networks", "create"] and method == "POST":
+            config = json.loads(body or b"{}")
+            name = config.get("Name", "")
+            if any(n["Name"] == name for n in self.networks.values()):
+                return 409, {"message": f"network with name {name} already exists"}
+            network_id = self.add_network(
+                name, driver=config.get("Driver") or "bridge", labels=config.get("Labels"),
+                internal=bool(config.get("Internal")), attachable=bool(config.get("Attachable")),
+            )
+            return 201, {"Id": network_id, "Warning": ""}
+        network = self._find(self.networks, parts[1], "Name")
+        if network is None:
+            return 404, {"message": f"network {parts[1]} not found"}
+        if len(parts) == 2 and method == "GET":
+            return 200, network
+        if len(parts) == 2 and method == "DELETE":
+            if network["Containers"]:
+                return 403, {"message": f"error while removing network: network {network['Name']} "
+                                        f"id {network['Id']} has active endpoints"}
+            self.remove_network(network["Id"])
+            return 204, ""
+        if len(parts) == 3 and parts[2] in ("connect", "disconnect") and method == "POST":
+            ref = json.loads(body or b"{}").get("Container", "")
+            c = self._find(self.containers, ref, "Name")
+            if c is None:
+                return 404, {"message": f"No such container: {ref}"}
+            if parts[2] == "connect":
+                self.connect_network(network["Id"], c["Id"])
+            else:
+                self.disconnect_network(network["Id"], c["Id"])
+            return 200, ""
+        return 404, {"message": f"page not found: {method} /{'/'.join(parts)}"}
+
+    def _container_action(
+        self, method: str, ref: str, action: str, force: bool = False
+    ) -> Tuple[int, Any]:
+        c = self._find(self.containers, ref, "Name")
+        if c is None:
+            return 404, {"message": f"No such container: {ref}"}
+        if method == "DELETE":
+            if c["State"] == "running" and not force:
+                return 409, {"message": "You cannot remove a running container. Stop the container before attempting removal or force remove (is running)"}
+            self.remove_container(c["Id"])
+            return 204, ""
+        if action in ("stop", "restart") and c["State"] == "running":
+            time.sleep(self.stop_delay)
+        c["State"] = "exited" if action in ("stop", "kill") else "running"
+        self.emit("container", action, c["Id"], name=c["Name"])
+        return 204, ""
+
+    def _search(self, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        term = query.get("term", [""])[0].lower()
+        limit = int(query.get("limit", ["25"])[0])
+        # "docker.io/nginx" searches that registry for "nginx".
+        host, sep, rest = term.partition("/")
+        if sep and ("." in host or ":" in host):
+            term = rest
+        if self.search_latency:
+            time.sleep(self.search_latency)
+        matches = [
+            {"name": name, "description": description, "star_count": stars,
+             "is_official": official, "is_automated": False}
+            for name, description, stars, official in SEARCH_CATALOG
+            if term in name or term in description.lower()
+        ]
+        matches.sort(key=lambda result: (-result["star_count"], result["name"]))
+        return matches[:limit]
+
+    # -- routing ----------------------------------------------------------
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: bytes = b""
+    ) -> Tuple[int, Any]:
+        """Return ``(status, body)`` for one request."""
+        parts = [p for p in path.split("/") if p]
+        if path == "/containers/create" and method == "POST":
+            return self._create_container(query, body)
+        if len(parts) == 2 and parts[1] == "prune" and method == "POST":
+            return self._prune(parts[0])
+        if len(parts) == 3 and parts[0] == "containers" and parts[2] == "exec" and method == "POST":
+            return self._create_exec(parts[1], body)
+        if path == "/system/df":
+            return 200, self._system_df()
+        if path == "/_ping":
+            return 200, "OK"
+        if path == "/images/search":
+            return 200, self._search(query)
+        if path == "/version":
+            return 200, {"ApiVersion": API_VERSION, "Version": "24.0.0-fake"}
+        if parts[:2] == ["containers", "json"]:
+            show_all = query.get("all", ["0"])[0] in ("1", "true", "True")
+            return 200, [
+                self._container_summary(c)
+                for c in list(self.containers.values())
+                if (show_all or c["State"] == "running") and self._matches_filters(c, query)
+            ]
+        if parts[0] == "containers" and method == "DELETE" and len(parts) == 2:
+            force = query.get("force", ["0"])[0] in ("1", "true", "True")
+            return self._container_action(method, parts[1], "destroy", force)
+        if parts[0] == "containers" and method == "POST" and len(parts) == 3:
+            return self._container_action(method, parts[1], parts[2])
+        if parts[0] == "containers" and len(parts) == 3 and parts[2] == "json":
+            c = self._find(self.containers, parts[1], "Name")
+            if c is None:
+                return 404, {"message": f"No such container: {parts[1]}"}
+            return 200, self._container_inspect(c)
+        if path == "/volumes/create" and method == "POST":
+            config = json.loads(body or b"{}")
+            name = config.get("Name") or f"volume-{len(self.volumes)}"
+            if name not in self.volumes:
+                self.add_volume(name, labels=config.get("Labels"))
+            return 201, self.volumes[name]
+        if len(parts) == 3 and parts[0] == "exec" and parts[2] == "json":
+            ex = self.execs.get(parts[1])
+            if ex is None:
+                return 404, {"message": f"No such exec instance: {parts[1]}"}
+            return 200, {k: v for k, v in ex.items() if k != "killed"}
+        if parts == ["volumes"] and method == "GET":
+            refs = self._volume_refs()
+            return 200, {
+                "Volumes": [
+                    v for v in self.volumes.values()
+                    if self._matches_filters(v, query, dangling=lambda v: not refs[v["Name"]])
+                ],
+                "Warnings": [],
+            }
+        if parts[0] == "volumes" and len(parts) == 2 and method == "GET":
+            volume = self.volumes.get(unquote(parts[1]))
+            if volume is None:
+                return 404, {"message": f"get {parts[1]}: no such volume"}
+            return 200, volume
+        if parts[0] == "volumes" and len(parts) == 2 and method == "DELETE":
+            name = unquote(parts[1])
+            if name not in self.volumes:
+                return 404, {"message": f"get {name}: no such volume"}
+            if self._volume_refs()[name]:
+                return 409, {"message": f"remove {name}: volume is in use"}
+            self.remove_volume(name)
+            return 204, ""
+        if parts == ["networks"] and method == "GET":
+            # Like the real daemon, listings leave Containers empty; inspect fills it in.
+            return 200, [
+                dict(n, Containers={}) for n in list(self.networks.values())
+                if self._matches_filters(n, query, dangling=self._network_dangling)
+            ]
+        if parts[0] == "networks" and len(parts) >= 2:
+            return self._network_request(method, parts, body)
+        if parts[0] == "images" and len(parts) >= 2 and method == "DELETE":
+            ref = "/".join(parts[1:])
+            img = self._find(self.images, ref, "Id")
+            if img is None:
+                return 404, {"message": f"No such image: {ref}"}
+            force = query.get("force", ["0"])[0] in ("1", "true", "True")
+            if not force and any(c["ImageID"] == img["Id"] for c in self.containers.values()):
+                return 409, {"message": f"conflict: unable to delete {ref} - image is being used by a container"}
+            self.remove_image(img["Id"])
+            return 200, [{"Untagged": tag} for tag in img["RepoTags"]] + [{"Deleted": img["Id"]}]
+        if parts[:2] == ["images", "json"]:
+            return 200, [
+                img for img in list(self.images.values())
+                if self._matches_filters(img, query, dangling=lambda img: not img["RepoTags"])
+            ]
+        if parts[0] == "images" and len(parts) >= 3 and parts[-1] == "history":
+            ref = "/".join(parts[1:-1])
+            img = self._find(self.images, ref, "Id")
+            if img is None:
+                return 404, {"message": f"No such image: {ref}"}
+            return 200, self._image_history(img)
+        if parts[0] == "images" and len(parts) >= 3 and parts[-1] == "json":
+            ref = "/".join(parts[1:-1])
+            img = self._find(self.images, ref, "Id")
+            if img is None:
+                return 404, {"message": f"No such image: {ref}"}
+            return 200, dict(img, RootFS=self._image_rootfs(img))
+        return 404, {"message": f"page not found: {method} {path}"}
+
+
+# Path segments kept verbatim by endpoint_key(); anything else after the first is an ID.
+_ENDPOINT_WORDS = {
+    "json", "logs", "stats", "archive", "history", "exec", "connect", "disconnect", "create", "prune", "df", "search",
+}
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Normalize a request path to an endpoint label (IDs replaced by ``{id}``)."""
+    parts = [p for p in path.split("/") if p]
+    normalized = []
+    for i, part in enumerate(parts):
+        if i > 0 and part not in _ENDPOINT_WORDS:
+            normalized.append("{id}")
+        else:
+            normalized.append(part)
+    return f"{method} /" + "/".join(normalized)
+
+
+class _ChunkedWriter(io.RawIOBase):
+    """File-like that writes HTTP/1.1 chunks, used to stream generated tars."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            self._wfile.write(b"%x\r\n%s\r\n" % (len(data), bytes(data)))
+        return len(data)
+
+    def finish(self) -> None:
+        self._wfile.write(b"0\r\n\r\n")
+        self._wfile.flush()
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Concurrent clients open many connections at once; the default backlog is 5.
+    request_queue_size = 128
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._open: set = set()
+        self._open_lock = threading.Lock()
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._open_lock:
+            self._open.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: Any) -> None:
+        with self._open_lock:
+            self._open.discard(request)
+        super().shutdown_request(request)
+
+    def close_requests(self) -> None:
+        """Close kept-alive client connections, as a stopping daemon would."""
+        with self._open_lock:
+            requests = list(self._open)
+        for request in requests:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeDockerDaemon
+    protocol_version = "HTTP/1.1"
+
+    def _stream_events(self) -> None:
+        q: queue.Queue = queue.Queue()
+        with self.fake._lock:
+            self.fake._event_queues.append(q)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Api-Version", API_VERSION)
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            while True:
+                event = q.get()
+                if event is None:
+                    break
+                chunk = json.dumps(event).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            with self.fake._lock:
+                if q in self.fake._event_queues:
+                    self.fake._event_queues.remove(q)
+        self.close_connection = True
+
+    def _write_chunk(self, obj: Dict[str, Any]) -> None:
+        chunk = json.dumps(obj).encode() + b"\r\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.flush()
+
+    def _stream_pull(self, query: Dict[str, List[str]]) -> None:
+        repo = query.get("fromImage", [""])[0]
+        tag = query.get("tag", ["latest"])[0]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if repo.startswith("missing"):
+            self._write_chunk({"error": f"manifest for {repo}:{tag} not found"})
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        self._write_chunk({"status": f"Pulling from library/{repo}", "id": tag})
+        size = self.fake.layer_size
+        for n in range(self.fake.pull_layers):
+            layer = _hex_id("layer", n)[:12]
+            if n == 0:
+                # Shared base layer: the daemon reports it as already present.
+                self._write_chunk({"status": "Already exists", "progressDetail": {}, "id": layer})
+                continue
+            for done in (size // 2, size):
+                self._write_chunk({"status": "Downloading", "id": layer,
+                                   "progressDetail": {"current": done, "total": size}})
+                time.sleep(0.01)
+            self._write_chunk({"status": "Download complete", "progressDetail": {}, "id": layer})
+            self._write_chunk({"status": "Extracting", "id": layer,
+                               "progressDetail": {"current": size, "total": size}})
+            self._write_chunk({"status": "Pull complete", "progressDetail": {}, "id": layer})
+        image_id = "sha256:" + _hex_id("pulled", hash((repo, tag)) & 0xFFFF)
+        self.fake.images[image_id] = {
+            "Id": image_id, "RepoTags": [f"{repo}:{tag}"], "RepoDigests": [],
+            "Created": int(time.time()), "Size": size * self.fake.pull_layers,
+            "VirtualSize": size * self.fake.pull_layers, "Labels": {},
+            "Containers": -1, "ParentId": "", "SharedSize": -1,
+        }
+        self.fake.emit("image", "pull", f"{repo}:{tag}", name=f"{repo}:{tag}")
+        self._write_chunk({"status": "Digest: sha256:" + _hex_id("digest", len(repo))})
+        self._write_chunk({"status": f"Status: Downloaded newer image for {repo}:{tag}"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _stream_logs(self, ref: str, query: Dict[str, List[str]]) -> None:
+        """Multiplexed (non-TTY) log stream: LOG_LINES synthetic lines, then one per interval if following."""
+        c = self.fake._find(self.fake.containers, ref, "Name")
+        if c is None:
+            payload = json.dumps({"message": f"No such container: {ref}"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        tail = query.get("tail", ["all"])[0]
+        first = 0 if tail == "all" else max(LOG_LINES - int(tail), 0)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.docker.multiplexed-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def frame(n: int) -> None:
+            line = f"{c['Name']} log line {n}\n".encode()
+            data = struct.pack(">BxxxL", 1, len(line)) + line
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        try:
+            for n in range(first, LOG_LINES):
+                frame(n)
+            self.wfile.flush()
+            n = LOG_LINES
+            if query.get("follow", ["0"])[0] in ("1", "true", "True"):
+                while self.fake._server is not None and c["Id"] in self.fake.containers:
+                    time.sleep(self.fake.stats_interval)
+                    frame(n)
+                    self.wfile.flush()
+                    n += 1
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        self.close_connection = True
+
+    def _start_exec(self, exec_id: str) -> None:
+        """Hijacked exec stream: 101 Upgrade, then raw multiplexed frames until the command exits."""
+        if exec_id not in self.fake.execs:
+            payload = json.dumps({"message": f"No such exec instance: {exec_id}"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_response(101, "UPGRADED")
+        self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Upgrade", "tcp")
+        self.end_headers()
+        self.wfile.flush()
+        # The real daemon needs a moment to start the process; output sent in the
+        # same packet as the headers would be swallowed by the client's HTTP buffer.
+        time.sleep(0.02)
+
+        def write(stream_id: int, data: bytes) -> None:
+            self.wfile.write(struct.pack(">BxxxL", stream_id, len(data)) + data)
+            self.wfile.flush()
+
+        try:
+            self.fake.run_exec(exec_id, write)
+        except OSError:
+            # Client went away; stop the command like a closed attach would.
+            ex = self.fake.execs[exec_id]
+            ex["killed"].set()
+            if ex["ExitCode"] is None:
+                ex["ExitCode"] = 137
+        self.close_connection = True
+
+    def _stream_stats(self, ref: str, query: Dict[str, List[str]]) -> None:
+        c = self.fake._find(self.fake.containers, ref, "Name")
+        if c is None:
+            payload = json.dumps({"message": f"No such container: {ref}"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        if query.get("stream", ["1"])[0] in ("0", "false", "False"):
+            # The real daemon waits for a second sample to compute precpu_stats.
+            time.sleep(self.fake.stats_interval)
+            payload = json.dumps(self.fake._stats_sample(c, 1)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        tick = 1
+        try:
+            while self.fake._server is not None and c["Id"] in self.fake.containers:
+                chunk = json.dumps(self.fake._stats_sample(c, tick)).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                tick += 1
+                time.sleep(self.fake.stats_interval)
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        self.close_connection = True
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(parts)
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _archive(self, method: str, ref: str, query: Dict[str, List[str]], body: bytes) -> None:
+        c = self.fake._find(self.fake.containers, ref, "Name")
+        path = query.get("path", ["/"])[0].rstrip("/") or "/"
+        if c is None:
+            self._send_json(404, {"message": f"No such container: {ref}"})
+            return
+        if method == "PUT":
+            with tarfile.open(fileobj=io.BytesIO(body), mode="r|*") as tar:
+                for member in tar:
+                    target = (path.rstrip("/") + "/" + member.name.lstrip("./")).rstrip("/")
+                    volume, inner = self.fake._volume_at(c, target)
+                    if volume is None or not member.isfile():
+                        continue
+                    self.fake.put_volume_file(volume, inner, tar.extractfile(member).read())
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        volume, inner = self.fake._volume_at(c, path)
+        if volume is None:
+            self._send_json(404, {"message": f"Could not find the file {path} in container {ref}"})
+            return
+        root = os.path.basename(path)
+        stat = {"name": root, "size": 4096, "mode": 2147484141, "mtime": "2023-11-14T22:13:20Z", "linkTarget": ""}
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-tar")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Docker-Container-Path-Stat", base64.b64encode(json.dumps(stat).encode()).decode())
+        self.end_headers()
+        writer = _ChunkedWriter(self.wfile)
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            info = tarfile.TarInfo(root)
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            tar.addfile(info)
+            for rel, data in sorted(self.fake.volume_files.get(volume, {}).items()):
+                if inner and not rel.startswith(inner):
+                    continue
+                info = tarfile.TarInfo(f"{root}/{rel[len(inner):].lstrip('/')}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        writer.finish()
+        self.close_connection = True
+
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        path = _VERSION_PREFIX.sub("", parsed.path) or "/"
+        body = self._read_body()
+        with self.fake._lock:
+            self.fake.request_counts[endpoint_key(method, path)] += 1
+        if path == "/events":
+            self._stream_events()
+            return
+        parts = [p for p in path.split("/") if p]
+        if path == "/images/create" and method == "POST":
+            self._stream_pull(parse_qs(parsed.query))
+            return
+        if len(parts) == 3 and parts[0] == "exec" and parts[2] == "start":
+            self._start_exec(parts[1])
+            return
+        if len(parts) == 3 and parts[0] == "containers" and parts[2] == "logs":
+            self._stream_logs(parts[1], parse_qs(parsed.query))
+            return
+        if len(parts) == 3 and parts[0] == "containers" and parts[2] == "stats":
+            self._stream_stats(parts[1], parse_qs(parsed.query))
+            return
+        if len(parts) == 3 and parts[0] == "containers" and parts[2] == "archive":
+            self._archive(method, parts[1], parse_qs(parsed.query), body)
+            return
+        status, body = self.fake.handle(method, path, parse_qs(parsed.query), body)
+        if status == 204:
+            payload, content_type = b"", "text/plain"
+        elif isinstance(body, str):
+            payload, content_type = body.encode(), "text/plain"
+        else:
+            payload, content_type = json.dumps(body).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Api-Version", API_VERSION)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_HEAD(self) -> None:
+        self._dispatch("HEAD")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def address_string(self) -> str:
+        return "fake-docker"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _serve_in_child(conn, kwargs: Dict[str, Any]) -> None:
+    fake = FakeDockerDaemon(**kwargs)
+    fake.start()
+    conn.send(fake.socket_path)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            name, args, kw = message
+            try:
+                conn.send((True, getattr(fake, name)(*args, **kw)))
+            except Exception as e:
+                conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        fake.stop()
+
+
+class FakeDaemonProcess:
+    """
+    FakeDockerDaemon running in a child process, so that the measuring
+    process only sees client-side CPU time and allocations.
+
+    Public methods of the daemon are forwarded over a pipe and must take and
+    return picklable values, e.g. ``proc.add_container("web")`` or
+    ``proc.endpoint_counts()``. Takes the FakeDockerDaemon arguments.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._kwargs = kwargs
+        self._conn = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._lock = threading.Lock()
+        self.socket_path: Optional[str] = None
+
+    def start(self) -> str:
+        """Start the child, wait until it serves, and return the ``unix://`` base URL."""
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_serve_in_child, args=(child_conn, self._kwargs), daemon=True)
+        self._process.start()
+        self.socket_path = self._conn.recv()
+        return f"unix://{self.socket_path}"
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(10)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._process = None
+
+    def __enter__(self) -> "FakeDaemonProcess":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or not callable(getattr(FakeDockerDaemon, name, None)):
+            raise AttributeError(name)
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                self._conn.send((name, args, kwargs))
+                ok, value = self._conn.recv()
+            if not ok:
+                raise RuntimeError(f"fake daemon {name}() failed: {value}")
+            return value
+
+        return call
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_daemon import FakeDockerDaemon  # noqa: E402
+from tools.docker_client import ClientRegistry  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """An in-process fake daemon; DOCKER_HOST points at it for the test."""
+    daemon = FakeDockerDaemon(containers=4, images=2, volumes=2)
+    monkeypatch.setenv("DOCKER_HOST", daemon.start())
+    yield daemon
+    daemon.stop()
+
+
+@pytest.fixture
+def registry(fake):
+    """A client registry of its own, so caches and indexes do not leak between tests."""
+    registry = ClientRegistry()
+    yield registry
+    registry.close()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from tools.async_tools import ToolExecutor
+from tools.cancellation import CallCancelled, CallContext, call_scope, current_call, in_current_call
+from tools.container_tools import ContainerTools
+
+
+def test_in_current_call_binds_worker_threads():
+    ctx = CallContext()
+    seen = []
+    with call_scope(ctx):
+        bound = in_current_call(lambda: seen.append(current_call()))
+    bound()
+    assert seen == [ctx]
+    assert current_call() is None
+
+    ctx.abort()
+    with pytest.raises(CallCancelled):
+        bound()
+
+
+def test_in_current_call_outside_a_call_is_identity():
+    fn = lambda: None  # noqa: E731
+    assert in_current_call(fn) is fn
+
+
+@pytest.mark.parametrize("method, kwargs", [
+    ("stop_container", {"container_identifier": "container-0"}),
+    ("stop_containers", {"container_identifiers": ["container-0", "container-2"]}),
+])
+def test_timeout_frees_the_worker(fake, registry, method, kwargs):
+    fake.stop_delay = 3.0
+    tools = ContainerTools(registry)
+    executor = ToolExecutor(1)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(getattr(tools, method), timeout=0.2, **kwargs)
+        started = time.monotonic()
+        await executor.run(tools.get_container_info, "container-1", timeout=5)
+        return time.monotonic() - started
+
+    try:
+        # The timed-out call's requests, including those of its inner pool, are
+        # aborted, so the single worker is free for the next call at once.
+        assert asyncio.run(scenario()) < 1.0
+    finally:
+        executor.close()
+        tools.close()
+
+
+def test_stream_deadline_frees_the_worker(fake, registry):
+    tools = ContainerTools(registry)
+    executor = ToolExecutor(1)
+
+    async def scenario():
+        # Prints once, then goes quiet with the stream still open.
+        stream = await executor.run(tools.stream_exec, "container-0", "echo hi ; sleep 10", timeout=1.0)
+        items = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for item in stream:
+                items.append(item)
+        assert items == [{"stream": "stdout", "data": "hi\n"}]
+        started = time.monotonic()
+        await executor.run(tools.get_container_info, "container-1", timeout=5)
+        return time.monotonic() - started
+
+    try:
+        # The streaming connection stays tracked after the first item, so the
+        # deadline aborts it and the single worker is free at once.
+        assert asyncio.run(scenario()) < 1.0
+    finally:
+        executor.close()
+        tools.close()
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import random
+import threading
+
+import pytest
+
+from tools import chunk_store
+from tools.chunk_store import ChunkStore, ContentDefinedChunker
+from tools.volume_tools import VolumeTools
+
+MIN, AVG, MAX = 4 * 1024, 8 * 1024, 64 * 1024
+
+
+def _random_bytes(size, seed=0):
+    return random.Random(seed).randbytes(size)
+
+
+def _pieces(data, size=10_000):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _digests(chunker, data):
+    return [hashlib.sha256(chunk).hexdigest() for chunk in chunker.chunks(_pieces(data))]
+
+
+def test_chunks_reassemble_within_bounds():
+    chunker = ContentDefinedChunker(MIN, MAX, AVG)
+    data = _random_bytes(1024 * 1024)
+    chunks = list(chunker.chunks(_pieces(data)))
+    assert b"".join(chunks) == data
+    assert all(MIN < len(chunk) <= MAX for chunk in chunks[:-1])
+
+
+@pytest.mark.parametrize("inserted", [1, 400, 4096, 65536])
+def test_insert_reuses_most_chunks(inserted):
+    chunker = ContentDefinedChunker(MIN, MAX, AVG)
+    data = _random_bytes(2 * 1024 * 1024)
+    before = _digests(chunker, data)
+    edited = data[:50_000] + _random_bytes(inserted, seed=1) + data[50_000:]
+    after = _digests(chunker, edited)
+    changed = len(set(after) - set(before))
+    # Only chunks overlapping the insert change; cut points after it are found again.
+    assert changed <= 2 + inserted // MIN
+    assert changed < len(after) // 10
+
+
+@pytest.mark.skipif(chunk_store.numpy is None, reason="numpy not installed")
+@pytest.mark.parametrize("sizes", [(MIN, MAX, AVG), (64, 1000, 400), (64 * 1024, 1024 * 1024, 80 * 1024)])
+def test_vectorized_scan_matches_loop(monkeypatch, sizes):
+    chunker = ContentDefinedChunker(*sizes)
+    data = _random_bytes(3 * 1024 * 1024, seed=2)
+    vectorized = [len(chunk) for chunk in chunker.chunks(_pieces(data, 7777))]
+    monkeypatch.setattr(chunk_store, "numpy", None)
+    assert [len(chunk) for chunk in chunker.chunks(_pieces(data, 7777))] == vectorized
+
+
+def test_mixed_codec_snapshots_restore(tmp_path):
+    data = _random_bytes(512 * 1024)
+    chunker = ContentDefinedChunker(MIN, MAX, AVG)
+    gzip_store = ChunkStore(str(tmp_path), "gzip")
+    first = gzip_store.write_snapshot("data", _pieces(data), chunker)
+    plain_store = ChunkStore(str(tmp_path), "none")
+    second = plain_store.write_snapshot("data", _pieces(data + b"tail"), chunker)
+
+    # The second snapshot reuses the gzip chunks and records their codec.
+    assert second["new_chunks"] <= 1
+    assert {codec for _, _, codec in second["chunks"]} == {"gzip", "none"}
+    for store in (gzip_store, plain_store):
+        assert b"".join(store.iter_snapshot(first["manifest_path"])) == data
+        assert b"".join(store.iter_snapshot(second["manifest_path"])) == data + b"tail"
+
+
+def test_snapshot_lookup(tmp_path):
+    store = ChunkStore(str(tmp_path))
+    first = store.write_snapshot("data", [b"one"])
+    second = store.write_snapshot("data", [b"two"])
+    assert store.list_snapshots("data") == [first["snapshot"], second["snapshot"]]
+    assert store.snapshot_path("data") == second["manifest_path"]
+    assert store.snapshot_path("data", first["snapshot"]) == first["manifest_path"]
+    with pytest.raises(ValueError):
+        store.snapshot_path("data", "19700101T000000Z")
+    with pytest.raises(ValueError):
+        store.snapshot_path("other")
+
+
+def test_incremental_backup_round_trip(fake, registry, tmp_path):
+    fake.put_volume_file("volume-0", "db/data.bin", _random_bytes(300 * 1024))
+    fake.put_volume_file("volume-0", "README", b"hello\n")
+    tools = VolumeTools(registry)
+    try:
+        store_dir = str(tmp_path / "store")
+        backup = tools.backup_volume_incremental(
+            "volume-0", store_dir, min_chunk_size=MIN, max_chunk_size=MAX
+        )
+        fake.put_volume_file("volume-0", "README", b"changed\n")
+
+        restored = tools.restore_volume_incremental(
+            "copy", store_dir, source_volume="volume-0", create_volume=True
+        )
+        assert restored["snapshot"] == backup["snapshot"]
+        assert restored["bytes_restored"] == backup["bytes_read"]
+        assert fake.volume_files["copy"] == {
+            "db/data.bin": fake.volume_files["volume-0"]["db/data.bin"],
+            "README": b"hello\n",
+        }
+        with pytest.raises(ValueError):
+            tools.restore_volume_incremental("volume-1", store_dir)
+    finally:
+        tools.close()
+
+
+def test_restore_rejects_corrupt_chunk(tmp_path):
+    store = ChunkStore(str(tmp_path), "none")
+    manifest = store.write_snapshot("data", [b"payload"])
+    digest, _, codec = manifest["chunks"][0]
+    with open(store.chunk_path(digest, codec), "wb") as f:
+        f.write(b"tampered")
+    with pytest.raises(RuntimeError, match="corrupt"):
+        list(store.iter_snapshot(manifest["manifest_path"]))
+
+
+
+def test_concurrent_snapshots_get_distinct_names(tmp_path, monkeypatch):
+    store = ChunkStore(str(tmp_path), "none")
+    monkeypatch.setattr(chunk_store.time, "strftime", lambda *args: "20240101T000000Z")
+    barrier = threading.Barrier(4)
+    results = []
+
+    def backup(n):
+        barrier.wait()
+        results.append(store.write_snapshot("data", [b"payload %d" % n]))
+
+    threads = [threading.Thread(target=backup, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    names = sorted(manifest["snapshot"] for manifest in results)
+    assert names == ["20240101T000000Z", "20240101T000000Z-1", "20240101T000000Z-2", "20240101T000000Z-3"]
+    for manifest in results:
+        assert store.read_manifest(manifest["manifest_path"])["snapshot"] == manifest["snapshot"]
+    # No temp files are left behind next to the manifests.
+    assert set(os.listdir(os.path.dirname(results[0]["manifest_path"]))) == {n + ".json" for n in names}
+
+
+def test_restore_rejects_truncated_manifest(tmp_path):
+    store = ChunkStore(str(tmp_path), "none")
+    path = store.write_snapshot("data", [b"payload"])["manifest_path"]
+    with open(path, "r+", encoding="utf-8") as f:
+        f.truncate(len(f.read()) // 2)
+    with pytest.raises(RuntimeError, match="corrupt or truncated"):
+        store.iter_snapshot(path)
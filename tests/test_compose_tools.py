@@ -0,0 +1,52 @@
+import subprocess
+
+import pytest
+
+from tools.compose_tools import ComposeTools
+
+
+@pytest.fixture
+def compose(registry, monkeypatch):
+    monkeypatch.delenv("COMPOSE_PROJECT_NAME", raising=False)
+    monkeypatch.delenv("COMPOSE_FILE", raising=False)
+    return ComposeTools(registry)
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+
+
+def test_project_name_from_dotenv(compose, monkeypatch, tmp_path):
+    _write(tmp_path / "compose.yaml", "name: fromfile\nservices: {}\n")
+    _write(tmp_path / ".env", "# settings\nexport COMPOSE_PROJECT_NAME='From-Env'  \nOTHER=1\n")
+    assert compose._project_name(str(tmp_path)) == "from-env"
+    monkeypatch.setenv("COMPOSE_PROJECT_NAME", "shell")
+    assert compose._project_name(str(tmp_path)) == "shell"
+
+
+def test_project_name_follows_cli_file_order(compose, tmp_path):
+    _write(tmp_path / "docker-compose.yml", "name: legacy\n")
+    _write(tmp_path / "compose.yaml", "name: current\n")
+    assert compose._project_name(str(tmp_path)) == "current"
+    _write(tmp_path / ".env", "COMPOSE_FILE=docker-compose.yml\n")
+    assert compose._project_name(str(tmp_path)) == "legacy"
+
+
+def test_api_ps_uses_dotenv_project(fake, compose, tmp_path):
+    _write(tmp_path / "compose.yaml", "services: {}\n")
+    _write(tmp_path / ".env", "COMPOSE_PROJECT_NAME=shop\n")
+    fake.add_compose_project("shop", str(tmp_path), ["web", "db"])
+    rows = compose.compose_ps(str(tmp_path), all_containers=True, use_api=True)
+    assert [row["service"] for row in rows] == ["db", "web"]
+
+
+def test_api_ps_falls_back_to_cli_when_empty(fake, compose, monkeypatch, tmp_path):
+    _write(tmp_path / "compose.yaml", "services: {}\n")
+    compose._detected_cmd = ["docker", "compose"]
+    line = '{"ID": "abc", "Name": "x-web-1", "Service": "web", "State": "running"}\n'
+    monkeypatch.setattr(
+        compose, "_run_compose",
+        lambda project_dir, args: subprocess.CompletedProcess(args, 0, line, ""),
+    )
+    rows = compose.compose_ps(str(tmp_path), use_api=True)
+    assert [row["service"] for row in rows] == ["web"]
@@ -0,0 +1,77 @@
+import pytest
+
+from tools.container_tools import ContainerTools
+
+
+@pytest.fixture
+def tools(registry):
+    tools = ContainerTools(registry)
+    yield tools
+    tools.close()
+
+
+def test_mixed_identifiers_and_label_are_deduplicated(fake, tools):
+    web = [fake.add_container(f"web-{n}", labels={"tier": "web"}) for n in range(3)]
+    result = tools.remove_containers(
+        ["web-0", web[0], web[1][:12], "web-1"], label="tier=web", force=True
+    )
+    # Each container is removed once; no spurious "not found" from a second removal.
+    assert result["total"] == 3
+    assert result["failed"] == 0
+    assert [r["target"] for r in result["results"]] == web
+    assert not any(container_id in fake.containers for container_id in web)
+
+
+def test_bulk_errors_are_reported_per_item(fake, tools):
+    result = tools.stop_containers(["container-0", "missing", "container", "container-0"], timeout=0)
+    by_target = {r["target"]: r for r in result["results"]}
+    assert result["total"] == 3
+    assert result["succeeded"] == 1
+    assert by_target["missing"]["error"].startswith("Container 'missing' not found")
+    assert by_target["container"]["error"].startswith("Multiple containers match 'container'")
+    assert [r["ok"] for r in result["results"]] == [True, False, False]
+
+
+def test_nothing_selected_is_a_user_error(tools):
+    with pytest.raises(ValueError, match="No containers selected"):
+        tools.start_containers([], label=None)
+
+
+def _run_exec(tools, command, **kwargs):
+    items = list(tools.stream_exec("container-0", command, **kwargs))
+    return items[:-1], items[-1]
+
+
+def test_stream_exec_splits_stdout_and_stderr(tools):
+    chunks, summary = _run_exec(tools, "echo out ; warn err")
+    assert chunks == [{"stream": "stdout", "data": "out\n"}, {"stream": "stderr", "data": "err\n"}]
+    assert summary["exit_code"] == 1
+    assert summary["bytes"] == 8
+    assert not summary["truncated"] and not summary["timed_out"]
+
+
+def test_stream_exec_under_the_cap_exits_normally(tools):
+    # The pidfile wrapper is used, but the command finishes on its own.
+    chunks, summary = _run_exec(tools, "echo hi", max_bytes=100, timeout=10)
+    assert chunks == [{"stream": "stdout", "data": "hi\n"}]
+    assert summary["exit_code"] == 0
+    assert not summary["truncated"] and not summary["timed_out"]
+
+
+def test_stream_exec_truncates_and_kills_at_the_byte_cap(fake, tools):
+    chunks, summary = _run_exec(tools, "yes", max_bytes=10_000)
+    assert sum(len(chunk["data"]) for chunk in chunks) == 10_000
+    assert summary["bytes"] == 10_000
+    assert summary["truncated"] and not summary["timed_out"]
+    # Killed through the pidfile, as SIGKILL would.
+    assert summary["exit_code"] == 137
+    assert not any(ex["Running"] for ex in fake.execs.values())
+
+
+def test_stream_exec_kills_at_the_deadline(tools):
+    chunks, summary = _run_exec(tools, "echo started ; sleep 30", timeout=0.3)
+    assert chunks == [{"stream": "stdout", "data": "started\n"}]
+    assert summary["timed_out"] and not summary["truncated"]
+    assert summary["exit_code"] == 137
+    # The kill ended the output; the read did not wait out the grace period.
+    assert summary["elapsed_seconds"] < 2
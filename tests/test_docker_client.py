@@ -0,0 +1,31 @@
+from tools.docker_client import ClientRegistry
+from tools.container_tools import ContainerTools
+
+
+def test_tools_recover_after_a_daemon_restart(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    tools = ContainerTools(registry)
+    try:
+        before = tools.get_container_logs("container-1")
+        client = registry.get()
+        fake.restart()
+        fake.reset_counts()
+        # Pooled keep-alive connections are dead; the next calls dial again.
+        assert tools.get_container_logs("container-1") == before
+        assert tools.client.api.inspect_container("container-2")["Name"] == "/container-2"
+        assert fake.total_requests() >= 2
+        assert registry.get() is client
+        assert registry.event_hub().wait_connected(5)
+    finally:
+        tools.close()
+
+
+def test_reconnect_replaces_the_client(fake):
+    registry = ClientRegistry()
+    try:
+        client = registry.get()
+        registry.configure(pool_size=2)
+        assert registry.get() is not client
+        assert registry.get().ping()
+    finally:
+        registry.close()
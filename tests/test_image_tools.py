@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from tools.image_index import get_image_index
+from tools.image_metadata import get_image_metadata_cache
+from tools.image_tools import ImageTools
+
+
+@pytest.fixture
+def tools(registry):
+    assert registry.event_hub().wait_connected(2)
+    tools = ImageTools(registry)
+    yield tools
+    tools.close()
+
+
+@pytest.fixture
+def quiet(fake):
+    """Hold back daemon events, as if they were still in flight."""
+    emit, fake.emit = fake.emit, lambda *args, **kwargs: None
+    yield
+    fake.emit = emit
+
+
+def _wait_indexed(index, reference):
+    deadline = time.monotonic() + 2
+    while not index.resolve(reference):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_exact_tag_wins_over_partial_index_hit(fake, registry, tools):
+    index = get_image_index(registry)
+    alpine = fake.add_image("nginx:1.25-alpine")
+    _wait_indexed(index, "nginx:1.25-alpine")
+
+    fake.emit = lambda *args, **kwargs: None
+    plain = fake.add_image("nginx:1.25", emit=False)
+    assert [image_id for image_id, _ in index.resolve("nginx:1.25")] == [alpine]
+    assert tools._find_image("nginx:1.25").id == plain
+    assert tools._find_image("1.25-alp").id == alpine
+
+
+def test_pull_and_remove_update_the_index(fake, registry, tools, quiet):
+    index = get_image_index(registry)
+    assert index.resolve("redis:7") == []
+    pulled = tools.pull_image("redis", "7")
+    assert index.resolve("redis:7") == [(pulled["id"], ["redis:7"])]
+    assert tools.get_image_info("redis:7")["tags"] == ["redis:7"]
+    tools.remove_image("redis:7")
+    assert index.resolve("redis:7") == []
+
+
+def test_image_info_is_served_from_the_metadata_cache(fake, registry, tools):
+    image_id = fake.add_image("web:1")
+    _wait_indexed(get_image_index(registry), "web:1")
+    first = tools.get_image_info("web:1")
+    assert first["id"] == image_id
+    fake.reset_counts()
+    # The inspect fetched for get_image_info is the metadata cache's entry.
+    assert get_image_metadata_cache(registry).inspect(image_id)["RepoTags"] == ["web:1"]
+    assert tools.get_image_info("web:1") == first
+    assert tools.get_image_info(image_id) == first
+    assert fake.total_requests() == 0
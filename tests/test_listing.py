@@ -0,0 +1,69 @@
+import pytest
+
+from tools.listing import paginate
+
+FIELDS = ("id", "name", "size")
+
+
+def _items(sizes):
+    return [{"id": f"id-{i:02d}", "name": f"item-{i}", "size": size} for i, size in enumerate(sizes)]
+
+
+def _walk(items, limit, **kwargs):
+    """Follow next_cursor to the end; returns the ids of every page."""
+    pages, cursor = [], None
+    while True:
+        page = paginate(items, "id", FIELDS, limit=limit, cursor=cursor, **kwargs)
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_ties_on_the_sort_key_are_paged_by_key():
+    items = _items([5, 1, 5, 5, 1, 5, 5])
+    pages = _walk(items, 2, sort_by="size")
+    ids = [i for page in pages for i in page]
+    assert ids == ["id-01", "id-04", "id-00", "id-02", "id-03", "id-05", "id-06"]
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+
+def test_descending_pages_cover_everything_once():
+    items = _items([3, 9, None, 9, 1])
+    pages = _walk(items, 2, sort_by="size", descending=True)
+    # None sorts first ascending, so last descending; ties by key, reversed.
+    assert [i for page in pages for i in page] == ["id-03", "id-01", "id-00", "id-04", "id-02"]
+
+
+def test_cursor_past_a_deleted_row():
+    items = _items([1, 2, 3, 4, 5, 6])
+    first = paginate(items, "id", FIELDS, sort_by="size", limit=2)
+    assert [item["id"] for item in first["items"]] == ["id-00", "id-01"]
+    # The cursor row and a row on the next page are removed, and a row is
+    # added before the cursor; the next page neither skips nor repeats.
+    remaining = [item for item in items if item["id"] not in ("id-01", "id-03")]
+    remaining.append({"id": "id-99", "name": "new", "size": 0})
+    second = paginate(remaining, "id", FIELDS, sort_by="size", limit=2, cursor=first["next_cursor"])
+    assert [item["id"] for item in second["items"]] == ["id-02", "id-04"]
+    assert second["total"] == 5
+    third = paginate(remaining, "id", FIELDS, sort_by="size", limit=2, cursor=second["next_cursor"])
+    assert [item["id"] for item in third["items"]] == ["id-05"]
+    assert third["next_cursor"] is None
+
+
+def test_cursor_must_match_the_sort_order():
+    items = _items([1, 2, 3])
+    cursor = paginate(items, "id", FIELDS, sort_by="size", limit=1)["next_cursor"]
+    with pytest.raises(ValueError, match="different sort order"):
+        paginate(items, "id", FIELDS, sort_by="size", descending=True, limit=1, cursor=cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        paginate(items, "id", FIELDS, limit=1, cursor="not-a-cursor")
+
+
+def test_unpaged_lists_are_returned_as_is():
+    items = _items([2, 1])
+    assert paginate(items, "id", FIELDS) == items
+    assert [item["id"] for item in paginate(items, "id", FIELDS, sort_by="size")] == ["id-01", "id-00"]
+    assert paginate(items, "id", FIELDS, limit=5, fields=["name"])["items"] == [
+        {"name": "item-0"}, {"name": "item-1"}
+    ]
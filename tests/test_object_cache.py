@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from tools.object_cache import get_object_cache
+from tools.volume_tools import VolumeTools
+
+
+@pytest.fixture
+def cache(registry):
+    assert registry.event_hub().wait_connected(2)
+    return get_object_cache(registry)
+
+
+def test_event_during_full_relist_is_not_lost(fake, cache):
+    assert cache.snapshot("image") is not None
+    cache.invalidate("image")
+    original = cache._list
+    calls = []
+
+    def list_with_event(kind, keys):
+        entries = original(kind, keys)
+        calls.append(kind)
+        if len(calls) == 1:
+            # An image event delivered while the relist is in flight.
+            fake.add_image("late:latest")
+            cache._on_event({"Type": "image", "Action": "tag", "Actor": {"ID": "sha256:late"}})
+        return entries
+
+    cache._list = list_with_event
+    first, _ = cache.snapshot("image")
+    assert not any("late:latest" in (image.get("RepoTags") or []) for image in first)
+    second, _ = cache.snapshot("image")
+    assert calls == ["image", "image"]
+    assert any("late:latest" in (image.get("RepoTags") or []) for image in second)
+
+
+def test_invalidate_refreshes_one_entry(fake, cache):
+    names = {volume["Name"] for volume in cache.snapshot("volume")[0]}
+    fake.add_volume("quiet", emit=False)
+    assert "quiet" not in {volume["Name"] for volume in cache.snapshot("volume")[0]}
+    cache.invalidate("volume", "quiet")
+    assert {volume["Name"] for volume in cache.snapshot("volume")[0]} == names | {"quiet"}
+
+
+def test_reads_see_the_tools_own_writes(fake, registry, cache):
+    tools = VolumeTools(registry)
+    # Events are delivered late, as a busy daemon would; only the tools' own
+    # invalidation makes the new volume visible to the next read.
+    emit = fake.emit
+    fake.emit = lambda *args, **kwargs: None
+    try:
+        for i in range(30):
+            tools.create_volume(f"fresh-{i}")
+            assert f"fresh-{i}" in {v["name"] for v in tools.get_volume_list()}
+        tools.remove_volume("fresh-0")
+        assert "fresh-0" not in {v["name"] for v in tools.get_volume_list()}
+    finally:
+        fake.emit = emit
+        tools.close()
+
+
+def test_paged_lists_report_as_of(registry, cache):
+    tools = VolumeTools(registry)
+    try:
+        before = time.time_ns()
+        tools.create_volume("stamped")
+        page = tools.get_volume_list(limit=1)
+        assert page["as_of"] >= before
+        assert page["total"] >= 1
+    finally:
+        tools.close()
@@ -0,0 +1,74 @@
+import time
+
+from tools.container_tools import ContainerTools
+from tools.resolver import ContainerResolver, get_container_resolver
+
+
+def test_ids_resolve_by_prefix_only(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    resolver = ContainerResolver(registry)
+    try:
+        container_id = next(i for i, c in fake.containers.items() if c["Name"] == "container-1")
+        assert resolver.resolve(container_id[:10]) == [(container_id, "container-1")]
+        assert resolver.resolve(container_id.upper()) == [(container_id, "container-1")]
+        assert resolver.resolve(container_id[20:40]) == []
+        assert [name for _, name in resolver.resolve("tainer-3")] == ["container-3"]
+        # Only names contribute trigram postings.
+        grams = resolver._index._keys_by_gram
+        assert all(key.startswith("container-") for keys in grams.values() for key in keys)
+
+        new_id = fake.add_container("late")
+        deadline = time.monotonic() + 2
+        while not resolver.resolve(new_id[:12]):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        fake.remove_container(new_id)
+        while resolver.resolve(new_id[:12]):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert new_id not in resolver._ids
+    finally:
+        resolver.close()
+
+
+def _indexed(resolver, name):
+    deadline = time.monotonic() + 2
+    while name not in resolver._names.values():
+        assert time.monotonic() < deadline
+        resolver.resolve(name)
+        time.sleep(0.01)
+
+
+def test_exact_name_wins_over_stale_partial_hit(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    tools = ContainerTools(registry)
+    resolver = get_container_resolver(registry)
+    try:
+        fake.add_container("web-old")
+        _indexed(resolver, "web-old")
+        # "web" is created while its event is still in flight.
+        emit, fake.emit = fake.emit, lambda *args, **kwargs: None
+        try:
+            web_id = fake.add_container("web")
+            assert [name for _, name in resolver.resolve("web")] == ["web-old"]
+            assert tools._find_container("web").id == web_id
+            assert tools._find_container("web-ol").name == "web-old"
+        finally:
+            fake.emit = emit
+    finally:
+        tools.close()
+
+
+def test_run_and_remove_update_the_resolver(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    tools = ContainerTools(registry)
+    resolver = get_container_resolver(registry)
+    try:
+        assert resolver.resolve("container-0")
+        fake.emit = lambda *args, **kwargs: None
+        created = tools.run_container(next(iter(fake.images)), name="fresh")
+        assert resolver.resolve("fresh") == [(created["id"], "fresh")]
+        tools.remove_container("fresh", force=True)
+        assert resolver.resolve("fresh") == []
+    finally:
+        tools.close()
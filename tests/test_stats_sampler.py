@@ -0,0 +1,36 @@
+import time
+
+from tools.container_tools import ContainerTools
+from tools.stats_sampler import MAX_SAMPLE_AGE, get_stats_sampler
+
+
+def test_stale_sample_falls_back_to_one_shot(fake, registry):
+    fake.stats_interval = 0.05
+    tools = ContainerTools(registry)
+    sampler = get_stats_sampler(registry)
+    try:
+        container_id = tools._find_container("container-0").id
+        sampler.watch(container_id)
+        deadline = time.monotonic() + 2
+        while sampler.latest(container_id) is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert tools.get_container_stats(container_id)["timestamp"] > time.time() - MAX_SAMPLE_AGE
+
+        # A stream that is reconnecting leaves only an old sample behind.
+        sampler.unwatch(container_id)
+        sampler.watch(container_id)
+        watch = sampler._watches[container_id]
+        sampler._stop_watch(watch)
+        watch.thread.join(2)
+        stale = time.time() - 60
+        with watch.lock:
+            watch.ring.append((stale, 1.0, 1, 1, 0, 0))
+        assert sampler.latest(container_id)["timestamp"] == stale
+        assert sampler.latest(container_id, MAX_SAMPLE_AGE) is None
+
+        # The old reading is not presented as current; a one-shot call is made.
+        started = time.time()
+        assert tools.get_container_stats(container_id)["timestamp"] >= started
+    finally:
+        tools.close()
@@ -0,0 +1,44 @@
+import time
+
+from tools.volume_index import VolumeUsageIndex
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_events_do_not_call_the_api(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    index = VolumeUsageIndex(registry)
+    try:
+        assert {u["name"] for u in index.usage("volume-0")} == {"container-0"}
+        fake.reset_counts()
+        new_ids = [fake.add_container(f"burst-{i}", volumes={"volume-0": "/data"}) for i in range(20)]
+        _wait_for(lambda: set(new_ids) <= index._dirty)
+        # Handling the burst on the shared event thread issued no requests.
+        assert fake.total_requests() == 0
+
+        names = {u["name"] for u in index.usage("volume-0")}
+        assert names == {"container-0"} | {f"burst-{i}" for i in range(20)}
+        # The dirty containers were re-read with one filtered listing.
+        assert fake.total_requests() == 1
+    finally:
+        index.close()
+
+
+def test_destroy_drops_usage(fake, registry):
+    assert registry.event_hub().wait_connected(2)
+    index = VolumeUsageIndex(registry)
+    try:
+        assert index.usage("volume-1") is not None
+        container_id = fake.add_container("short-lived", volumes={"volume-1": "/v"})
+        _wait_for(lambda: container_id in index._dirty)
+        assert "short-lived" in {u["name"] for u in index.usage("volume-1")}
+        fake.remove_container(container_id)
+        _wait_for(lambda: container_id not in index._records)
+        assert "short-lived" not in {u["name"] for u in index.usage("volume-1")}
+    finally:
+        index.close()
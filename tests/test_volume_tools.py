@@ -0,0 +1,31 @@
+import io
+import tarfile
+
+from tools.volume_tools import VolumeTools
+
+
+def _write_tar(path, files):
+    with tarfile.open(path, "w") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def test_batch_restore_never_matches_partial_names(fake, registry, tmp_path):
+    fake.add_volume("mydata")
+    fake.put_volume_file("mydata", "keep.txt", b"original")
+    _write_tar(tmp_path / "data.tar", {"new.txt": b"from backup"})
+    _write_tar(tmp_path / "volume-1.tar", {"restored.txt": b"ok"})
+    tools = VolumeTools(registry)
+    try:
+        result = tools.restore_volumes(str(tmp_path), create_volumes=False)
+        by_target = {r["target"]: r for r in result["results"]}
+        assert by_target["volume-1"]["ok"]
+        assert fake.volume_files["volume-1"]["restored.txt"] == b"ok"
+        # No volume is named exactly "data": a per-item error, not a restore into "mydata".
+        assert not by_target["data"]["ok"]
+        assert by_target["data"]["error"] == "Volume 'data' not found."
+        assert fake.volume_files["mydata"] == {"keep.txt": b"original"}
+    finally:
+        tools.close()
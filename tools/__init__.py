@@ -1,3 +1,37 @@
 __version__ = "0.1.0"
 
-from .compose_tools import ComposeTools
\ No newline at end of file
+from .async_tools import (
+    AsyncComposeTools,
+    AsyncContainerTools,
+    AsyncImageTools,
+    AsyncNetworkTools,
+    AsyncVolumeTools,
+    ToolExecutor,
+)
+from .compose_tools import ComposeTools
+from .container_tools import ContainerTools
+from .docker_client import ClientRegistry, get_client, get_registry
+from .image_tools import ImageTools
+from .metrics import MetricsCollector, get_metrics, render_openmetrics
+from .network_tools import NetworkTools
+from .volume_tools import VolumeTools
+
+__all__ = [
+    "AsyncComposeTools",
+    "AsyncContainerTools",
+    "AsyncImageTools",
+    "AsyncNetworkTools",
+    "AsyncVolumeTools",
+    "ClientRegistry",
+    "ComposeTools",
+    "ContainerTools",
+    "ImageTools",
+    "MetricsCollector",
+    "NetworkTools",
+    "ToolExecutor",
+    "VolumeTools",
+    "get_client",
+    "get_metrics",
+    "get_registry",
+    "render_openmetrics",
+]
@@ -0,0 +1,200 @@
+import asyncio
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .cancellation import CallCancelled, CallContext, call_scope
+from .compose_tools import ComposeTools
+from .container_tools import ContainerTools
+from .docker_client import ClientRegistry, get_registry
+from .image_tools import ImageTools
+from .network_tools import NetworkTools
+from .volume_tools import VolumeTools
+
+
+DEFAULT_WORKERS = 32
+
+
+class ToolExecutor:
+    """
+    Thread pool running blocking tool calls for asyncio callers.
+
+    Each call gets a CallContext; on timeout or cancellation the context is
+    aborted, which shuts down the Docker API connections the call is using and
+    kills compose subprocesses it started, so the worker thread is freed
+    instead of finishing the request in the background. The daemon may still
+    complete an operation it had already accepted (e.g. a stop in progress).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker threads (default: DOCKER_MCP_WORKERS or 32)
+        """
+        if max_workers is None:
+            max_workers = int(os.environ.get("DOCKER_MCP_WORKERS", DEFAULT_WORKERS))
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docker-mcp")
+
+    @staticmethod
+    def _invoke(ctx: CallContext, fn: Callable, args, kwargs, streaming: bool = False) -> Any:
+        """
+        Run fn under ctx. Tracking ends when fn returns, unless it returned a
+        generator or is one step of iterating one (streaming); then _iterate
+        ends it when the iteration is over.
+        """
+        if ctx.cancelled.is_set():
+            raise CallCancelled("Call was cancelled before it started")
+        with call_scope(ctx):
+            try:
+                result = fn(*args, **kwargs)
+                # A generator keeps its connection open; tracking ends when it is closed.
+                streaming = streaming or inspect.isgenerator(result)
+                return result
+            finally:
+                if not streaming:
+                    ctx.finish()
+
+    async def _submit(
+        self,
+        ctx: CallContext,
+        fn: Callable,
+        args=(),
+        kwargs=None,
+        timeout: Optional[float] = None,
+        name: str = "call",
+        limit: Optional[float] = None,
+        streaming: bool = False,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._pool, functools.partial(self._invoke, ctx, fn, args, kwargs or {}, streaming)
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            ctx.abort()
+            raise asyncio.TimeoutError(f"{name} timed out after {limit or timeout}s")
+        except asyncio.CancelledError:
+            ctx.abort()
+            raise
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool; abort it on timeout or cancellation.
+        If fn returns a generator, an async iterator over it is returned instead
+        and timeout becomes a deadline for the whole iteration.
+        """
+        name = getattr(fn, "__name__", "call")
+        ctx = CallContext()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        result = await self._submit(ctx, fn, args, kwargs, timeout, name=name)
+        if inspect.isgenerator(result):
+            return self._iterate(ctx, result, deadline, name, timeout)
+        return result
+
+    async def _iterate(self, ctx: CallContext, gen, deadline: Optional[float], name: str, limit: Optional[float]):
+        done = object()
+        try:
+            while True:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                item = await self._submit(
+                    ctx, next, (gen, done), None, remaining, name, limit, streaming=True
+                )
+                if item is done:
+                    return
+                yield item
+        finally:
+            ctx.abort()
+            try:
+                gen.close()
+            except ValueError:
+                # Still running on a worker; the abort makes it fail and exit.
+                pass
+            ctx.finish()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_tool_executor(registry: ClientRegistry) -> ToolExecutor:
+    """Shared executor for async calls made through registry's tools."""
+    return registry.service("tool_executor", ToolExecutor)
+
+
+class AsyncTools:
+    """
+    Asyncio facade with the same method surface as a tool instance.
+
+    Every public method of the wrapped tools is exposed as a coroutine
+    function taking the same arguments plus call_timeout (seconds, default:
+    default_timeout). Methods returning a generator (e.g.
+    stream_container_logs) resolve to an async iterator:
+    ``async for line in await tools.stream_container_logs(name)``.
+    """
+
+    tools_class: Optional[type] = None
+
+    def __init__(
+        self,
+        registry: Optional[ClientRegistry] = None,
+        executor: Optional[ToolExecutor] = None,
+        default_timeout: Optional[float] = None,
+        tools: Any = None,
+    ):
+        self._registry = registry or get_registry()
+        self._tools = tools if tools is not None else self.tools_class(self._registry)
+        self._executor = executor or get_tool_executor(self._registry)
+        self.default_timeout = default_timeout
+        self._methods: Dict[str, Callable] = {}
+
+    @property
+    def sync(self) -> Any:
+        """The wrapped blocking tools instance."""
+        return self._tools
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = self._methods.get(name)
+        if method is not None:
+            return method
+        target = getattr(self._tools, name)
+        if not callable(target):
+            return target
+        executor = self._executor
+
+        @functools.wraps(target)
+        async def method(*args, call_timeout: Optional[float] = None, **kwargs):
+            timeout = self.default_timeout if call_timeout is None else call_timeout
+            return await executor.run(target, *args, timeout=timeout, **kwargs)
+
+        self._methods[name] = method
+        return method
+
+    def close(self) -> None:
+        """Close the wrapped tools (releases the shared Docker client)."""
+        self._tools.close()
+
+
+class AsyncContainerTools(AsyncTools):
+    tools_class = ContainerTools
+
+
+class AsyncImageTools(AsyncTools):
+    tools_class = ImageTools
+
+
+class AsyncNetworkTools(AsyncTools):
+    tools_class = NetworkTools
+
+
+class AsyncVolumeTools(AsyncTools):
+    tools_class = VolumeTools
+
+
+class AsyncComposeTools(AsyncTools):
+    tools_class = ComposeTools
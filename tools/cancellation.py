@@ -0,0 +1,169 @@
+import functools
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class CallCancelled(Exception):
+    """Raised inside a worker when its call was cancelled before a new request started."""
+
+
+class CallContext:
+    """
+    Cancellation handle for one blocking tool call running on a worker thread.
+
+    While the call runs, the HTTP connections it checks out of the Docker
+    client's pools and any subprocesses it starts are registered here;
+    abort() shuts those sockets down and kills the processes, so the blocked
+    worker fails fast instead of running to completion in the background.
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, Any] = {}
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_token = 0
+
+    def track_connection(self, conn: Any) -> None:
+        with self._lock:
+            self._connections[id(conn)] = conn
+        if self.cancelled.is_set():
+            _shutdown(conn)
+            raise CallCancelled("Call was cancelled")
+
+    def untrack_connection(self, conn: Any) -> None:
+        with self._lock:
+            self._connections.pop(id(conn), None)
+
+    def on_abort(self, callback: Callable[[], None]) -> int:
+        """Run callback on abort (immediately if already aborted). Returns a token for remove_abort()."""
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._callbacks[token] = callback
+        if self.cancelled.is_set():
+            callback()
+        return token
+
+    def remove_abort(self, token: int) -> None:
+        with self._lock:
+            self._callbacks.pop(token, None)
+
+    def finish(self) -> None:
+        """Forget everything tracked; a later abort() no longer touches shared connections."""
+        with self._lock:
+            self._connections.clear()
+            self._callbacks.clear()
+
+    def abort(self) -> None:
+        self.cancelled.set()
+        with self._lock:
+            connections = list(self._connections.values())
+            callbacks = list(self._callbacks.values())
+        for conn in connections:
+            _shutdown(conn)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+
+def _shutdown(conn: Any) -> None:
+    sock = getattr(conn, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+_local = threading.local()
+
+
+def current_call() -> Optional[CallContext]:
+    """The CallContext of the call running on this thread, if any."""
+    return getattr(_local, "call", None)
+
+
+@contextmanager
+def call_scope(ctx: CallContext) -> Iterator[CallContext]:
+    """Make ctx the current call on this thread for the duration of the block."""
+    previous = current_call()
+    _local.call = ctx
+    try:
+        yield ctx
+    finally:
+        _local.call = previous
+
+
+def in_current_call(fn: Callable) -> Callable:
+    """
+    Bind fn to the current call, for work a tool hands to its own thread pool:
+    connections the workers open are then aborted with the call, and tasks
+    that start after an abort fail at once instead of holding pool slots.
+    """
+    ctx = current_call()
+    if ctx is None:
+        return fn
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        if ctx.cancelled.is_set():
+            raise CallCancelled("Call was cancelled")
+        with call_scope(ctx):
+            return fn(*args, **kwargs)
+
+    return bound
+
+
+def _hook_pool(pool: Any) -> Any:
+    """Report connections checked out of a urllib3 pool to the current call."""
+    if getattr(pool, "_docker_mcp_tracked", False):
+        return pool
+    get_conn, put_conn = pool._get_conn, pool._put_conn
+
+    def tracked_get_conn(*args, **kwargs):
+        conn = get_conn(*args, **kwargs)
+        ctx = current_call()
+        if ctx is not None:
+            try:
+                ctx.track_connection(conn)
+            except CallCancelled:
+                put_conn(conn)
+                raise
+        return conn
+
+    def tracked_put_conn(conn):
+        ctx = current_call()
+        if ctx is not None:
+            ctx.untrack_connection(conn)
+        return put_conn(conn)
+
+    pool._get_conn = tracked_get_conn
+    pool._put_conn = tracked_put_conn
+    pool._docker_mcp_tracked = True
+    return pool
+
+
+def install_connection_tracking(api_client: Any) -> None:
+    """
+    Hook the HTTP adapters of a docker APIClient so that connections used by
+    a call running under call_scope() can be aborted. Idempotent per client.
+    """
+    if getattr(api_client, "_docker_mcp_tracked", False):
+        return
+    for adapter in api_client.adapters.values():
+        for name in ("get_connection", "get_connection_with_tls_context"):
+            original = getattr(adapter, name, None)
+            if original is None:
+                continue
+
+            def wrapper(*args, _original=original, **kwargs):
+                return _hook_pool(_original(*args, **kwargs))
+
+            setattr(adapter, name, wrapper)
+    api_client._docker_mcp_tracked = True
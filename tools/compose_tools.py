@@ -1,25 +1,103 @@
+import hashlib
 import json
 import os
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
 from typing import List, Dict, Any, Optional
 
+import docker
 
+from .cancellation import current_call
+from .docker_client import ClientRegistry, get_registry
+from .metrics import instrument_tools
+
+
+# In the order the compose CLI picks them when a directory has several.
 COMPOSE_FILES = (
-    "docker-compose.yml",
-    "docker-compose.yaml",
-    "compose.yml",
     "compose.yaml",
+    "compose.yml",
+    "docker-compose.yaml",
+    "docker-compose.yml",
+)
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+ONEOFF_LABEL = "com.docker.compose.oneoff"
+
+# Where the compose v2 CLI plugin may live; their mtimes are part of the cache key.
+COMPOSE_PLUGIN_DIRS = (
+    "~/.docker/cli-plugins",
+    "/usr/local/lib/docker/cli-plugins",
+    "/usr/local/libexec/docker/cli-plugins",
+    "/usr/lib/docker/cli-plugins",
+    "/usr/libexec/docker/cli-plugins",
 )
 
 
+def _cache_dir() -> str:
+    """Directory for small on-disk caches (DOCKER_MCP_CACHE_DIR or ~/.cache/docker-mcp)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("DOCKER_MCP_CACHE_DIR") or os.path.join(base, "docker-mcp")
+
+
+def _read_dotenv(path: str) -> Dict[str, str]:
+    """KEY=VALUE pairs from a compose .env file ({} if it does not exist)."""
+    values: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return values
+    for line in lines:
+        line = line.strip()
+        if line.startswith("export "):
+            line = line[len("export "):].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep or not key or key.startswith("#"):
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip()] = value
+    return values
+
+
 class ComposeTools:
     """
     Helper class for Docker Compose operations.
     """
 
-    def __init__(self):
-        """Initialize Compose CLI (docker compose or docker-compose). Handles detection."""
-        self._compose_cmd = self._detect_compose_cmd()
+    def __init__(
+        self,
+        registry: Optional[ClientRegistry] = None,
+        detect_in_background: bool = False,
+    ):
+        """
+        Initialize Compose tools. The compose CLI (docker compose or docker-compose)
+        is detected lazily on first use, or in a background thread when
+        detect_in_background is True, so construction never blocks on subprocesses.
+        """
+        self._detected_cmd: Optional[List[str]] = None
+        self._detect_lock = threading.Lock()
+        if detect_in_background:
+            self.start_background_detection()
+        # Docker API client is only attached when an API-backed mode is used.
+        self._registry = registry or get_registry()
+        self._client_acquired = False
+        instrument_tools(self, self._registry)
+
+    @property
+    def client(self) -> docker.DockerClient:
+        """Shared Docker client, attached on first use."""
+        if not self._client_acquired:
+            self._registry.acquire()
+            self._client_acquired = True
+        return self._registry.get()
 
     def _has_compose_file(self, directory: str) -> bool:
         """Return True if directory contains a known compose file."""
@@ -61,6 +139,89 @@ class ComposeTools:
                 )
             path = parent
 
+    def _project_name(self, project_dir: str) -> str:
+        """
+        Compose project name for project_dir, resolved like the CLI does:
+        COMPOSE_PROJECT_NAME (environment, then the project's .env), then
+        top-level `name:` in the compose file(s) (COMPOSE_FILE, else the
+        first of COMPOSE_FILES present), then the normalized directory name.
+        """
+        env = _read_dotenv(os.path.join(project_dir, ".env"))
+        env.update(os.environ)
+        name = env.get("COMPOSE_PROJECT_NAME")
+        if not name:
+            files = [f for f in env.get("COMPOSE_FILE", "").split(os.pathsep) if f]
+            if not files:
+                files = [f for f in COMPOSE_FILES if os.path.isfile(os.path.join(project_dir, f))][:1]
+            for filename in files:
+                path = os.path.join(project_dir, filename)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    match = re.search(r"^name:\s*[\"']?([^\"'#\s]+)", f.read(), re.MULTILINE)
+                # Later files override earlier ones, as when the CLI merges them.
+                if match:
+                    name = match.group(1)
+        if not name:
+            name = os.path.basename(os.path.abspath(project_dir))
+        return re.sub(r"[^a-z0-9_-]", "", name.lower())
+
+    @property
+    def _compose_cmd(self) -> List[str]:
+        """Compose CLI command, detected on first access (raises if not installed)."""
+        if self._detected_cmd is None:
+            with self._detect_lock:
+                if self._detected_cmd is None:
+                    self._detected_cmd = self._load_or_detect_compose_cmd()
+        return self._detected_cmd
+
+    def start_background_detection(self) -> threading.Thread:
+        """Detect the compose CLI in a daemon thread (errors surface on first use)."""
+        def detect():
+            try:
+                self._compose_cmd
+            except RuntimeError:
+                pass
+
+        thread = threading.Thread(target=detect, name="compose-detect", daemon=True)
+        thread.start()
+        return thread
+
+    def _compose_cache_key(self) -> str:
+        """Hash of PATH plus location and mtime of every candidate compose binary."""
+        parts = [os.environ.get("PATH", "")]
+        candidates = [shutil.which("docker"), shutil.which("docker-compose")]
+        candidates += [
+            os.path.join(os.path.expanduser(d), "docker-compose") for d in COMPOSE_PLUGIN_DIRS
+        ]
+        for path in candidates:
+            if path and os.path.exists(path):
+                parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _load_or_detect_compose_cmd(self) -> List[str]:
+        """Return the cached compose command if the cache key still matches, else detect."""
+        cache_path = os.path.join(_cache_dir(), "compose_cmd.json")
+        key = self._compose_cache_key()
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("key") == key and cached.get("cmd"):
+                return list(cached["cmd"])
+        except (OSError, ValueError, AttributeError):
+            pass
+        cmd = self._detect_compose_cmd()
+        # Only successful detections are cached; a missing CLI is re-checked next time.
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "cmd": cmd}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+        return cmd
+
     def _detect_compose_cmd(self) -> List[str]:
         """Return ['docker', 'compose'] or ['docker-compose'] depending on what's available."""
         try:
@@ -96,22 +257,32 @@ class ComposeTools:
         capture_output: bool = True,
         timeout: Optional[int] = 120,
     ) -> subprocess.CompletedProcess:
-        """Run docker compose in project_dir with given args."""
+        """
+        Run docker compose in project_dir with given args. When running as an
+        async call (see async_tools), cancelling the call kills the process.
+        """
         if not os.path.isdir(project_dir):
             raise ValueError(f"Project directory not found: {project_dir}")
         cmd = self._compose_cmd + args
+        pipe = subprocess.PIPE if capture_output else None
         try:
-            return subprocess.run(
-                cmd,
-                cwd=project_dir,
-                capture_output=capture_output,
-                text=True,
-                timeout=timeout,
-            )
-        except subprocess.TimeoutExpired as e:
-            raise RuntimeError(f"Compose command timed out: {e}")
+            proc = subprocess.Popen(cmd, cwd=project_dir, stdout=pipe, stderr=pipe, text=True)
         except FileNotFoundError:
             raise RuntimeError("Docker or Compose executable not found.")
+        ctx = current_call()
+        token = ctx.on_abort(proc.kill) if ctx is not None else None
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            proc.kill()
+            proc.communicate()
+            raise RuntimeError(f"Compose command timed out: {e}")
+        finally:
+            if token is not None:
+                ctx.remove_abort(token)
+        if ctx is not None and ctx.cancelled.is_set():
+            raise RuntimeError("Compose command was cancelled")
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
 
     def compose_up(
         self,
@@ -182,6 +353,7 @@ class ComposeTools:
         self,
         project_dir: Optional[str] = None,
         all_containers: bool = False,
+        use_api: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         List Compose services and their containers.
@@ -189,8 +361,13 @@ class ComposeTools:
         Args:
             project_dir: Path to directory with docker-compose.yml (default: auto-detect from cwd/MCP)
             all_containers: Include stopped containers
+            use_api: Read containers from the Docker API by compose project label
+                     instead of spawning the compose CLI (same fields, much faster;
+                     falls back to the CLI, when installed, if no container matches)
         """
         project_dir = self._find_project_dir(project_dir)
+        if use_api:
+            return self._compose_ps_api(project_dir, all_containers)
         args = ["ps", "--format", "json"]
         if all_containers:
             args.append("-a")
@@ -221,6 +398,45 @@ class ComposeTools:
                 result.append({"raw": line})
         return result
 
+    def _compose_ps_api(self, project_dir: str, all_containers: bool) -> List[Dict[str, Any]]:
+        """compose_ps via one label-filtered container listing."""
+        project = self._project_name(project_dir)
+        try:
+            containers = self.client.api.containers(
+                all=all_containers,
+                filters={"label": [f"{PROJECT_LABEL}={project}", f"{ONEOFF_LABEL}=False"]},
+            )
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"compose ps failed: {str(e)}")
+        if not containers:
+            # The name may be resolved differently from the CLI (e.g. via
+            # interpolation we do not model); let the CLI decide when installed.
+            try:
+                self._compose_cmd
+            except RuntimeError:
+                return []
+            return self.compose_ps(project_dir, all_containers)
+        result = []
+        for c in containers:
+            labels = c.get("Labels") or {}
+            names = c.get("Names") or []
+            result.append({
+                "id": c["Id"],
+                "name": names[0].lstrip("/") if names else c["Id"][:12],
+                "service": labels.get(SERVICE_LABEL, ""),
+                "status": c.get("State", ""),
+                "ports": [
+                    {
+                        "URL": port.get("IP", ""),
+                        "TargetPort": port.get("PrivatePort", 0),
+                        "PublishedPort": port.get("PublicPort", 0),
+                        "Protocol": port.get("Type", "tcp"),
+                    }
+                    for port in (c.get("Ports") or [])
+                ],
+            })
+        return sorted(result, key=lambda r: r["name"])
+
     def compose_logs(
         self,
         project_dir: Optional[str] = None,
@@ -293,5 +509,7 @@ class ComposeTools:
         }
 
     def close(self):
-        """Close Docker client connection (no-op; Compose uses CLI)."""
-        pass
+        """Release the shared Docker client if an API-backed mode attached it."""
+        if self._client_acquired:
+            self._registry.release()
+            self._client_acquired = False
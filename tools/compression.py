@@ -0,0 +1,88 @@
+import gzip
+from typing import BinaryIO, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+CODECS = ("none", "gzip", "zstd")
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_EXTENSIONS = (
+    (".tar.gz", "gzip"),
+    (".tgz", "gzip"),
+    (".gz", "gzip"),
+    (".tar.zst", "zstd"),
+    (".tzst", "zstd"),
+    (".zst", "zstd"),
+    (".zstd", "zstd"),
+)
+
+
+def codec_for_path(path: str) -> str:
+    """Guess the codec from a file name (".tar.gz" -> gzip, ".zst" -> zstd, else none)."""
+    lowered = path.lower()
+    for suffix, codec in _EXTENSIONS:
+        if lowered.endswith(suffix):
+            return codec
+    return "none"
+
+
+def detect_codec(header: bytes) -> str:
+    """Identify a codec from the first bytes of a file."""
+    if header.startswith(GZIP_MAGIC):
+        return "gzip"
+    if header.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return "none"
+
+
+def resolve_codec(compression: Optional[str], path: str) -> str:
+    """Validate a codec name; "auto"/None picks one from the path extension."""
+    codec = codec_for_path(path) if compression in (None, "auto") else compression.lower()
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported compression '{compression}'. Use one of: auto, {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    return codec
+
+
+class _Passthrough:
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+
+    def write(self, data: bytes) -> int:
+        return self._fileobj.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._fileobj.read(size)
+
+    def close(self) -> None:
+        pass
+
+
+def open_writer(fileobj: BinaryIO, codec: str, level: Optional[int] = None):
+    """
+    Wrap fileobj in a streaming compressor. close() on the wrapper flushes the
+    codec trailer but leaves fileobj open.
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6 if level is None else level, mtime=0)
+    if codec == "zstd":
+        kwargs = {} if level is None else {"level": level}
+        return zstandard.ZstdCompressor(**kwargs).stream_writer(fileobj, closefd=False)
+    return _Passthrough(fileobj)
+
+
+def open_reader(fileobj: BinaryIO, codec: str):
+    """Wrap fileobj in a streaming decompressor (fileobj stays open on close())."""
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd decompression requires the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+    return _Passthrough(fileobj)
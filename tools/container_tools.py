@@ -1,5 +1,46 @@
+import codecs
 import docker
-from typing import List, Dict, Any, Optional
+import shlex
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterator, Optional, Union
+
+from docker.utils.socket import STDERR, frames_iter
+
+from .cancellation import in_current_call
+from .docker_client import ClientRegistry, get_registry
+from .listing import glob_regex, label_selectors, labels_match, name_hint, paginate, validate_fields, wants_field
+from .metrics import instrument_tools
+from .object_cache import get_object_cache, mark_changed
+from .resolver import get_container_resolver, is_exact, note_container
+from .stats_sampler import MAX_SAMPLE_AGE, calculate_cpu_percent, get_stats_sampler
+
+
+# Runs "$@" in the background so its PID can be written to the pidfile ($0);
+# the exit status is passed through and the pidfile removed on exit.
+_EXEC_WRAPPER = '"$@" & pid=$!; echo $pid > "$0"; wait $pid; rc=$?; rm -f "$0"; exit $rc'
+# Waits up to a second for the pidfile, then kills the wrapped command.
+_EXEC_KILL = (
+    'for i in 1 2 3 4 5 6 7 8 9 10; do [ -s "$0" ] && break; sleep 0.1; done; '
+    'kill -KILL "$(cat "$0")" 2>/dev/null'
+)
+_EXEC_KILL_GRACE = 2.0
+
+CONTAINER_LIST_FIELDS = ("id", "name", "status", "image")
+CONTAINER_STATES = ("created", "restarting", "running", "removing", "paused", "exited", "dead")
+
+
+def _shutdown_socket(sock) -> None:
+    """Unblock readers of an exec socket (plain socket or SocketIO wrapper)."""
+    raw = getattr(sock, "_sock", sock)
+    try:
+        raw.shutdown(socket.SHUT_RDWR)
+    except (OSError, AttributeError):
+        pass
 
 
 class ContainerTools:
@@ -7,63 +48,182 @@ class ContainerTools:
     Helper class for Docker container operations.
     """
     
-    def __init__(self):
-        """Initialize Docker client. Handles connection errors."""
-        try:
-            self.client = docker.from_env()
-            # Test connection
-            self.client.ping()
-        except docker.errors.DockerException as e:
-            raise RuntimeError(f"Docker connection failed: {str(e)}")
+    def __init__(self, registry: Optional[ClientRegistry] = None):
+        """Attach to the shared Docker client. Handles connection errors."""
+        self._registry = registry or get_registry()
+        self._registry.acquire()
+        instrument_tools(self, self._registry)
     
-    def get_container_list(self) -> List[Dict[str, Any]]:
-        """Get list of all containers as JSON-serializable dictionaries."""
+    @property
+    def client(self) -> docker.DockerClient:
+        """Shared Docker client (follows reconnects of the registry)."""
+        return self._registry.get()
+    
+    def get_container_list(
+        self,
+        status: Optional[str] = None,
+        labels: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get list of all containers as JSON-serializable dictionaries.
+        
+        Uses one container listing and one image listing joined by image ID,
+        instead of inspecting every container and its image separately. Both
+        come from the event-maintained object cache when it is available;
+        otherwise the filters are passed to the Docker API. The image listing
+        is skipped when the image field is neither returned nor sorted on.
+        
+        Args:
+            status: Only containers in this state (e.g. "running", "exited", "paused")
+            labels: Only containers with these labels ("key" or "key=value", all must match)
+            name: Only containers whose name matches this glob (e.g. "web-*")
+            sort_by: Field to sort by (id, name, status, image)
+            descending: Sort in descending order
+            limit: Maximum number of containers to return (enables pagination)
+            cursor: next_cursor from the previous page
+            fields: Fields to include in each entry (default: all)
+        
+        Returns:
+            List of container dictionaries, or with limit/cursor a dictionary with
+            items, next_cursor (None on the last page), total and as_of
+            (nanoseconds since the epoch: the listing reflects every change before it)
+        """
+        if status is not None and status not in CONTAINER_STATES:
+            raise ValueError(f"Invalid status '{status}'; choose one of: {', '.join(CONTAINER_STATES)}")
+        selectors = label_selectors(labels)
+        validate_fields(CONTAINER_LIST_FIELDS, sort_by, fields)
+        pattern = glob_regex(name) if name else None
+        with_images = wants_field("image", sort_by, fields)
+        as_of = time.time_ns()
         try:
-            containers = self.client.containers.list(all=True)
-            return [
+            cache = get_object_cache(self._registry)
+            containers = cache.snapshot("container") if cache else None
+            images = cache.snapshot("image") if containers is not None and with_images else None
+            if containers is not None and (images is not None or not with_images):
+                containers, as_of = containers
+                if images is not None:
+                    as_of = min(as_of, images[1])
+                image_tags = self._get_image_tags(images[0]) if images is not None else {}
+            else:
+                filters: Dict[str, Any] = {}
+                if status:
+                    filters["status"] = status
+                if selectors:
+                    filters["label"] = selectors
+                hint = name_hint(name) if name else None
+                if hint:
+                    filters["name"] = hint
+                containers = self.client.api.containers(all=True, filters=filters or None)
+                image_tags = self._get_image_tags() if with_images else {}
+            summaries = [
                 {
-                    "id": container.id,
-                    "name": container.name,
-                    "status": container.status,
-                    "image": container.image.tags[0] if container.image.tags else "unknown",
+                    "id": container["Id"],
+                    "name": self._summary_name(container),
+                    "status": container.get("State", "unknown"),
+                    "image": self._primary_tag(image_tags.get(container.get("ImageID"))),
                 }
                 for container in containers
+                if (status is None or container.get("State") == status)
+                and labels_match(container.get("Labels"), selectors)
+                and (pattern is None or pattern.fullmatch(self._summary_name(container)))
             ]
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to list containers: {str(e)}")
+        return paginate(
+            summaries, "id", CONTAINER_LIST_FIELDS,
+            sort_by=sort_by, descending=descending, limit=limit, cursor=cursor, fields=fields, as_of=as_of,
+        )
+    
+    def _get_image_tags(self, images: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[str]]:
+        """Map image ID -> repo tags using a single image listing (fetched unless given)."""
+        if images is None:
+            images = self.client.api.images()
+        return {
+            image["Id"]: [
+                tag for tag in (image.get("RepoTags") or [])
+                if tag != "<none>:<none>"
+            ]
+            for image in images
+        }
+    
+    @staticmethod
+    def _summary_name(container: Dict[str, Any]) -> str:
+        """Container name from a /containers/json entry (without leading slash)."""
+        names = container.get("Names") or []
+        return names[0].lstrip("/") if names else container["Id"][:12]
+    
+    @staticmethod
+    def _primary_tag(tags: Optional[List[str]]) -> str:
+        """First tag of an image, or "unknown" for untagged/missing images."""
+        return tags[0] if tags else "unknown"
     
     def _find_container(self, container_identifier: str):
         """
         Find container by ID or name (supports partial name matching).
         Docker API accepts both ID and name, but we also support partial name matching
-        for better natural language query support.
+        for better natural language query support. Matches are resolved from an
+        event-maintained in-memory index when available, so partial names need no
+        container listing; as the index can lag the daemon, a partial hit is only
+        used once the daemon's exact lookup has failed.
         """
+        resolver = get_container_resolver(self._registry)
+        matches = resolver.resolve(container_identifier) if resolver else None
+        if matches and is_exact(matches, container_identifier):
+            try:
+                container = self.client.containers.get(matches[0][0])
+                if container_identifier in (container.id, container.name):
+                    return container
+            except docker.errors.NotFound:
+                # Removed before its destroy event arrived; ask the daemon below.
+                resolver.discard(matches[0][0])
+            matches = None
+        
         try:
-            # First try direct lookup (works for both ID and exact name)
+            # The daemon's exact ID/name lookup wins over partial index hits.
             return self.client.containers.get(container_identifier)
         except docker.errors.NotFound:
-            # If not found, try partial name matching
-            all_containers = self.client.containers.list(all=True)
-            matching = [
-                c for c in all_containers
-                if container_identifier.lower() in c.name.lower()
-                or container_identifier.lower() in c.id.lower()
-            ]
-            
-            if len(matching) == 1:
-                return matching[0]
-            elif len(matching) > 1:
-                names = [c.name for c in matching]
+            pass
+        
+        if matches:
+            if len(matches) > 1:
+                names = [name for _, name in matches]
                 raise ValueError(
                     f"Multiple containers match '{container_identifier}': {', '.join(names)}. "
                     f"Please be more specific."
                 )
-            else:
-                # Suggest similar names
-                all_names = [c.name for c in all_containers]
-                similar = [name for name in all_names if container_identifier.lower() in name.lower()]
-                suggestion = f" Did you mean: {', '.join(similar[:3])}?" if similar else ""
-                raise ValueError(f"Container '{container_identifier}' not found.{suggestion}")
+            try:
+                return self.client.containers.get(matches[0][0])
+            except docker.errors.NotFound:
+                resolver.discard(matches[0][0])
+        
+        # Partial name matching over a full listing
+        all_containers = self.client.containers.list(all=True)
+        matching = [
+            c for c in all_containers
+            if container_identifier.lower() in c.name.lower()
+            or container_identifier.lower() in c.id.lower()
+        ]
+        
+        if len(matching) == 1:
+            return matching[0]
+        elif len(matching) > 1:
+            names = [c.name for c in matching]
+            raise ValueError(
+                f"Multiple containers match '{container_identifier}': {', '.join(names)}. "
+                f"Please be more specific."
+            )
+        else:
+            # Suggest similar names
+            all_names = [c.name for c in all_containers]
+            similar = [name for name in all_names if container_identifier.lower() in name.lower()]
+            suggestion = f" Did you mean: {', '.join(similar[:3])}?" if similar else ""
+            raise ValueError(f"Container '{container_identifier}' not found.{suggestion}")
     
     def get_container_info(self, container_identifier: str) -> Dict[str, Any]:
         """
@@ -74,6 +234,19 @@ class ContainerTools:
                                   (e.g., "nginx", "my-nginx-container", or container ID)
         """
         try:
+            cache = get_object_cache(self._registry)
+            attrs = cache.lookup("container", container_identifier) if cache else None
+            images = cache.snapshot("image") if attrs is not None else None
+            if images is not None:
+                return {
+                    "id": attrs["Id"],
+                    "name": attrs.get("Name", "").lstrip("/"),
+                    "status": (attrs.get("State") or {}).get("Status", "unknown"),
+                    "image": self._primary_tag(self._get_image_tags(images[0]).get(attrs.get("Image"))),
+                    "created": attrs.get("Created", ""),
+                    "ports": (attrs.get("NetworkSettings") or {}).get("Ports", {}),
+                }
+            
             container = self._find_container(container_identifier)
             return {
                 "id": container.id,
@@ -98,25 +271,121 @@ class ContainerTools:
         """
         try:
             container = self._find_container(container_identifier)
-            logs = container.logs(tail=tail, timestamps=True).decode("utf-8")
+            logs = container.logs(tail=tail, timestamps=True).decode("utf-8", errors="replace")
             return logs
         except ValueError:
             raise
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to get container logs: {str(e)}")
     
+    def stream_container_logs(
+        self,
+        container_identifier: str,
+        tail: Union[int, str] = 100,
+        since: Optional[Union[datetime, int, float]] = None,
+        until: Optional[Union[datetime, int, float]] = None,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        timestamps: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream container logs line by line without buffering the whole log.
+        
+        Args:
+            container_identifier: Container ID, full name, or partial name
+            tail: Number of lines from the end to start at, or "all" (default: 100)
+            since: Only logs after this datetime or UNIX timestamp
+            until: Only logs before this datetime or UNIX timestamp
+            max_bytes: Stop after reading this many raw log bytes
+            max_lines: Stop after yielding this many lines
+            timestamps: Prefix each line with its timestamp (default: True)
+        
+        Returns:
+            Iterator of log lines (without trailing newline). Invalid UTF-8 is
+            replaced instead of failing; the daemon stream is closed when the
+            iterator is exhausted, hits a cap, or is closed early.
+        """
+        try:
+            container = self._find_container(container_identifier)
+            stream = container.logs(
+                stream=True,
+                follow=False,
+                tail=tail,
+                since=since,
+                until=until,
+                timestamps=timestamps
+            )
+        except ValueError:
+            raise
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to get container logs: {str(e)}")
+        return self._iter_log_lines(stream, max_bytes, max_lines)
+    
+    @staticmethod
+    def _iter_log_lines(
+        stream,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None
+    ) -> Iterator[str]:
+        """Incrementally decode a log byte stream into lines, enforcing caps."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        bytes_read = 0
+        lines_out = 0
+        try:
+            for chunk in stream:
+                if max_bytes is not None:
+                    chunk = chunk[:max(max_bytes - bytes_read, 0)]
+                bytes_read += len(chunk)
+                pending += decoder.decode(chunk)
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    yield line.rstrip("\r")
+                    lines_out += 1
+                    if max_lines is not None and lines_out >= max_lines:
+                        return
+                if max_bytes is not None and bytes_read >= max_bytes:
+                    break
+            pending += decoder.decode(b"", final=True)
+            if pending:
+                yield pending.rstrip("\r")
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to stream container logs: {str(e)}")
+        finally:
+            stream.close()
+    
     def get_container_stats(self, container_identifier: str) -> Dict[str, Any]:
         """
         Get container statistics.
         
+        Watched containers (see watch_container_stats) are answered instantly
+        from the background sampler; others, and watched containers whose
+        latest sample is older than a few seconds (e.g. while the stream
+        reconnects), use a one-shot stats call, which blocks for about 1-2
+        seconds while the daemon computes CPU deltas. "timestamp" is when
+        the returned sample was taken.
+        
         Args:
             container_identifier: Container ID, full name, or partial name
         """
         try:
+            sampler = get_stats_sampler(self._registry)
+            container_id = self._resolve_watched_id(container_identifier)
+            sample = sampler.latest(container_id, MAX_SAMPLE_AGE) if container_id else None
+            if sample is not None:
+                return {
+                    "timestamp": sample["timestamp"],
+                    "cpu_percent": sample["cpu_percent"],
+                    "memory_usage": int(sample["memory_usage"]),
+                    "memory_limit": int(sample["memory_limit"]),
+                    "network_io": sample["networks"],
+                }
+            
             container = self._find_container(container_identifier)
             stats = container.stats(stream=False)
             # Extract and format key metrics
             return {
+                "timestamp": time.time(),
                 "cpu_percent": self._calculate_cpu_percent(stats),
                 "memory_usage": stats.get("memory_stats", {}).get("usage", 0),
                 "memory_limit": stats.get("memory_stats", {}).get("limit", 0),
@@ -127,22 +396,103 @@ class ContainerTools:
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to get container stats: {str(e)}")
     
+    def _resolve_watched_id(self, container_identifier: str) -> Optional[str]:
+        """ID of a watched container matching identifier, resolved without API calls."""
+        sampler = get_stats_sampler(self._registry)
+        if sampler.is_watched(container_identifier):
+            return container_identifier
+        resolver = get_container_resolver(self._registry)
+        matches = resolver.resolve(container_identifier) if resolver else None
+        if matches and len(matches) == 1 and sampler.is_watched(matches[0][0]):
+            return matches[0][0]
+        return None
+    
+    def watch_container_stats(
+        self,
+        container_identifiers: List[str],
+        retention: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Start background stats sampling for containers.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+            retention: Samples kept per container (~1 per second; default: 300)
+        """
+        try:
+            sampler = get_stats_sampler(self._registry)
+            watched = []
+            for identifier in container_identifiers:
+                container = self._find_container(identifier)
+                sampler.watch(container.id, retention=retention)
+                watched.append({"id": container.id, "name": container.name})
+            return {
+                "watched": watched,
+                "retention": retention or sampler.retention,
+                "message": f"Sampling stats for {len(watched)} container(s)",
+            }
+        except ValueError:
+            raise
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to watch container stats: {str(e)}")
+    
+    def unwatch_container_stats(self, container_identifiers: List[str]) -> Dict[str, Any]:
+        """
+        Stop background stats sampling for containers.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+        """
+        try:
+            sampler = get_stats_sampler(self._registry)
+            stopped = []
+            for identifier in container_identifiers:
+                container_id = self._resolve_watched_id(identifier)
+                if container_id is None:
+                    container_id = self._find_container(identifier).id
+                if sampler.unwatch(container_id):
+                    stopped.append(container_id)
+            return {
+                "unwatched": stopped,
+                "message": f"Stopped sampling {len(stopped)} container(s)",
+            }
+        except ValueError:
+            raise
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to unwatch container stats: {str(e)}")
+    
+    def get_container_stats_summary(
+        self,
+        container_identifier: str,
+        window_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Get min/avg/max/p95 rollups of sampled stats for a watched container.
+        
+        Args:
+            container_identifier: Container ID, full name, or partial name
+            window_seconds: Only include samples from the last N seconds (default: all retained)
+        """
+        try:
+            container_id = self._resolve_watched_id(container_identifier)
+            if container_id is None:
+                container_id = self._find_container(container_identifier).id
+            summary = get_stats_sampler(self._registry).summary(container_id, window_seconds)
+            if summary is None:
+                raise ValueError(
+                    f"Container '{container_identifier}' is not being sampled. "
+                    f"Call watch_container_stats first."
+                )
+            summary["id"] = container_id
+            return summary
+        except ValueError:
+            raise
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to get container stats summary: {str(e)}")
+    
     def _calculate_cpu_percent(self, stats: Dict[str, Any]) -> float:
         """Calculate CPU usage percentage from stats."""
-        try:
-            cpu_delta = (
-                stats["cpu_stats"]["cpu_usage"]["total_usage"]
-                - stats.get("precpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0)
-            )
-            system_delta = (
-                stats["cpu_stats"]["system_cpu_usage"]
-                - stats.get("precpu_stats", {}).get("system_cpu_usage", 0)
-            )
-            if system_delta > 0:
-                return (cpu_delta / system_delta) * 100.0
-            return 0.0
-        except (KeyError, ZeroDivisionError):
-            return 0.0
+        return calculate_cpu_percent(stats)
     
     def run_container(
         self,
@@ -200,6 +550,8 @@ class ContainerTools:
                 remove=remove,
                 restart_policy=restart_policy_dict
             )
+            mark_changed(self._registry, "container", container.id)
+            note_container(self._registry, container.id, container.name)
             
             return {
                 "id": container.id,
@@ -236,6 +588,7 @@ class ContainerTools:
                 }
             
             container.start()
+            mark_changed(self._registry, "container", container.id)
             container.reload()
             
             return {
@@ -269,6 +622,7 @@ class ContainerTools:
                 }
             
             container.stop(timeout=timeout)
+            mark_changed(self._registry, "container", container.id)
             container.reload()
             
             return {
@@ -293,6 +647,7 @@ class ContainerTools:
         try:
             container = self._find_container(container_identifier)
             container.restart(timeout=timeout)
+            mark_changed(self._registry, "container", container.id)
             container.reload()
             
             return {
@@ -326,6 +681,10 @@ class ContainerTools:
             container_id = container.id
             
             container.remove(force=force, v=remove_volumes)
+            mark_changed(self._registry, "container", container_id)
+            note_container(self._registry, container_id)
+            if remove_volumes:
+                mark_changed(self._registry, "volume")
             
             return {
                 "id": container_id,
@@ -344,11 +703,172 @@ class ContainerTools:
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to remove container: {str(e)}")
     
+    def _select_containers(
+        self,
+        container_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None
+    ) -> List[str]:
+        """
+        Targets for a bulk operation: explicit identifiers plus containers matching
+        a label, as container IDs without duplicates, so no container is operated
+        on twice at once. Identifiers that do not resolve to one container are
+        kept as given; the operation then reports their error for that item.
+        """
+        targets: List[str] = []
+        seen = set()
+        for identifier in container_identifiers or []:
+            try:
+                target = self._find_container(identifier).id
+            except ValueError:
+                target = identifier
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+        if label:
+            for c in self.client.api.containers(all=True, filters={"label": label}):
+                if c["Id"] not in seen:
+                    seen.add(c["Id"])
+                    targets.append(c["Id"])
+        if not targets:
+            raise ValueError("No containers selected. Pass container_identifiers and/or label.")
+        return targets
+    
+    def _run_bulk(
+        self,
+        action: str,
+        operation: Callable[[str], Dict[str, Any]],
+        targets: List[str],
+        max_workers: int
+    ) -> Dict[str, Any]:
+        """Run operation for every target on a bounded thread pool, timing each call."""
+        def timed(target: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                result = {"target": target, "ok": True, "result": operation(target)}
+            except (ValueError, RuntimeError) as e:
+                result = {"target": target, "ok": False, "error": str(e)}
+            result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+            return result
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as pool:
+            results = list(pool.map(in_current_call(timed), targets))
+        failed = sum(1 for r in results if not r["ok"])
+        return {
+            "action": action,
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "results": results,
+            "message": f"{action}: {len(results) - failed}/{len(results)} container(s) succeeded",
+        }
+    
+    def start_containers(
+        self,
+        container_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None,
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Start many containers concurrently.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+            label: Also include containers with this label ("key" or "key=value")
+            max_workers: Maximum concurrent operations (default: 8)
+        """
+        try:
+            targets = self._select_containers(container_identifiers, label)
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to select containers: {str(e)}")
+        return self._run_bulk("start", self.start_container, targets, max_workers)
+    
+    def stop_containers(
+        self,
+        container_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None,
+        timeout: int = 10,
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Stop many containers concurrently, so the batch takes about one timeout
+        instead of one per container.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+            label: Also include containers with this label ("key" or "key=value")
+            timeout: Seconds to wait before killing each container (default: 10)
+            max_workers: Maximum concurrent operations (default: 8)
+        """
+        try:
+            targets = self._select_containers(container_identifiers, label)
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to select containers: {str(e)}")
+        return self._run_bulk(
+            "stop", lambda target: self.stop_container(target, timeout=timeout), targets, max_workers
+        )
+    
+    def restart_containers(
+        self,
+        container_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None,
+        timeout: int = 10,
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Restart many containers concurrently.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+            label: Also include containers with this label ("key" or "key=value")
+            timeout: Seconds to wait before killing each container (default: 10)
+            max_workers: Maximum concurrent operations (default: 8)
+        """
+        try:
+            targets = self._select_containers(container_identifiers, label)
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to select containers: {str(e)}")
+        return self._run_bulk(
+            "restart", lambda target: self.restart_container(target, timeout=timeout), targets, max_workers
+        )
+    
+    def remove_containers(
+        self,
+        container_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None,
+        force: bool = False,
+        remove_volumes: bool = False,
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Remove many containers concurrently.
+        
+        Args:
+            container_identifiers: Container IDs, full names, or partial names
+            label: Also include containers with this label ("key" or "key=value")
+            force: Force remove even if running (default: False)
+            remove_volumes: Remove associated volumes (default: False)
+            max_workers: Maximum concurrent operations (default: 8)
+        """
+        try:
+            targets = self._select_containers(container_identifiers, label)
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to select containers: {str(e)}")
+        return self._run_bulk(
+            "remove",
+            lambda target: self.remove_container(target, force=force, remove_volumes=remove_volumes),
+            targets,
+            max_workers
+        )
+    
     def exec_in_container(
         self,
         container_identifier: str,
         command: str,
-        workdir: Optional[str] = None
+        workdir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Execute a command inside a running container.
@@ -357,6 +877,62 @@ class ContainerTools:
             container_identifier: Container ID, full name, or partial name
             command: Command to execute (e.g., "ls -la", "cat /etc/hosts")
             workdir: Working directory inside container
+            max_bytes: Keep at most this many output bytes; the command is killed if it writes more
+            timeout: Kill the command after this many seconds
+        
+        Returns stdout and stderr separately, plus "output" with both in
+        arrival order. See stream_exec for how limits are enforced.
+        """
+        events = self.stream_exec(container_identifier, command, workdir, max_bytes, timeout)
+        parts: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+        output: List[str] = []
+        for event in events:
+            if "stream" in event:
+                parts[event["stream"]].append(event["data"])
+                output.append(event["data"])
+            else:
+                result = event
+        return {
+            "container": result["container"],
+            "command": command,
+            "exit_code": result["exit_code"],
+            "output": "".join(output),
+            "stdout": "".join(parts["stdout"]),
+            "stderr": "".join(parts["stderr"]),
+            "bytes": result["bytes"],
+            "truncated": result["truncated"],
+            "timed_out": result["timed_out"],
+        }
+    
+    def stream_exec(
+        self,
+        container_identifier: str,
+        command: str,
+        workdir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a command in a running container and stream its output.
+        
+        Args:
+            container_identifier: Container ID, full name, or partial name
+            command: Command to execute (e.g., "find / -name '*.log'")
+            workdir: Working directory inside container
+            max_bytes: Stop after this many output bytes (stdout + stderr) and kill the command
+            timeout: Wall-clock deadline in seconds; the command is killed when it passes
+        
+        Returns:
+            Iterator of {"stream": "stdout" | "stderr", "data": str} chunks as they
+            arrive (invalid UTF-8 replaced), followed by one final
+            {"container", "exit_code", "bytes", "truncated", "timed_out",
+            "elapsed_seconds"} entry.
+        
+        Docker has no API to kill an exec, so with max_bytes or timeout the
+        command runs under a small /bin/sh wrapper that records its PID in
+        /tmp, and a second exec kills it. Containers without sh or a writable
+        /tmp still have their output cut off, but the command keeps running
+        and exit_code is None.
         """
         try:
             container = self._find_container(container_identifier)
@@ -366,21 +942,119 @@ class ContainerTools:
                     f"Container '{container_identifier}' is not running. Start it first."
                 )
             
-            exit_code, output = container.exec_run(
-                cmd=command,
-                workdir=workdir
-            )
-            
-            return {
-                "container": container.name,
-                "command": command,
-                "exit_code": exit_code,
-                "output": output.decode("utf-8") if output else "",
-            }
+            cmd = shlex.split(command)
+            pidfile = None
+            if max_bytes is not None or timeout is not None:
+                pidfile = f"/tmp/.docker-mcp-exec-{uuid.uuid4().hex[:12]}.pid"
+                cmd = ["sh", "-c", _EXEC_WRAPPER, pidfile] + cmd
+            exec_id = self.client.api.exec_create(
+                container.id, cmd, stdout=True, stderr=True, workdir=workdir
+            )["Id"]
+            sock = self.client.api.exec_start(exec_id, socket=True)
         except ValueError:
             raise
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to execute command: {str(e)}")
+        return self._iter_exec(container, exec_id, sock, pidfile, max_bytes, timeout)
+    
+    def _iter_exec(
+        self,
+        container,
+        exec_id: str,
+        sock,
+        pidfile: Optional[str],
+        max_bytes: Optional[int],
+        timeout: Optional[float]
+    ) -> Iterator[Dict[str, Any]]:
+        """Demultiplex and decode an exec socket, enforcing the byte cap and deadline."""
+        started = time.perf_counter()
+        decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in ("stdout", "stderr")
+        }
+        total = 0
+        truncated = False
+        killed = threading.Event()
+        timed_out = threading.Event()
+        
+        def kill() -> None:
+            if not killed.is_set():
+                killed.set()
+                self._kill_exec(container.id, pidfile)
+        
+        def on_deadline() -> None:
+            timed_out.set()
+            kill()
+            # If the kill did not end the output (no sh in the image), stop reading anyway.
+            time.sleep(_EXEC_KILL_GRACE)
+            _shutdown_socket(sock)
+        
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, on_deadline)
+            timer.daemon = True
+            timer.start()
+        try:
+            for stream_id, data in frames_iter(sock, tty=False):
+                name = "stderr" if stream_id == STDERR else "stdout"
+                if max_bytes is not None and total + len(data) > max_bytes:
+                    # Only kill once the command really writes past the cap.
+                    data = data[:max_bytes - total]
+                    truncated = True
+                total += len(data)
+                text = decoders[name].decode(data)
+                if text:
+                    yield {"stream": name, "data": text}
+                if truncated or timed_out.is_set():
+                    break
+            for name, decoder in decoders.items():
+                text = decoder.decode(b"", final=True)
+                if text:
+                    yield {"stream": name, "data": text}
+        except OSError:
+            # Socket shut down after the deadline.
+            if not timed_out.is_set():
+                raise RuntimeError("Exec output stream was interrupted")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if truncated or timed_out.is_set():
+                kill()
+            _shutdown_socket(sock)
+            sock.close()
+        
+        yield {
+            "container": container.name,
+            "exit_code": self._exec_exit_code(exec_id),
+            "bytes": total,
+            "truncated": truncated,
+            "timed_out": timed_out.is_set(),
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+    
+    def _kill_exec(self, container_id: str, pidfile: Optional[str]) -> None:
+        """Kill a wrapped exec through its pidfile (best effort)."""
+        if pidfile is None:
+            return
+        try:
+            kill_id = self.client.api.exec_create(container_id, ["sh", "-c", _EXEC_KILL, pidfile])["Id"]
+            self.client.api.exec_start(kill_id)
+        except docker.errors.DockerException:
+            pass
+    
+    def _exec_exit_code(self, exec_id: str, wait: float = 5.0) -> Optional[int]:
+        """Exit code of an exec, waiting briefly for a killed one to finish (None if still running)."""
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                info = self.client.api.exec_inspect(exec_id)
+            except docker.errors.DockerException:
+                return None
+            if not info.get("Running"):
+                return info.get("ExitCode")
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
     
     def prune_containers(self) -> Dict[str, Any]:
         """
@@ -390,8 +1064,11 @@ class ContainerTools:
         """
         try:
             result = self.client.containers.prune()
+            mark_changed(self._registry, "container")
             
             containers_deleted = result.get("ContainersDeleted", []) or []
+            for container_id in containers_deleted:
+                note_container(self._registry, container_id)
             space_reclaimed = result.get("SpaceReclaimed", 0)
             
             return {
@@ -405,6 +1082,7 @@ class ContainerTools:
             raise RuntimeError(f"Failed to prune containers: {str(e)}")
     
     def close(self):
-        """Close Docker client connection."""
-        if hasattr(self, "client"):
-            self.client.close()
\ No newline at end of file
+        """Release the shared Docker client connection."""
+        if getattr(self, "_registry", None) is not None:
+            self._registry.release()
+            self._registry = None
\ No newline at end of file
@@ -0,0 +1,179 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import docker
+
+from .cancellation import install_connection_tracking
+from .events import EventHub
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+class ClientRegistry:
+    """
+    Process-wide holder for one Docker client shared by all tool classes.
+
+    Tool instances read the client through the registry on every call, so
+    reconnect() swaps the underlying connection (e.g. to apply new settings)
+    without rebuilding the tool objects. A daemon restart needs no call at
+    all: urllib3 discards pooled connections the daemon closed and dials the
+    socket again on the next request, and the event hub reconnects on its
+    own. Only a request in flight during the restart fails.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        keep_alive: Optional[bool] = None,
+        timeout: Optional[int] = None,
+    ):
+        """
+        Args:
+            pool_size: Max HTTP connections kept per pool
+                       (default: DOCKER_MCP_POOL_SIZE or 10)
+            keep_alive: Reuse HTTP connections between requests
+                        (default: DOCKER_MCP_KEEPALIVE or True)
+            timeout: Default request timeout in seconds (default: docker-py's 60)
+        """
+        if pool_size is None:
+            pool_size = int(os.environ.get("DOCKER_MCP_POOL_SIZE", DEFAULT_POOL_SIZE))
+        if keep_alive is None:
+            keep_alive = os.environ.get("DOCKER_MCP_KEEPALIVE", "1").lower() not in ("0", "false", "no")
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._client: Optional[docker.DockerClient] = None
+        self._refs = 0
+        self._services: Dict[str, Any] = {}
+        self._connect_hooks: List[Callable[[docker.DockerClient], None]] = []
+
+    def configure(
+        self,
+        pool_size: Optional[int] = None,
+        keep_alive: Optional[bool] = None,
+        timeout: Optional[int] = None,
+    ) -> None:
+        """Change connection settings. An open client is reconnected to apply them."""
+        with self._lock:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if keep_alive is not None:
+                self.keep_alive = keep_alive
+            if timeout is not None:
+                self.timeout = timeout
+            if self._client is not None:
+                self.reconnect()
+
+    def _connect(self) -> docker.DockerClient:
+        """Create and ping a new client. Handles connection errors."""
+        kwargs = {"max_pool_size": self.pool_size}
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        try:
+            client = docker.from_env(**kwargs)
+            # Lets async calls abort the requests they are blocked on.
+            install_connection_tracking(client.api)
+            for hook in list(self._connect_hooks):
+                hook(client)
+            if not self.keep_alive:
+                client.api.headers["Connection"] = "close"
+            client.ping()
+            return client
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Docker connection failed: {str(e)}")
+
+    def get(self) -> docker.DockerClient:
+        """Return the shared client, connecting on first use."""
+        with self._lock:
+            if self._client is None:
+                self._client = self._connect()
+            return self._client
+
+    def acquire(self) -> docker.DockerClient:
+        """Register a user of the shared client (paired with release())."""
+        with self._lock:
+            client = self.get()
+            self._refs += 1
+            return client
+
+    def release(self) -> None:
+        """Drop a user; the client is closed when the last one releases it."""
+        with self._lock:
+            self._refs = max(self._refs - 1, 0)
+            if self._refs == 0:
+                self.close()
+
+    def reconnect(self) -> docker.DockerClient:
+        """Drop the current connection pool and connect again."""
+        with self._lock:
+            old, self._client = self._client, None
+            if old is not None:
+                try:
+                    old.close()
+                except Exception:
+                    pass
+            return self.get()
+
+    def service(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return a per-registry shared helper (event hub, caches, indexes),
+        creating it with factory() on first use. Services with a close()
+        method are closed together with the client.
+        """
+        with self._lock:
+            if name not in self._services:
+                self._services[name] = factory()
+            return self._services[name]
+
+    def add_connect_hook(self, hook: Callable[[docker.DockerClient], None]) -> None:
+        """Call hook(client) for the open client, if any, and for every client connected later."""
+        with self._lock:
+            self._connect_hooks.append(hook)
+            if self._client is not None:
+                hook(self._client)
+
+    def remove_connect_hook(self, hook: Callable[[docker.DockerClient], None]) -> None:
+        with self._lock:
+            if hook in self._connect_hooks:
+                self._connect_hooks.remove(hook)
+
+    def event_hub(self):
+        """Return the shared Docker events consumer, started on first use."""
+        hub = self.service("event_hub", lambda: EventHub(self))
+        hub.start()
+        return hub
+
+    def events_enabled(self) -> bool:
+        """Event-driven caches can be disabled with DOCKER_MCP_EVENTS=0."""
+        return os.environ.get("DOCKER_MCP_EVENTS", "1").lower() not in ("0", "false", "no")
+
+    def metrics_enabled(self) -> bool:
+        """Tool instrumentation is opt-in with DOCKER_MCP_METRICS=1."""
+        return os.environ.get("DOCKER_MCP_METRICS", "0").lower() in ("1", "true", "yes")
+
+    def close(self) -> None:
+        """Close the shared client and its services (reopened lazily by get())."""
+        with self._lock:
+            services, self._services = self._services, {}
+            for svc in services.values():
+                if hasattr(svc, "close"):
+                    svc.close()
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_default_registry = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    """Return the process-wide client registry."""
+    return _default_registry
+
+
+def get_client() -> docker.DockerClient:
+    """Return the process-wide shared Docker client."""
+    return _default_registry.get()
@@ -0,0 +1,136 @@
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+class EventHub:
+    """
+    Single background consumer of the daemon's /events stream.
+
+    Subscribers receive each decoded event of the types they asked for.
+    Whenever the stream drops, on_reset callbacks fire so that caches built
+    from events can invalidate themselves; while disconnected, `connected`
+    is False and readers should fall back to fresh API calls.
+    """
+
+    def __init__(self, registry, max_backoff: float = 10.0):
+        self._registry = registry
+        self._max_backoff = max_backoff
+        self._subscribers: Dict[int, tuple] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self.last_event_time_ns = 0
+
+    @property
+    def connected(self) -> bool:
+        """True while the event stream is open and being consumed."""
+        return self._connected.is_set()
+
+    def subscribe(
+        self,
+        callback: EventCallback,
+        types: Optional[Iterable[str]] = None,
+        on_reset: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """
+        Register a callback for events.
+
+        Args:
+            callback: Called with each event dict (from the consumer thread)
+            types: Event types to receive, e.g. ("container", "volume") (default: all)
+            on_reset: Called when the stream drops and events may have been missed
+
+        Returns:
+            Subscription token for unsubscribe()
+        """
+        token = next(self._ids)
+        with self._lock:
+            self._subscribers[token] = (callback, frozenset(types or ()), on_reset)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def start(self) -> None:
+        """Start the consumer thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="docker-events", daemon=True
+            )
+            self._thread.start()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the stream is connected; returns False on timeout."""
+        return self._connected.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop consuming events (does not wait for the thread to exit)."""
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    close = stop
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                self._stream = self._registry.get().api.events(decode=True)
+                self._connected.set()
+                backoff = 0.5
+                for event in self._stream:
+                    if self._stop.is_set():
+                        break
+                    self._dispatch(event)
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.debug("Docker event stream failed: %s", e)
+            finally:
+                self._stream = None
+                if self._connected.is_set():
+                    self._connected.clear()
+                    self._reset()
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, self._max_backoff)
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        self.last_event_time_ns = event.get("timeNano") or event.get("time", 0) * 10**9
+        event_type = event.get("Type", "")
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, types, _ in subscribers:
+            if types and event_type not in types:
+                continue
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Docker event subscriber failed")
+
+    def _reset(self) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for _, _, on_reset in subscribers:
+            if on_reset is None:
+                continue
+            try:
+                on_reset()
+            except Exception:
+                logger.exception("Docker event reset handler failed")
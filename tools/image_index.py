@@ -0,0 +1,263 @@
+import bisect
+import re
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import docker
+
+from .name_index import NameIndex
+
+
+# Image actions that do not change an image's ID, tags or digests.
+_PASSIVE_ACTIONS = {"push", "save", "prune"}
+
+# More retagged images than this are reloaded with one full listing instead.
+MAX_TARGETED_REFRESH = 50
+
+_HEX = re.compile(r"[0-9a-f]+")
+
+
+class ImageIndex:
+    """
+    In-memory index of image references (tags, repository digests and IDs,
+    intermediate images included), built from one listing and kept current
+    from the daemon's /events stream.
+
+    Tags go in a NameIndex (exact, prefix and trigram-substring lookups);
+    IDs are kept sorted for short-ID prefixes, and digests map exactly.
+    Delete events drop an image in place, tag/untag events re-inspect the
+    image on the next lookup, and other changes (pull, load, import, commit)
+    mark the index stale so the next lookup relists. While the event stream
+    is disconnected resolve() returns None and callers fall back to the API.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._refs = NameIndex()
+        self._ids: List[str] = []
+        self._tags: Dict[str, List[str]] = {}
+        self._digests: Dict[str, List[str]] = {}
+        self._by_digest: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stale = True
+        self._dirty: Set[str] = set()
+        # Events received while a refresh is in flight; replayed on top of it.
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._hub = registry.event_hub()
+        self._token = self._hub.subscribe(
+            self._on_event, types=("image", "container"), on_reset=self._invalidate
+        )
+
+    def resolve(self, identifier: str) -> Optional[List[Tuple[str, List[str]]]]:
+        """
+        Return (id, tags) pairs matching identifier, or None if the index is
+        unavailable. An exact tag, digest or ID wins, then an ID prefix;
+        otherwise any image whose tag or ID contains identifier
+        (case-insensitive) matches.
+        """
+        if not self._hub.connected:
+            return None
+        if not self._refresh():
+            return None
+        with self._lock:
+            ids = self._lookup(identifier.lower())
+            return sorted(((i, list(self._tags[i])) for i in ids), key=lambda match: (match[1], match[0]))
+
+    def note(self, image_id: Optional[str] = None) -> None:
+        """
+        Re-read image_id, which a tool just pulled, tagged or removed (or
+        relist, with no ID), on the next lookup instead of waiting for its event.
+        """
+        with self._lock:
+            if image_id is None:
+                self._stale = True
+            else:
+                self._dirty.add(image_id)
+
+    def discard(self, image_id: str) -> None:
+        """Forget an image the daemon no longer knows about."""
+        with self._lock:
+            self._remove(image_id)
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self._token)
+        self._invalidate()
+
+    def _lookup(self, query: str) -> Set[str]:
+        bare = query.split(":", 1)[1] if query.startswith("sha256:") else query
+        hex_like = bool(bare) and _HEX.fullmatch(bare) is not None
+        exact = self._refs.exact(query) | self._by_digest.get(query, set())
+        if hex_like and "sha256:" + bare in self._tags:
+            exact.add("sha256:" + bare)
+        if exact:
+            return exact
+        if hex_like:
+            prefix = "sha256:" + bare
+            pos = bisect.bisect_left(self._ids, prefix)
+            by_id = set()
+            while pos < len(self._ids) and self._ids[pos].startswith(prefix):
+                by_id.add(self._ids[pos])
+                pos += 1
+            if by_id:
+                return by_id
+        matches = self._refs.substring(query)
+        if hex_like:
+            # IDs are not trigram-indexed (random hex would bloat the postings); scan them.
+            matches.update(i for i in self._ids if bare in i)
+        return matches
+
+    def _refresh(self) -> bool:
+        """Bring the index up to date; returns False if it cannot be trusted right now."""
+        with self._lock:
+            if not self._stale and not self._dirty:
+                return True
+        # One refresher at a time; concurrent lookups wait and reuse its result.
+        with self._refresh_lock:
+            with self._lock:
+                if not self._stale and not self._dirty:
+                    return True
+                full = self._stale or len(self._dirty) > MAX_TARGETED_REFRESH
+                dirty, self._dirty = self._dirty, set()
+                self._stale = False
+                self._pending = []
+            try:
+                api = self._registry.get().api
+                if full:
+                    images = api.images(all=True)
+                else:
+                    images, gone = [], []
+                    for image_id in sorted(dirty):
+                        try:
+                            images.append(api.inspect_image(image_id))
+                        except docker.errors.NotFound:
+                            gone.append(image_id)
+            except Exception:
+                with self._lock:
+                    self._stale = True
+                    self._pending = None
+                return False
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    # Invalidated while fetching; the result may have missed events.
+                    self._stale = True
+                    return False
+                if full:
+                    self._clear()
+                else:
+                    for image_id in gone:
+                        self._remove(image_id)
+                for image in images:
+                    self._add(image)
+                for event in pending:
+                    self._apply(event)
+                return not self._stale and not self._dirty
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._stale = True
+            self._dirty = set()
+            self._pending = None
+            self._clear()
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            else:
+                self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        actor = event.get("Actor") or {}
+        actor_id = actor.get("ID") or event.get("id", "")
+        action = event.get("Action") or event.get("status", "")
+        if event.get("Type") == "container":
+            # Committing a container creates an image, which emits no image event unless tagged.
+            if action == "commit":
+                self._stale = True
+        elif action == "delete":
+            self._dirty.discard(actor_id)
+            self._remove(actor_id)
+        elif action in ("tag", "untag") and actor_id.startswith("sha256:"):
+            self._dirty.add(actor_id)
+        elif action not in _PASSIVE_ACTIONS:
+            # pull/load/import name the reference, not the image; relist.
+            self._stale = True
+
+    def _add(self, image: Dict[str, Any]) -> None:
+        image_id = image["Id"]
+        tags = [tag for tag in (image.get("RepoTags") or []) if tag != "<none>:<none>"]
+        digests = [d for d in (image.get("RepoDigests") or []) if not d.startswith("<none>@")]
+        self._remove(image_id)
+        for tag in tags:
+            # A tag names one image; if it moved here, drop it from the previous one.
+            for other in self._refs.exact(tag) - {image_id}:
+                self._tags[other] = [t for t in self._tags[other] if t.lower() != tag.lower()]
+                self._refs.add(other, self._ref_keys(self._tags[other]))
+        self._tags[image_id] = tags
+        self._refs.add(image_id, self._ref_keys(tags))
+        bisect.insort(self._ids, image_id)
+        keys = set()
+        for digest in digests:
+            keys.add(digest.lower())
+            keys.add(digest.split("@", 1)[-1].lower())
+        self._digests[image_id] = sorted(keys)
+        for key in keys:
+            self._by_digest.setdefault(key, set()).add(image_id)
+
+    @staticmethod
+    def _ref_keys(tags: List[str]) -> List[str]:
+        # "nginx" refers to nginx:latest, as in the Engine API.
+        return tags + [tag[: -len(":latest")] for tag in tags if tag.endswith(":latest")]
+
+    def _remove(self, image_id: str) -> None:
+        if self._tags.pop(image_id, None) is None:
+            return
+        self._refs.remove(image_id)
+        pos = bisect.bisect_left(self._ids, image_id)
+        if pos < len(self._ids) and self._ids[pos] == image_id:
+            del self._ids[pos]
+        for key in self._digests.pop(image_id, ()):
+            ids = self._by_digest.get(key)
+            if ids is not None:
+                ids.discard(image_id)
+                if not ids:
+                    del self._by_digest[key]
+
+    def _clear(self) -> None:
+        self._refs.clear()
+        self._ids.clear()
+        self._tags.clear()
+        self._digests.clear()
+        self._by_digest.clear()
+
+
+def is_exact(matches: List[Tuple[str, List[str]]], identifier: str) -> bool:
+    """
+    True if matches is a single hit naming identifier exactly (a tag, a name
+    meaning name:latest, or the full ID). Only those are trusted without asking
+    the daemon: a partial hit may stand in for a tag whose event is in flight.
+    """
+    if len(matches) != 1:
+        return False
+    image_id, tags = matches[0]
+    return (
+        identifier in tags
+        or f"{identifier}:latest" in tags
+        or identifier in (image_id, image_id.split(":", 1)[-1])
+    )
+
+
+def get_image_index(registry) -> Optional[ImageIndex]:
+    """Shared image index for registry, or None when event-driven caches are disabled."""
+    if not registry.events_enabled():
+        return None
+    return registry.service("image_index", lambda: ImageIndex(registry))
+
+
+def note_image(registry, image_id: Optional[str] = None) -> None:
+    """Tell the shared image index, if enabled, that a tool changed image_id (or some image)."""
+    index = get_image_index(registry)
+    if index is not None:
+        index.note(image_id)
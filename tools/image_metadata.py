@@ -0,0 +1,240 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Inspect fields that change without the image ID changing (tagging, pushing).
+_REFERENCE_FIELDS = ("RepoTags", "RepoDigests", "Metadata")
+
+# Image actions that do not change an image's inspect data.
+_PASSIVE_ACTIONS = {"push", "save", "prune"}
+
+_IMAGE_ID = re.compile(r"(?:sha256:)?[0-9a-f]{64}")
+
+
+def _env_dir() -> Optional[str]:
+    return os.environ.get("DOCKER_MCP_IMAGE_CACHE_DIR") or None
+
+
+class _Entry:
+    __slots__ = ("history", "inspect", "inspect_refs")
+
+    def __init__(self):
+        self.history: Optional[List[Dict[str, Any]]] = None
+        self.inspect: Optional[Dict[str, Any]] = None
+        # Whether inspect's reference fields (tags, digests) are current.
+        self.inspect_refs = False
+
+
+class ImageMetadataCache:
+    """
+    History and inspect results of images, keyed by image ID.
+
+    An image ID is the digest of the image's config, so its history and
+    layers never change and are served with no API call once fetched. Tags
+    and repository digests in the inspect result do change; they are only
+    served from memory while the /events stream is connected and no
+    tag/untag/pull event touched the image since. Entries are kept in an
+    LRU of max_entries images and dropped when the image is deleted.
+
+    With a directory (or DOCKER_MCP_IMAGE_CACHE_DIR) entries are also
+    written there as JSON, without the reference fields, so they survive
+    restarts.
+    """
+
+    def __init__(self, registry, max_entries: Optional[int] = None, directory: Optional[str] = None):
+        if max_entries is None:
+            max_entries = int(os.environ.get("DOCKER_MCP_IMAGE_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        self._registry = registry
+        self.max_entries = max(1, max_entries)
+        self.directory = directory or _env_dir()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by events that may change reference fields; guards inspect
+        # results fetched while such an event arrived.
+        self._version = 0
+        self._hub = registry.event_hub() if registry.events_enabled() else None
+        self._token = None
+        if self._hub is not None:
+            self._token = self._hub.subscribe(self._on_event, types=("image",), on_reset=self._forget_refs)
+
+    def history(self, image_id: str) -> List[Dict[str, Any]]:
+        """/images/{id}/history of image_id (an image ID, not a tag)."""
+        with self._lock:
+            entry = self._get(image_id)
+            if entry is not None and entry.history is not None:
+                return entry.history
+        history = self._registry.get().api.history(image_id)
+        with self._lock:
+            self._put(image_id).history = history
+        self._write(image_id)
+        return history
+
+    def inspect(self, image_id: str, with_refs: bool = True) -> Dict[str, Any]:
+        """
+        Inspect result of image_id (an image ID, not a tag). With
+        with_refs=False, RepoTags/RepoDigests may be stale or missing, which
+        lets entries loaded from disk be used without an API call.
+        """
+        with self._lock:
+            entry = self._get(image_id)
+            if entry is not None and entry.inspect is not None:
+                if not with_refs or (entry.inspect_refs and self._tracking()):
+                    return entry.inspect
+            version = self._version
+        attrs = self._registry.get().api.inspect_image(image_id)
+        with self._lock:
+            entry = self._put(image_id)
+            entry.inspect = attrs
+            entry.inspect_refs = self._version == version and self._tracking()
+        self._write(image_id)
+        return attrs
+
+    def invalidate_refs(self, image_id: Optional[str] = None) -> None:
+        """Refetch the tags and digests of image_id (or of every image) on the next inspect."""
+        if image_id is None:
+            self._forget_refs()
+            return
+        with self._lock:
+            self._version += 1
+            entry = self._entries.get(image_id)
+            if entry is not None:
+                entry.inspect_refs = False
+
+    def evict(self, image_id: str) -> None:
+        """Drop an image from memory and disk."""
+        with self._lock:
+            self._entries.pop(image_id, None)
+        path = self._path(image_id)
+        if path is not None:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def retain(self, image_ids: Iterable[str]) -> int:
+        """Delete on-disk entries of images not in image_ids (e.g. removed while not running)."""
+        if not self.directory:
+            return 0
+        keep = {self._filename(image_id) for image_id in image_ids}
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and name not in keep:
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def close(self) -> None:
+        if self._hub is not None:
+            self._hub.unsubscribe(self._token)
+        with self._lock:
+            self._entries.clear()
+
+    def _tracking(self) -> bool:
+        return self._hub is not None and self._hub.connected
+
+    def _get(self, image_id: str) -> Optional[_Entry]:
+        entry = self._entries.get(image_id)
+        if entry is not None:
+            self._entries.move_to_end(image_id)
+            return entry
+        entry = self._read(image_id)
+        if entry is not None:
+            self._entries[image_id] = entry
+            self._trim()
+        return entry
+
+    def _put(self, image_id: str) -> _Entry:
+        entry = self._entries.get(image_id)
+        if entry is None:
+            entry = self._entries[image_id] = _Entry()
+            self._trim()
+        else:
+            self._entries.move_to_end(image_id)
+        return entry
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget_refs(self) -> None:
+        with self._lock:
+            self._version += 1
+            for entry in self._entries.values():
+                entry.inspect_refs = False
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        actor = event.get("Actor") or {}
+        image_id = actor.get("ID") or event.get("id", "")
+        action = (event.get("Action") or event.get("status", "")).split(":", 1)[0]
+        if action == "delete":
+            self.evict(image_id)
+        elif action in ("tag", "untag"):
+            self.invalidate_refs(image_id)
+        elif action not in _PASSIVE_ACTIONS:
+            # pull/load/import name a reference, which may have moved off any image.
+            self._forget_refs()
+
+    # -- disk ---------------------------------------------------------------
+
+    @staticmethod
+    def _filename(image_id: str) -> str:
+        return image_id.split(":", 1)[-1] + ".json"
+
+    def _path(self, image_id: str) -> Optional[str]:
+        if not self.directory or not _IMAGE_ID.fullmatch(image_id):
+            return None
+        return os.path.join(self.directory, self._filename(image_id))
+
+    def _read(self, image_id: str) -> Optional[_Entry]:
+        path = self._path(image_id)
+        if path is None:
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry = _Entry()
+        entry.history = data.get("history")
+        entry.inspect = data.get("inspect")
+        return entry
+
+    def _write(self, image_id: str) -> None:
+        path = self._path(image_id)
+        if path is None:
+            return
+        with self._lock:
+            entry = self._entries.get(image_id)
+            if entry is None:
+                return
+            inspect = entry.inspect
+            data = {
+                "history": entry.history,
+                "inspect": {k: v for k, v in inspect.items() if k not in _REFERENCE_FIELDS} if inspect else None,
+            }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".partial")
+        try:
+            with os.fdopen(fd, "w") as out:
+                json.dump(data, out)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk copy is best effort; memory still holds the entry.
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def get_image_metadata_cache(registry) -> ImageMetadataCache:
+    """Shared image history/inspect cache for registry."""
+    return registry.service("image_metadata", lambda: ImageMetadataCache(registry))
@@ -1,5 +1,23 @@
 import docker
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from docker.utils import parse_repository_tag
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
+
+from .cancellation import in_current_call
+from .docker_client import ClientRegistry, get_registry
+from .image_index import get_image_index, is_exact, note_image
+from .image_metadata import get_image_metadata_cache
+from .image_usage import history_layer_sizes, layer_usage
+from .listing import glob_regex, label_selectors, labels_match, paginate, validate_fields
+from .metrics import instrument_tools
+from .object_cache import get_object_cache, mark_changed
+from .search_cache import get_search_cache
+
+
+IMAGE_LIST_FIELDS = ("id", "tags", "size", "created", "virtual_size")
 
 
 class ImageTools:
@@ -7,85 +25,200 @@ class ImageTools:
     Helper class for Docker image operations.
     """
     
-    def __init__(self):
-        """Initialize Docker client. Handles connection errors."""
-        try:
-            self.client = docker.from_env()
-            self.client.ping()
-        except docker.errors.DockerException as e:
-            raise RuntimeError(f"Docker connection failed: {str(e)}")
+    def __init__(self, registry: Optional[ClientRegistry] = None):
+        """Attach to the shared Docker client. Handles connection errors."""
+        self._registry = registry or get_registry()
+        self._registry.acquire()
+        instrument_tools(self, self._registry)
+    
+    @property
+    def client(self) -> docker.DockerClient:
+        """Shared Docker client (follows reconnects of the registry)."""
+        return self._registry.get()
     
-    def get_image_list(self, all_images: bool = False) -> List[Dict[str, Any]]:
+    def get_image_list(
+        self,
+        all_images: bool = False,
+        labels: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        dangling: Optional[bool] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Get list of all images as JSON-serializable dictionaries.
         
         Args:
             all_images: If True, includes intermediate images (default: False)
+            labels: Only images with these labels ("key" or "key=value", all must match)
+            name: Only images whose repository or repository:tag matches this glob
+                  (e.g. "nginx", "myorg/*:v1*")
+            dangling: True for untagged images only, False for tagged images only
+            sort_by: Field to sort by (id, tags, size, created, virtual_size)
+            descending: Sort in descending order
+            limit: Maximum number of images to return (enables pagination)
+            cursor: next_cursor from the previous page
+            fields: Fields to include in each entry (default: all)
         
         Returns:
-            List of image dictionaries with id, tags, size, created date and virtual size
+            List of image dictionaries with id, tags, size, created date and virtual size,
+            or with limit/cursor a dictionary with items, next_cursor, total and as_of
+            (nanoseconds since the epoch: the listing reflects every change before it)
         """
+        selectors = label_selectors(labels)
+        validate_fields(IMAGE_LIST_FIELDS, sort_by, fields)
+        pattern = glob_regex(name) if name else None
+        as_of = time.time_ns()
         try:
-            images = self.client.images.list(all=all_images)
-            return [
-                {
-                    "id": image.id,
-                    "tags": image.tags if image.tags else ["<none>"],
-                    "size": image.attrs.get("Size", 0),
-                    "created": image.attrs.get("Created", ""),
-                    "virtual_size": image.attrs.get("VirtualSize", 0),
-                }
-                for image in images
+            cache = get_object_cache(self._registry)
+            snapshot = cache.snapshot("image") if cache and not all_images else None
+            if snapshot is not None:
+                images, as_of = snapshot
+            else:
+                filters: Dict[str, Any] = {}
+                if selectors:
+                    filters["label"] = selectors
+                if name:
+                    filters["reference"] = name
+                if dangling is not None:
+                    filters["dangling"] = dangling
+                # Listing entries carry every field needed; no inspect per image.
+                images = self.client.api.images(all=all_images, filters=filters or None)
+            summaries = [
+                self._image_summary(image) for image in images
+                if labels_match(image.get("Labels"), selectors)
+                and (dangling is None or dangling == (self._image_tags(image) == ["<none>"]))
+                and (pattern is None or self._reference_matches(image, pattern))
             ]
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to list images: {str(e)}")
+        return paginate(
+            summaries, "id", IMAGE_LIST_FIELDS,
+            sort_by=sort_by, descending=descending, limit=limit, cursor=cursor, fields=fields, as_of=as_of,
+        )
     
-    def _find_image(self, image_identifier: str):
+    @classmethod
+    def _reference_matches(cls, attrs: Dict[str, Any], pattern) -> bool:
+        """True if any repository or repository:tag of the image matches pattern."""
+        for tag in cls._image_tags(attrs):
+            if tag == "<none>":
+                continue
+            repository, _ = parse_repository_tag(tag)
+            if pattern.fullmatch(tag) or pattern.fullmatch(repository):
+                return True
+        return False
+    
+    @staticmethod
+    def _image_tags(attrs: Dict[str, Any]) -> List[str]:
+        """Repo tags of an image (listing or inspect attrs), or ["<none>"]."""
+        tags = [tag for tag in (attrs.get("RepoTags") or []) if tag != "<none>:<none>"]
+        return tags if tags else ["<none>"]
+    
+    @classmethod
+    def _image_summary(cls, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        created = attrs.get("Created", "")
+        if isinstance(created, int):
+            # Listings report seconds since the epoch; inspect reports RFC 3339.
+            created = datetime.fromtimestamp(created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {
+            "id": attrs["Id"],
+            "tags": cls._image_tags(attrs),
+            "size": attrs.get("Size", 0),
+            "created": created,
+            "virtual_size": attrs.get("VirtualSize", 0),
+        }
+    
+    def _find_image_id(self, image_identifier: str) -> str:
         """
-        Find image by ID or name/tag (supports partial name matching).
+        ID of the image matching image_identifier (ID or name/tag, supports
+        partial name matching). An exact tag or ID hit in the event-maintained
+        index needs no API call; as the index can lag the daemon, a partial hit
+        is only used once the daemon's exact lookup has failed.
         """
+        index = get_image_index(self._registry)
+        matches = index.resolve(image_identifier) if index else None
+        if matches and is_exact(matches, image_identifier):
+            return matches[0][0]
+        
         try:
-            return self.client.images.get(image_identifier)
+            return self.client.api.inspect_image(image_identifier)["Id"]
         except docker.errors.NotFound:
-            # If not found, try partial name matching
-            all_images = self.client.images.list(all=True)
-            matching = []
+            pass
+        
+        if matches and len(matches) > 1:
+            tags_list = []
+            for _, tags in matches:
+                tags_list.extend(tags if tags else ["<none>"])
+            unique_tags = sorted(set(tags_list))[:5]  # Limit to 5 for readability
+            raise ValueError(
+                f"Multiple images match '{image_identifier}': {', '.join(unique_tags)}. "
+                f"Please be more specific (use name:tag format)."
+            )
+        if matches:
+            return matches[0][0]
+        if matches is not None:
+            # The index already holds every image; no need to list them.
+            raise ValueError(f"Image '{image_identifier}' not found.")
+        return self._match_image_listing(image_identifier).id
+    
+    def _find_image(self, image_identifier: str):
+        """Find image by ID or name/tag (supports partial name matching); see _find_image_id."""
+        image_id = self._find_image_id(image_identifier)
+        try:
+            return self.client.images.get(image_id)
+        except docker.errors.NotFound:
+            # Removed before its delete event arrived; ask the daemon directly.
+            index = get_image_index(self._registry)
+            if index is not None:
+                index.discard(image_id)
+            try:
+                return self.client.images.get(image_identifier)
+            except docker.errors.NotFound:
+                raise ValueError(f"Image '{image_identifier}' not found.")
+    
+    def _match_image_listing(self, image_identifier: str):
+        """Single image whose ID or a tag contains image_identifier, from a full listing."""
+        all_images = self.client.images.list(all=True)
+        matching = []
+        
+        for img in all_images:
+            if image_identifier.lower() in img.id.lower():
+                matching.append(img)
+                continue
             
-            for img in all_images:
-                if image_identifier.lower() in img.id.lower():
+            for tag in (img.tags or []):
+                if image_identifier.lower() in tag.lower():
                     matching.append(img)
-                    continue
-                
-                for tag in (img.tags or []):
-                    if image_identifier.lower() in tag.lower():
-                        matching.append(img)
-                        break
+                    break
+        
+        if len(matching) == 1:
+            return matching[0]
+        elif len(matching) > 1:
+            tags_list = []
+            for img in matching:
+                tags = img.tags if img.tags else ["<none>"]
+                tags_list.extend(tags)
+            unique_tags = list(set(tags_list))[:5]  # Limit to 5 for readability
+            raise ValueError(
+                f"Multiple images match '{image_identifier}': {', '.join(unique_tags)}. "
+                f"Please be more specific (use name:tag format)."
+            )
+        else:
+            # Suggest similar names
+            all_tags = []
+            for img in all_images:
+                if img.tags:
+                    all_tags.extend(img.tags)
             
-            if len(matching) == 1:
-                return matching[0]
-            elif len(matching) > 1:
-                tags_list = []
-                for img in matching:
-                    tags = img.tags if img.tags else ["<none>"]
-                    tags_list.extend(tags)
-                unique_tags = list(set(tags_list))[:5]  # Limit to 5 for readability
-                raise ValueError(
-                    f"Multiple images match '{image_identifier}': {', '.join(unique_tags)}. "
-                    f"Please be more specific (use name:tag format)."
-                )
-            else:
-                # Suggest similar names
-                all_tags = []
-                for img in all_images:
-                    if img.tags:
-                        all_tags.extend(img.tags)
-                
-                similar = [
-                    tag for tag in all_tags
-                    if image_identifier.lower() in tag.lower()
-                ]
-                suggestion = f" Did you mean: {', '.join(similar[:3])}?" if similar else ""
-                raise ValueError(f"Image '{image_identifier}' not found.{suggestion}")
+            similar = [
+                tag for tag in all_tags
+                if image_identifier.lower() in tag.lower()
+            ]
+            suggestion = f" Did you mean: {', '.join(similar[:3])}?" if similar else ""
+            raise ValueError(f"Image '{image_identifier}' not found.{suggestion}")
     
     def get_image_info(self, image_identifier: str) -> Dict[str, Any]:
         """
@@ -99,12 +232,16 @@ class ImageTools:
             Dictionary with image details including tags, size, architecture, etc.
         """
         try:
-            image = self._find_image(image_identifier)
-            attrs = image.attrs
+            # One inspect cache for images: the metadata cache, keyed by ID.
+            cache = get_image_metadata_cache(self._registry)
+            try:
+                attrs = cache.inspect(self._find_image_id(image_identifier))
+            except docker.errors.NotFound:
+                attrs = cache.inspect(self._find_image(image_identifier).id)
             
             return {
-                "id": image.id,
-                "tags": image.tags if image.tags else ["<none>"],
+                "id": attrs["Id"],
+                "tags": self._image_tags(attrs),
                 "size": attrs.get("Size", 0),
                 "virtual_size": attrs.get("VirtualSize", 0),
                 "created": attrs.get("Created", ""),
@@ -136,6 +273,8 @@ class ImageTools:
         try:
             full_name = f"{image_name}:{tag}" if tag else image_name
             image = self.client.images.pull(image_name, tag=tag)
+            mark_changed(self._registry, "image")
+            self._note_pulled(image.id)
             
             return {
                 "id": image.id,
@@ -148,6 +287,152 @@ class ImageTools:
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to pull image: {str(e)}")
     
+    def _note_pulled(self, image_id: Optional[str] = None) -> None:
+        """Update the image index and metadata cache for a pull, ahead of its events."""
+        note_image(self._registry, image_id)
+        # The pulled tag may have moved off another image.
+        get_image_metadata_cache(self._registry).invalidate_refs()
+    
+    def iter_pull_progress(self, reference: str) -> Iterator[Dict[str, Any]]:
+        """
+        Pull one image and yield normalized per-layer progress events.
+        
+        Args:
+            reference: Image reference (e.g., "nginx", "nginx:1.25", "repo@sha256:...")
+        
+        Yields:
+            Dicts with reference, layer, status, current and total bytes. Layers the
+            daemon already has are reported with status "Already exists" and are not
+            downloaded again.
+        """
+        repository, tag = parse_repository_tag(reference)
+        try:
+            stream = self.client.api.pull(repository, tag=tag or "latest", stream=True, decode=True)
+            for event in stream:
+                if "error" in event:
+                    raise RuntimeError(f"Failed to pull image '{reference}': {event['error']}")
+                detail = event.get("progressDetail") or {}
+                yield {
+                    "reference": reference,
+                    "layer": event.get("id", ""),
+                    "status": event.get("status", ""),
+                    "current": detail.get("current", 0),
+                    "total": detail.get("total", 0),
+                }
+            mark_changed(self._registry, "image")
+            self._note_pulled()
+        except docker.errors.NotFound:
+            raise ValueError(f"Image '{reference}' not found in registry")
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to pull image: {str(e)}")
+    
+    def _pull_one(
+        self,
+        reference: str,
+        skip_present: bool,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> Dict[str, Any]:
+        """Pull a single reference, aggregating layer progress into a summary."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"reference": reference}
+        repository, tag = parse_repository_tag(reference)
+        tag = tag or "latest"
+        local_ref = f"{repository}@{tag}" if tag.startswith("sha256:") else f"{repository}:{tag}"
+        try:
+            if skip_present:
+                try:
+                    image_id = self.client.api.inspect_image(local_ref)["Id"]
+                    result.update(status="present", id=image_id, layers_total=0,
+                                  layers_skipped=0, bytes_downloaded=0)
+                    return result
+                except docker.errors.ImageNotFound:
+                    pass
+            
+            layers: Dict[str, Dict[str, int]] = {}
+            skipped = set()
+            digest = ""
+            for event in self.iter_pull_progress(reference):
+                if on_progress is not None:
+                    on_progress(event)
+                layer, status = event["layer"], event["status"]
+                if status.startswith("Digest:"):
+                    digest = status.split(":", 1)[1].strip()
+                if not layer or layer == tag:
+                    continue
+                progress = layers.setdefault(layer, {"downloaded": 0, "extracted": 0, "total": 0})
+                if status == "Already exists":
+                    skipped.add(layer)
+                elif status == "Downloading":
+                    progress["downloaded"] = event["current"]
+                    progress["total"] = event["total"] or progress["total"]
+                elif status == "Extracting":
+                    progress["extracted"] = event["current"]
+                elif status in ("Download complete", "Pull complete"):
+                    progress["downloaded"] = max(progress["downloaded"], progress["total"])
+            
+            result.update(
+                status="pulled",
+                id=self.client.api.inspect_image(local_ref)["Id"],
+                digest=digest,
+                layers_total=len(layers),
+                layers_skipped=len(skipped),
+                bytes_downloaded=sum(p["downloaded"] for p in layers.values()),
+            )
+        except (ValueError, RuntimeError) as e:
+            result.update(status="failed", error=str(e))
+        except docker.errors.DockerException as e:
+            result.update(status="failed", error=f"Failed to pull image: {str(e)}")
+        finally:
+            result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return result
+    
+    def pull_images(
+        self,
+        references: List[str],
+        max_parallel: int = 4,
+        skip_present: bool = False,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Pull many images concurrently with per-layer progress.
+        
+        Args:
+            references: Image references (e.g., ["nginx:1.25", "python:3.12-slim"])
+            max_parallel: Maximum concurrent pulls (default: 4)
+            skip_present: Skip references that already exist locally (default: False)
+            on_progress: Optional callback receiving each layer progress event
+                         (called from worker threads)
+        
+        Returns:
+            Dictionary with per-reference results and batch totals
+        """
+        if not references:
+            raise ValueError("No image references given")
+        lock = threading.Lock()
+        
+        def report(event: Dict[str, Any]) -> None:
+            with lock:
+                on_progress(event)
+        
+        callback = report if on_progress is not None else None
+        
+        started = time.perf_counter()
+        unique = list(dict.fromkeys(references))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(unique)))) as pool:
+            results = list(pool.map(in_current_call(lambda ref: self._pull_one(ref, skip_present, callback)), unique))
+        pulled = sum(1 for r in results if r["status"] == "pulled")
+        present = sum(1 for r in results if r["status"] == "present")
+        failed = len(results) - pulled - present
+        return {
+            "results": results,
+            "pulled": pulled,
+            "present": present,
+            "failed": failed,
+            "bytes_downloaded": sum(r.get("bytes_downloaded", 0) for r in results),
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "message": f"Pulled {pulled} image(s), {present} already present, {failed} failed",
+        }
+    
     def remove_image(self, image_identifier: str, force: bool = False) -> Dict[str, Any]:
         """
         Remove an image from local Docker host.
@@ -164,6 +449,9 @@ class ImageTools:
             image_tags = image.tags if image.tags else ["<none>"]
             
             self.client.images.remove(image.id, force=force)
+            mark_changed(self._registry, "image")
+            note_image(self._registry, image.id)
+            get_image_metadata_cache(self._registry).evict(image.id)
             
             return {
                 "id": image.id,
@@ -188,6 +476,9 @@ class ImageTools:
         """
         Search for images on Docker Hub.
         
+        Results are cached for DOCKER_MCP_SEARCH_TTL seconds (default: 300, 0
+        disables), and concurrent identical searches share one registry query.
+        
         Args:
             term: Search term (e.g., "nginx", "python", "postgres")
             limit: Maximum number of results to return (default: 25, max: 100)
@@ -195,10 +486,10 @@ class ImageTools:
         Returns:
             List of search results with name, description, star count, etc.
         """
-        try:
-            limit = min(limit, 100)  # Docker Hub max is 100
+        limit = min(limit, 100)  # Docker Hub max is 100
+        
+        def search() -> List[Dict[str, Any]]:
             results = self.client.images.search(term, limit=limit)
-            
             return [
                 {
                     "name": result.get("name", ""),
@@ -209,9 +500,26 @@ class ImageTools:
                 }
                 for result in results
             ]
+        
+        try:
+            cache = get_search_cache(self._registry)
+            return cache.get(term, limit, search) if cache else search()
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to search images: {str(e)}")
     
+    def _image_history(self, image_identifier: str) -> List[Dict[str, Any]]:
+        """
+        History of an image from the image metadata cache. The identifier is
+        resolved through the image index when possible, so a repeat lookup
+        makes no API call at all.
+        """
+        cache = get_image_metadata_cache(self._registry)
+        image_id = self._find_image_id(image_identifier)
+        try:
+            return cache.history(image_id)
+        except docker.errors.NotFound:
+            return cache.history(self._find_image(image_identifier).id)
+    
     def get_image_history(self, image_identifier: str) -> List[Dict[str, Any]]:
         """
         Get the history of an image (layers and commands).
@@ -223,8 +531,7 @@ class ImageTools:
             List of history entries with created date, size, and command
         """
         try:
-            image = self._find_image(image_identifier)
-            history = image.history()
+            history = self._image_history(image_identifier)
             
             return [
                 {
@@ -241,7 +548,60 @@ class ImageTools:
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to get image history: {str(e)}")
     
+    def get_image_disk_usage(self, top: int = 20, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Analyze image disk usage with shared layers accounted for.
+        
+        Reads /system/df once, then each image's layers (inspect) and layer
+        sizes (history) concurrently, and builds a layer -> images graph.
+        Unique bytes are in layers no other image uses; they are what
+        removing the image alone would free, unless a container uses it.
+        
+        Args:
+            top: Number of images (and shared layers) to list, largest reclaimable first
+            max_workers: Maximum concurrent API requests (default: 8)
+        
+        Returns:
+            Dictionary with totals (disk_size counts each layer once, apparent_size
+            counts it per image), a reclaim ranking of images with unique/shared
+            bytes, and the largest shared layers
+        """
+        if top < 1:
+            raise ValueError("top must be >= 1")
+        try:
+            df = self.client.api.df()
+            images = df.get("Images") or []
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(images) or 1))) as pool:
+                fetched = list(pool.map(in_current_call(self._image_layers), [image["Id"] for image in images]))
+            layers = {}
+            approximate = 0
+            for image, result in zip(images, fetched):
+                if result is None:
+                    # Removed since the df call.
+                    continue
+                layers[image["Id"]], exact = result
+                approximate += not exact
+            get_image_metadata_cache(self._registry).retain(image["Id"] for image in images)
+            usage = layer_usage(images, layers, top)
+            usage["layers_size"] = df.get("LayersSize", 0)
+            usage["approximate_images"] = approximate
+            return usage
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to analyze image disk usage: {str(e)}")
+    
+    def _image_layers(self, image_id: str) -> Optional[Tuple[List[Tuple[str, int]], bool]]:
+        """(diff_id, size) pairs of an image's layers, base first, or None if it is gone."""
+        cache = get_image_metadata_cache(self._registry)
+        try:
+            # Layers never change for an image ID, so tags need not be current.
+            diff_ids = (cache.inspect(image_id, with_refs=False).get("RootFS") or {}).get("Layers") or []
+            return history_layer_sizes(diff_ids, cache.history(image_id))
+        except docker.errors.NotFound:
+            cache.evict(image_id)
+            return None
+    
     def close(self):
-        """Close Docker client connection."""
-        if hasattr(self, "client"):
-            self.client.close()
+        """Release the shared Docker client connection."""
+        if getattr(self, "_registry", None) is not None:
+            self._registry.release()
+            self._registry = None
\ No newline at end of file
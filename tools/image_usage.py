@@ -0,0 +1,132 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# History entries of instructions that only change image metadata (no layer).
+_METADATA_STEP = re.compile(
+    r"^(?:/bin/sh -c #\(nop\)\s*)?"
+    r"(?:ENV|CMD|LABEL|EXPOSE|ENTRYPOINT|USER|ARG|ONBUILD|STOPSIGNAL|HEALTHCHECK|SHELL|VOLUME|MAINTAINER)\b",
+    re.IGNORECASE,
+)
+
+
+def history_layer_sizes(diff_ids: Sequence[str], history: Sequence[Dict[str, Any]]) -> Tuple[List[Tuple[str, int]], bool]:
+    """
+    Pair an image's layers (RootFS.Layers, base first) with their sizes from
+    /images/{id}/history, which lists build steps newest first and includes
+    steps that created no layer.
+
+    Steps with a size, and steps that are not metadata-only instructions,
+    are taken as layers. If that count does not match the layers (e.g. an
+    empty RUN or WORKDIR), zero-size steps are dropped from the newest end;
+    any remaining mismatch is padded or folded so the image's total is kept.
+    Returns [(diff_id, size), ...] and whether the pairing was exact.
+    """
+    steps = [
+        step.get("Size") or 0 for step in reversed(history)
+        if step.get("Size") or not _METADATA_STEP.match((step.get("CreatedBy") or "").strip())
+    ]
+    exact = len(steps) == len(diff_ids)
+    excess = len(steps) - len(diff_ids)
+    if excess > 0:
+        kept: List[int] = []
+        for size in reversed(steps):
+            if excess and not size:
+                excess -= 1
+                continue
+            kept.append(size)
+        steps = kept[::-1]
+    if len(steps) < len(diff_ids):
+        steps += [0] * (len(diff_ids) - len(steps))
+    elif len(steps) > len(diff_ids) and diff_ids:
+        steps = steps[: len(diff_ids) - 1] + [sum(steps[len(diff_ids) - 1:])]
+    return list(zip(diff_ids, steps)), exact
+
+
+def _short(layer_id: str) -> str:
+    return layer_id.split(":", 1)[-1][:12]
+
+
+def layer_usage(
+    images: Sequence[Dict[str, Any]],
+    layers: Dict[str, List[Tuple[str, int]]],
+    top: Optional[int] = 20,
+) -> Dict[str, Any]:
+    """
+    Build the layer -> images graph and account each image's bytes.
+
+    images are /system/df image entries; layers maps image ID to its
+    (diff_id, size) pairs, base first. A layer is identified by its chain
+    (the diff IDs from the base up to it), as in the layer store, so two
+    images share a layer only if they share everything beneath it too.
+    Unique bytes are in layers no other image uses and are what removing
+    the image alone frees; nothing is reclaimable while a container uses
+    the image.
+    """
+    node_of: Dict[Tuple[int, str], int] = {}
+    sizes: List[int] = []
+    diffs: List[str] = []
+    users: List[List[str]] = []
+    chains: Dict[str, List[int]] = {}
+    for image in images:
+        image_id = image["Id"]
+        if image_id not in layers:
+            continue
+        parent = -1
+        chain = []
+        for diff_id, size in layers[image_id]:
+            node = node_of.get((parent, diff_id))
+            if node is None:
+                node = node_of[(parent, diff_id)] = len(sizes)
+                sizes.append(size)
+                diffs.append(diff_id)
+                users.append([])
+            users[node].append(image_id)
+            chain.append(node)
+            parent = node
+        chains[image_id] = chain
+
+    entries = []
+    for image in images:
+        chain = chains.get(image["Id"])
+        if chain is None:
+            continue
+        total = sum(sizes[node] for node in chain)
+        unique = sum(sizes[node] for node in chain if len(users[node]) == 1)
+        containers = max(image.get("Containers") or 0, 0)
+        tags = [tag for tag in (image.get("RepoTags") or []) if tag != "<none>:<none>"]
+        entries.append({
+            "id": image["Id"],
+            "tags": tags if tags else ["<none>"],
+            "size": total,
+            "unique_size": unique,
+            "shared_size": total - unique,
+            "layers": len(chain),
+            "containers": containers,
+            "reclaimable_size": 0 if containers else unique,
+        })
+    entries.sort(key=lambda entry: (-entry["reclaimable_size"], -entry["unique_size"], entry["id"]))
+    tags_of = {entry["id"]: entry["tags"] for entry in entries}
+
+    shared_nodes = [node for node in range(len(sizes)) if len(users[node]) > 1]
+    shared_nodes.sort(key=lambda node: (-sizes[node], -len(users[node])))
+    disk_size = sum(sizes)
+    shared_size = sum(sizes[node] for node in shared_nodes)
+    return {
+        "images": len(entries),
+        "layers": len(sizes),
+        "disk_size": disk_size,
+        "apparent_size": sum(entry["size"] for entry in entries),
+        "shared_size": shared_size,
+        "unique_size": disk_size - shared_size,
+        "reclaimable_size": sum(entry["reclaimable_size"] for entry in entries),
+        "ranking": entries[:top] if top is not None else entries,
+        "shared_layers": [
+            {
+                "layer": _short(diffs[node]),
+                "size": sizes[node],
+                "images": len(users[node]),
+                "tags": sorted({tag for image_id in users[node] for tag in tags_of[image_id]})[:5],
+            }
+            for node in (shared_nodes[:top] if top is not None else shared_nodes)
+        ],
+    }
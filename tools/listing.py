@@ -0,0 +1,163 @@
+import base64
+import binascii
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Characters allowed in container, network and volume names.
+_NAME_RUN = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+def glob_regex(pattern: str) -> "re.Pattern[str]":
+    """
+    Compile a name glob to a regex: * and ? do not cross "/" (as in the
+    Engine API's reference filter) and [...] is a character class.
+    """
+    parts: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return re.compile("".join(parts))
+
+
+def name_hint(pattern: str) -> Optional[str]:
+    """
+    Longest literal run of name characters in a glob. Every name the glob
+    matches contains it, so it can be pushed down as the API's ``name``
+    filter (a substring or regex search, depending on the object type).
+    """
+    literal = re.split(r"[*?]|\[[^\]]*\]", pattern)
+    runs = [run for part in literal for run in _NAME_RUN.findall(part)]
+    return max(runs, key=len) if runs else None
+
+
+def label_selectors(labels: Optional[Sequence[str]]) -> List[str]:
+    """Validate "key" / "key=value" label selectors."""
+    if labels is None:
+        return []
+    if isinstance(labels, str):
+        labels = [labels]
+    selectors = []
+    for selector in labels:
+        if not isinstance(selector, str) or not selector.partition("=")[0]:
+            raise ValueError(f"Invalid label filter {selector!r}; use 'key' or 'key=value'")
+        selectors.append(selector)
+    return selectors
+
+
+def labels_match(labels: Optional[Dict[str, str]], selectors: Sequence[str]) -> bool:
+    """True if labels satisfy every selector (a key must exist; key=value must equal)."""
+    labels = labels or {}
+    for selector in selectors:
+        key, sep, value = selector.partition("=")
+        if key not in labels or (sep and labels[key] != value):
+            return False
+    return True
+
+
+def _sort_value(value: Any) -> Tuple[Any, ...]:
+    # (rank, value) keeps values of different types comparable; None sorts first.
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if value is None:
+        return (0, "")
+    if isinstance(value, (bool, int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value.lower())
+    return (2, json.dumps(value, sort_keys=True))
+
+
+def _encode_cursor(sort_by: Optional[str], descending: bool, position: Tuple[Any, str]) -> str:
+    raw = json.dumps([sort_by, descending, list(position[0]), position[1]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: Optional[str], descending: bool) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, value, key = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor; pass the next_cursor of a previous page")
+    if cursor_sort != sort_by or cursor_descending != descending:
+        raise ValueError("Cursor was issued for a different sort order; repeat sort_by/descending")
+    return tuple(value), key
+
+
+def paginate(
+    items: List[Dict[str, Any]],
+    key: str,
+    known_fields: Sequence[str],
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    as_of: Optional[int] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Sort, page and project list summaries.
+
+    Pages are keyset-based: the cursor records the sort value and key of the
+    last item returned, so objects created or removed between calls do not
+    shift later pages. Without limit/cursor the (sorted) list is returned as
+    is; otherwise a dict with items, next_cursor (None on the last page),
+    total (matches across all pages) and as_of (when the listing was taken,
+    in nanoseconds since the epoch).
+    """
+    validate_fields(known_fields, sort_by, fields)
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be >= 1")
+    paged = limit is not None or cursor is not None
+    if sort_by is not None or paged:
+        def position(item: Dict[str, Any]) -> Tuple[Any, str]:
+            return (_sort_value(item.get(sort_by)) if sort_by else (), item[key])
+
+        ordered = sorted(items, key=position, reverse=descending)
+    else:
+        ordered = items
+    total = len(ordered)
+    next_cursor = None
+    if cursor is not None:
+        after = _decode_cursor(cursor, sort_by, descending)
+        ordered = [
+            item for item in ordered
+            if (position(item) < after if descending else position(item) > after)
+        ]
+    if limit is not None and len(ordered) > limit:
+        ordered = ordered[:limit]
+        next_cursor = _encode_cursor(sort_by, descending, position(ordered[-1]))
+    if fields:
+        ordered = [{field: item.get(field) for field in fields} for item in ordered]
+    if not paged:
+        return ordered
+    return {"items": ordered, "next_cursor": next_cursor, "total": total, "as_of": as_of}
+
+
+def validate_fields(
+    known_fields: Sequence[str], sort_by: Optional[str] = None, fields: Optional[Sequence[str]] = None
+) -> None:
+    if sort_by is not None and sort_by not in known_fields:
+        raise ValueError(f"Cannot sort by '{sort_by}'; choose one of: {', '.join(known_fields)}")
+    unknown = [field for field in (fields or ()) if field not in known_fields]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}; choose from: {', '.join(known_fields)}")
+
+
+def wants_field(field: str, sort_by: Optional[str], fields: Optional[Sequence[str]]) -> bool:
+    """True if field is returned or sorted on (lets callers skip fetching it)."""
+    return not fields or field in fields or sort_by == field
@@ -0,0 +1,333 @@
+import bisect
+import functools
+import inspect
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .docker_client import get_registry
+
+
+# Latency bucket upper bounds in seconds (plus +Inf).
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_VERSION_PREFIX = re.compile(r"^/v\d+\.\d+")
+# Engine API path segments kept verbatim; any other segment is an object ID or name.
+_ENDPOINT_WORDS = {
+    "containers", "images", "networks", "volumes", "exec", "system", "events", "version", "info",
+    "_ping", "df", "json", "create", "prune", "logs", "stats", "archive", "history", "start",
+    "stop", "restart", "kill", "pause", "unpause", "wait", "attach", "resize", "top", "changes",
+    "export", "rename", "update", "connect", "disconnect", "push", "tag", "search", "load", "get",
+    "commit", "build", "auth", "distribution", "plugins",
+}
+
+_local = threading.local()
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Normalize a request to an endpoint label, e.g. "GET /containers/{id}/json"."""
+    path = _VERSION_PREFIX.sub("", urlparse(url).path)
+    normalized: List[str] = []
+    for part in (p for p in path.split("/") if p):
+        if part not in _ENDPOINT_WORDS:
+            # Image names may span several segments (library/nginx:latest).
+            if normalized and normalized[-1] == "{id}":
+                continue
+            part = "{id}"
+        normalized.append(part)
+    return f"{method} /" + "/".join(normalized)
+
+
+def _body_size(request: Any) -> int:
+    body = getattr(request, "body", None)
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    # Streamed bodies (e.g. put_archive generators) report no size up front.
+    return int(request.headers.get("Content-Length") or 0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (OpenMetrics layout)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if above the last bucket)."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            result.append((repr(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class _MethodStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.requests: Dict[str, int] = {}
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.requests: Dict[int, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class MetricsCollector:
+    """
+    Per-method latency histograms and Docker API request counters.
+
+    Tool instances are instrumented with instrument_tools(): every public
+    method records its latency and errors. A requests response hook on the
+    shared client counts each HTTP request by endpoint and status, with
+    request and response body bytes, and attributes it to the outermost tool
+    method running on the calling thread. Bytes are counted as bodies are
+    read through the response; exec/attach streams read straight from the
+    socket are not included.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._methods: Dict[str, _MethodStats] = {}
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self.started = time.time()
+        registry.add_connect_hook(self._install)
+
+    def close(self) -> None:
+        self._registry.remove_connect_hook(self._install)
+
+    # -- recording ----------------------------------------------------------
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """Wrap a tool method so its calls are timed and its API requests attributed to it."""
+
+        @functools.wraps(fn)
+        def instrumented(*args, **kwargs):
+            outer = getattr(_local, "method", None)
+            if outer is None:
+                _local.method = name
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                if outer is None:
+                    _local.method = None
+                self.observe(name, time.perf_counter() - start, failed)
+
+        return instrumented
+
+    def observe(self, method: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.latency.observe(seconds)
+            if failed:
+                stats.errors += 1
+
+    def _install(self, client: Any) -> None:
+        hooks = client.api.hooks.setdefault("response", [])
+        if self._on_response not in hooks:
+            hooks.append(self._on_response)
+
+    def _on_response(self, response: Any, *args, **kwargs) -> Any:
+        request = response.request
+        endpoint = endpoint_key(request.method, request.url)
+        method = getattr(_local, "method", None)
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _EndpointStats()
+            stats.requests[response.status_code] = stats.requests.get(response.status_code, 0) + 1
+            stats.bytes_sent += _body_size(request)
+            if method is not None:
+                method_stats = self._methods.get(method)
+                if method_stats is None:
+                    method_stats = self._methods[method] = _MethodStats()
+                method_stats.requests[endpoint] = method_stats.requests.get(endpoint, 0) + 1
+        self._count_body(response.raw, stats)
+        return response
+
+    def _count_body(self, raw: Any, stats: _EndpointStats) -> None:
+        """Count response body bytes as they are read (the hook runs before the body is)."""
+        read = getattr(raw, "read", None)
+        if read is None:
+            return
+
+        def add(n: int) -> None:
+            with self._lock:
+                stats.bytes_received += n
+
+        def counting_read(*args, **kwargs):
+            data = read(*args, **kwargs)
+            if data:
+                add(len(data))
+            return data
+
+        raw.read = counting_read
+        read_chunked = getattr(raw, "read_chunked", None)
+        if read_chunked is not None:
+            def counting_read_chunked(*args, **kwargs):
+                for chunk in read_chunked(*args, **kwargs):
+                    add(len(chunk))
+                    yield chunk
+
+            raw.read_chunked = counting_read_chunked
+
+    # -- reporting ----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view of everything recorded so far."""
+        with self._lock:
+            methods = {}
+            for name, stats in sorted(self._methods.items()):
+                latency = stats.latency
+                requests = sum(stats.requests.values())
+                p50, p95 = latency.quantile(0.5), latency.quantile(0.95)
+                methods[name] = {
+                    "calls": latency.count,
+                    "errors": stats.errors,
+                    "total_seconds": round(latency.sum, 6),
+                    "mean_ms": round(latency.sum / latency.count * 1000, 3) if latency.count else 0.0,
+                    # Bucket upper bounds, so p50/p95 are "at most" values.
+                    "p50_ms": p50 * 1000 if p50 is not None else None,
+                    "p95_ms": p95 * 1000 if p95 is not None else None,
+                    "api_requests": requests,
+                    "api_requests_per_call": round(requests / latency.count, 3) if latency.count else 0.0,
+                    "endpoints": dict(sorted(stats.requests.items())),
+                }
+            endpoints = {
+                name: {
+                    "requests": sum(stats.requests.values()),
+                    "by_status": {str(code): n for code, n in sorted(stats.requests.items())},
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                }
+                for name, stats in sorted(self._endpoints.items())
+            }
+        return {
+            "enabled": True,
+            "since": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "methods": methods,
+            "endpoints": endpoints,
+            "api_requests": sum(e["requests"] for e in endpoints.values()),
+        }
+
+    def openmetrics(self) -> str:
+        """Everything recorded so far in OpenMetrics text format."""
+        lines = [
+            "# TYPE docker_mcp_tool_call_seconds histogram",
+            "# HELP docker_mcp_tool_call_seconds Latency of tool method calls.",
+        ]
+        with self._lock:
+            methods = sorted(self._methods.items())
+            endpoints = sorted(self._endpoints.items())
+            for name, stats in methods:
+                label = f'method="{_escape(name)}"'
+                for bound, count in stats.latency.cumulative():
+                    lines.append(f'docker_mcp_tool_call_seconds_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f"docker_mcp_tool_call_seconds_count{{{label}}} {stats.latency.count}")
+                lines.append(f"docker_mcp_tool_call_seconds_sum{{{label}}} {stats.latency.sum:.6f}")
+            lines += [
+                "# TYPE docker_mcp_tool_call_errors counter",
+                "# HELP docker_mcp_tool_call_errors Tool method calls that raised.",
+            ]
+            lines += [
+                f'docker_mcp_tool_call_errors_total{{method="{_escape(name)}"}} {stats.errors}'
+                for name, stats in methods
+            ]
+            lines += [
+                "# TYPE docker_mcp_tool_api_requests counter",
+                "# HELP docker_mcp_tool_api_requests Docker API requests made by each tool method.",
+            ]
+            lines += [
+                f'docker_mcp_tool_api_requests_total{{method="{_escape(name)}",endpoint="{_escape(endpoint)}"}} {n}'
+                for name, stats in methods
+                for endpoint, n in sorted(stats.requests.items())
+            ]
+            lines += [
+                "# TYPE docker_mcp_api_requests counter",
+                "# HELP docker_mcp_api_requests Docker API requests by endpoint and status.",
+            ]
+            lines += [
+                f'docker_mcp_api_requests_total{{endpoint="{_escape(name)}",status="{code}"}} {n}'
+                for name, stats in endpoints
+                for code, n in sorted(stats.requests.items())
+            ]
+            lines += [
+                "# TYPE docker_mcp_api_bytes counter",
+                "# HELP docker_mcp_api_bytes Docker API body bytes by endpoint and direction.",
+            ]
+            for name, stats in endpoints:
+                label = f'endpoint="{_escape(name)}"'
+                lines.append(f'docker_mcp_api_bytes_total{{{label},direction="sent"}} {stats.bytes_sent}')
+                lines.append(f'docker_mcp_api_bytes_total{{{label},direction="received"}} {stats.bytes_received}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def get_metrics_collector(registry) -> Optional[MetricsCollector]:
+    """Shared collector for registry, or None unless enabled (DOCKER_MCP_METRICS=1)."""
+    if not registry.metrics_enabled():
+        return None
+    return registry.service("metrics", lambda: MetricsCollector(registry))
+
+
+def instrument_tools(tools: Any, registry) -> None:
+    """Replace the public methods of a tool instance with instrumented ones (if metrics are enabled)."""
+    collector = get_metrics_collector(registry)
+    if collector is None:
+        return
+    prefix = type(tools).__name__
+    # Walk the class so properties (e.g. client) are not evaluated.
+    for name, _ in inspect.getmembers(type(tools), inspect.isfunction):
+        if name.startswith("_") or name == "close":
+            continue
+        setattr(tools, name, collector.wrap(f"{prefix}.{name}", getattr(tools, name)))
+
+
+def get_metrics(registry=None) -> Dict[str, Any]:
+    """Recorded metrics as a dict ({"enabled": False} when instrumentation is off)."""
+    collector = get_metrics_collector(registry or get_registry())
+    if collector is None:
+        return {"enabled": False, "message": "Metrics are disabled; set DOCKER_MCP_METRICS=1 to enable them"}
+    return collector.snapshot()
+
+
+def render_openmetrics(registry=None) -> str:
+    """Recorded metrics in OpenMetrics text format (only "# EOF" when instrumentation is off)."""
+    collector = get_metrics_collector(registry or get_registry())
+    return collector.openmetrics() if collector is not None else "# EOF\n"
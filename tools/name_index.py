@@ -0,0 +1,96 @@
+import bisect
+from typing import Dict, Iterable, List, Set
+
+
+class NameIndex:
+    """
+    Case-insensitive lookup from names/IDs to object IDs.
+
+    Supports exact, prefix (sorted keys + bisect) and substring (trigram
+    postings) queries without scanning every key.
+    """
+
+    GRAM = 3
+
+    def __init__(self):
+        self._ids_by_key: Dict[str, Set[str]] = {}
+        self._keys_by_id: Dict[str, Set[str]] = {}
+        self._sorted_keys: List[str] = []
+        self._keys_by_gram: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys_by_id)
+
+    def _grams(self, key: str) -> Set[str]:
+        return {key[i:i + self.GRAM] for i in range(len(key) - self.GRAM + 1)}
+
+    def add(self, obj_id: str, keys: Iterable[str]) -> None:
+        """Index obj_id under each key (replaces keys previously indexed for it)."""
+        self.remove(obj_id)
+        lowered = {k.lower() for k in keys if k}
+        self._keys_by_id[obj_id] = lowered
+        for key in lowered:
+            ids = self._ids_by_key.get(key)
+            if ids is None:
+                ids = self._ids_by_key[key] = set()
+                bisect.insort(self._sorted_keys, key)
+                for gram in self._grams(key):
+                    self._keys_by_gram.setdefault(gram, set()).add(key)
+            ids.add(obj_id)
+
+    def remove(self, obj_id: str) -> None:
+        """Drop obj_id and any keys no longer pointing at an object."""
+        for key in self._keys_by_id.pop(obj_id, ()):
+            ids = self._ids_by_key.get(key)
+            if ids is None:
+                continue
+            ids.discard(obj_id)
+            if ids:
+                continue
+            del self._ids_by_key[key]
+            pos = bisect.bisect_left(self._sorted_keys, key)
+            if pos < len(self._sorted_keys) and self._sorted_keys[pos] == key:
+                del self._sorted_keys[pos]
+            for gram in self._grams(key):
+                keys = self._keys_by_gram.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._keys_by_gram[gram]
+
+    def clear(self) -> None:
+        self._ids_by_key.clear()
+        self._keys_by_id.clear()
+        self._sorted_keys.clear()
+        self._keys_by_gram.clear()
+
+    def keys(self, obj_id: str) -> Set[str]:
+        return set(self._keys_by_id.get(obj_id, ()))
+
+    def exact(self, query: str) -> Set[str]:
+        return set(self._ids_by_key.get(query.lower(), ()))
+
+    def prefix(self, query: str) -> Set[str]:
+        query = query.lower()
+        result: Set[str] = set()
+        pos = bisect.bisect_left(self._sorted_keys, query)
+        while pos < len(self._sorted_keys) and self._sorted_keys[pos].startswith(query):
+            result |= self._ids_by_key[self._sorted_keys[pos]]
+            pos += 1
+        return result
+
+    def substring(self, query: str) -> Set[str]:
+        query = query.lower()
+        if len(query) < self.GRAM:
+            candidates: Iterable[str] = self._sorted_keys
+        else:
+            postings = sorted(
+                (self._keys_by_gram.get(gram, set()) for gram in self._grams(query)),
+                key=len,
+            )
+            candidates = set.intersection(*postings) if postings else set()
+        result: Set[str] = set()
+        for key in candidates:
+            if query in key:
+                result |= self._ids_by_key[key]
+        return result
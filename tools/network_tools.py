@@ -1,5 +1,14 @@
 import docker
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Union
+
+from .docker_client import ClientRegistry, get_registry
+from .listing import glob_regex, label_selectors, labels_match, name_hint, paginate, validate_fields
+from .metrics import instrument_tools
+from .object_cache import get_object_cache, mark_changed
+
+
+NETWORK_LIST_FIELDS = ("id", "name", "driver", "scope", "internal", "containers")
 
 
 class NetworkTools:
@@ -7,31 +16,85 @@ class NetworkTools:
     Helper class for Docker network operations.
     """
     
-    def __init__(self):
-        """Initialize Docker client. Handles connection errors."""
-        try:
-            self.client = docker.from_env()
-            self.client.ping()
-        except docker.errors.DockerException as e:
-            raise RuntimeError(f"Docker connection failed: {str(e)}")
+    def __init__(self, registry: Optional[ClientRegistry] = None):
+        """Attach to the shared Docker client. Handles connection errors."""
+        self._registry = registry or get_registry()
+        self._registry.acquire()
+        instrument_tools(self, self._registry)
+    
+    @property
+    def client(self) -> docker.DockerClient:
+        """Shared Docker client (follows reconnects of the registry)."""
+        return self._registry.get()
     
-    def get_network_list(self) -> List[Dict[str, Any]]:
-        """Get list of all networks as JSON-serializable dictionaries."""
+    def get_network_list(
+        self,
+        labels: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        dangling: Optional[bool] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get list of all networks as JSON-serializable dictionaries.
+        
+        Args:
+            labels: Only networks with these labels ("key" or "key=value", all must match)
+            name: Only networks whose name matches this glob (e.g. "app_*")
+            dangling: True for unused user-defined networks only, False for the others
+            sort_by: Field to sort by (id, name, driver, scope, internal, containers)
+            descending: Sort in descending order
+            limit: Maximum number of networks to return (enables pagination)
+            cursor: next_cursor from the previous page
+            fields: Fields to include in each entry (default: all)
+        
+        Returns:
+            List of network dictionaries, or with limit/cursor a dictionary with
+            items, next_cursor (None on the last page), total and as_of
+            (nanoseconds since the epoch: the listing reflects every change before it)
+        """
+        selectors = label_selectors(labels)
+        validate_fields(NETWORK_LIST_FIELDS, sort_by, fields)
+        pattern = glob_regex(name) if name else None
+        as_of = time.time_ns()
         try:
-            networks = self.client.networks.list()
-            return [
+            cache = get_object_cache(self._registry)
+            # Listings do not say which containers use a network; the daemon answers dangling.
+            snapshot = cache.snapshot("network") if cache and dangling is None else None
+            if snapshot is not None:
+                networks, as_of = snapshot
+            else:
+                filters: Dict[str, Any] = {}
+                if selectors:
+                    filters["label"] = selectors
+                hint = name_hint(name) if name else None
+                if hint:
+                    filters["name"] = hint
+                if dangling is not None:
+                    filters["dangling"] = dangling
+                networks = self.client.api.networks(filters=filters or None)
+            summaries = [
                 {
-                    "id": network.id,
-                    "name": network.name,
-                    "driver": network.attrs.get("Driver", "unknown"),
-                    "scope": network.attrs.get("Scope", "unknown"),
-                    "internal": network.attrs.get("Internal", False),
-                    "containers": list(network.attrs.get("Containers", {}).keys()),
+                    "id": network["Id"],
+                    "name": network["Name"],
+                    "driver": network.get("Driver", "unknown"),
+                    "scope": network.get("Scope", "unknown"),
+                    "internal": network.get("Internal", False),
+                    "containers": list((network.get("Containers") or {}).keys()),
                 }
                 for network in networks
+                if labels_match(network.get("Labels"), selectors)
+                and (pattern is None or pattern.fullmatch(network["Name"]))
             ]
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to list networks: {str(e)}")
+        return paginate(
+            summaries, "id", NETWORK_LIST_FIELDS,
+            sort_by=sort_by, descending=descending, limit=limit, cursor=cursor, fields=fields, as_of=as_of,
+        )
     
     def _find_network(self, network_identifier: str):
         """
@@ -69,12 +132,14 @@ class NetworkTools:
             network_identifier: Network ID, full name, or partial name
         """
         try:
-            network = self._find_network(network_identifier)
-            attrs = network.attrs
+            cache = get_object_cache(self._registry)
+            attrs = cache.lookup("network", network_identifier) if cache else None
+            if attrs is None:
+                attrs = self._find_network(network_identifier).attrs
             
             # Get connected containers info
             containers_info = []
-            for container_id, container_data in attrs.get("Containers", {}).items():
+            for container_id, container_data in (attrs.get("Containers") or {}).items():
                 containers_info.append({
                     "id": container_id,
                     "name": container_data.get("Name", ""),
@@ -83,8 +148,8 @@ class NetworkTools:
                 })
             
             return {
-                "id": network.id,
-                "name": network.name,
+                "id": attrs["Id"],
+                "name": attrs["Name"],
                 "driver": attrs.get("Driver", "unknown"),
                 "scope": attrs.get("Scope", "unknown"),
                 "internal": attrs.get("Internal", False),
@@ -124,6 +189,7 @@ class NetworkTools:
                 attachable=attachable,
                 labels=labels or {}
             )
+            mark_changed(self._registry, "network", network.id)
             
             return {
                 "id": network.id,
@@ -152,6 +218,7 @@ class NetworkTools:
             network_id = network.id
             
             network.remove()
+            mark_changed(self._registry, "network", network_id)
             
             return {
                 "id": network_id,
@@ -199,6 +266,8 @@ class NetworkTools:
                 network.connect(container, ipv4_address=ipv4_address)
             else:
                 network.connect(container)
+            mark_changed(self._registry, "network", network.id)
+            mark_changed(self._registry, "container", container.id)
             
             return {
                 "network": network.name,
@@ -242,6 +311,8 @@ class NetworkTools:
                 raise ValueError(f"Container '{container_identifier}' not found")
             
             network.disconnect(container, force=force)
+            mark_changed(self._registry, "network", network.id)
+            mark_changed(self._registry, "container", container.id)
             
             return {
                 "network": network.name,
@@ -268,6 +339,7 @@ class NetworkTools:
         """
         try:
             result = self.client.networks.prune()
+            mark_changed(self._registry, "network")
             
             return {
                 "networks_deleted": result.get("NetworksDeleted", []) or [],
@@ -278,6 +350,7 @@ class NetworkTools:
             raise RuntimeError(f"Failed to prune networks: {str(e)}")
     
     def close(self):
-        """Close Docker client connection."""
-        if hasattr(self, "client"):
-            self.client.close()
+        """Release the shared Docker client connection."""
+        if getattr(self, "_registry", None) is not None:
+            self._registry.release()
+            self._registry = None
\ No newline at end of file
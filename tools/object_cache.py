@@ -0,0 +1,265 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import docker
+
+
+KINDS = ("container", "image", "network", "volume")
+
+# Container actions that do not change what a listing or inspect returns.
+_PASSIVE_CONTAINER_ACTIONS = {
+    "attach", "detach", "commit", "copy", "export", "resize", "top",
+    "archive-path", "extract-to-dir",
+    "exec_create", "exec_start", "exec_detach", "exec_die",
+}
+
+# More dirty objects than this are reloaded with one full listing instead.
+MAX_TARGETED_REFRESH = 50
+
+
+class _Table:
+    """Cached listing and inspect results for one object kind."""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self.dirty: Set[str] = set()
+        self.stale = True
+        self.loaded_ns = 0
+        # Bumped by every event touching the table; guards inspect results
+        # fetched while an event for the same object arrived.
+        self.version = 0
+        self.refresh_lock = threading.Lock()
+
+
+class ObjectCache:
+    """
+    In-process copy of the daemon's container, image, network and volume
+    listings (plus inspect results fetched on demand), kept current from
+    the /events stream.
+
+    Events only mark objects dirty; the next read refreshes them with one
+    filtered listing (images, whose events do not map to listing entries,
+    are relisted). A read therefore reflects every event received before it
+    started, and returns that point as ``as_of`` (nanoseconds since the
+    epoch). While the event stream is disconnected the cache is invalidated
+    and reads return None, so callers fall back to a fresh API call.
+
+    The tools also report their own writes (mark_changed()), so a read right
+    after a write sees it without waiting for the daemon's event.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._tables = {kind: _Table() for kind in KINDS}
+        self._generation = 0
+        self._last_event_ns = 0
+        self._hub = registry.event_hub()
+        self._token = self._hub.subscribe(self._on_event, types=KINDS, on_reset=self._invalidate)
+
+    def snapshot(self, kind: str) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Listing entries of kind (as returned by the Engine API list endpoint)
+        and the as_of timestamp they reflect, or None if the cache is unavailable.
+        Entries are shared; callers must not modify them.
+        """
+        if not self._hub.connected:
+            return None
+        table = self._tables[kind]
+        as_of = self._sync(kind, table)
+        if as_of is None:
+            return None
+        with self._lock:
+            return list(table.entries.values()), as_of
+
+    def lookup(self, kind: str, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Inspect result of the single object matching identifier (exact name,
+        tag or ID, then ID prefix, then substring), or None if the cache is
+        unavailable or the identifier is ambiguous or unknown; callers then
+        resolve it through the API, which also produces the error messages.
+        """
+        snapshot = self.snapshot(kind)
+        if snapshot is None:
+            return None
+        key = _match(kind, snapshot[0], identifier)
+        if key is None:
+            return None
+        table = self._tables[kind]
+        with self._lock:
+            attrs = table.details.get(key)
+            if attrs is not None:
+                return attrs
+            version, generation = table.version, self._generation
+        try:
+            attrs = self._inspect(kind, key)
+        except docker.errors.NotFound:
+            return None
+        with self._lock:
+            if table.version == version and self._generation == generation:
+                table.details[key] = attrs
+        return attrs
+
+    def invalidate(self, kind: str, key: Optional[str] = None) -> None:
+        """Refresh key (or every object of kind) on the next read."""
+        with self._lock:
+            if key is None or kind == "image":
+                self._mark_stale(kind)
+            else:
+                self._touch(kind, key)
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self._token)
+        self._invalidate()
+
+    def _sync(self, kind: str, table: _Table) -> Optional[int]:
+        """Apply pending invalidations to table; returns as_of, or None on failure."""
+        # One refresher per table; concurrent readers wait and reuse its result.
+        with table.refresh_lock:
+            with self._lock:
+                generation = self._generation
+                as_of = self._last_event_ns
+                full = table.stale or len(table.dirty) > MAX_TARGETED_REFRESH
+                dirty, table.dirty = table.dirty, set()
+                if not full and not dirty:
+                    return max(as_of, table.loaded_ns)
+                # Cleared before fetching, so an invalidation that arrives meanwhile sticks.
+                table.stale = False
+            started_ns = time.time_ns()
+            try:
+                fetched = self._list(kind, None if full else dirty)
+            except Exception:
+                with self._lock:
+                    table.stale = True
+                return None
+            with self._lock:
+                if self._generation != generation:
+                    return None
+                if full:
+                    table.entries = {_key(kind, entry): entry for entry in fetched}
+                    table.details = {k: v for k, v in table.details.items() if k in table.entries}
+                    table.loaded_ns = started_ns
+                else:
+                    for key in dirty:
+                        table.entries.pop(key, None)
+                    for entry in fetched:
+                        table.entries[_key(kind, entry)] = entry
+                return max(as_of, table.loaded_ns)
+
+    def _list(self, kind: str, keys: Optional[Set[str]]) -> List[Dict[str, Any]]:
+        """List all objects of kind, or only those in keys (one request either way)."""
+        api = self._registry.get().api
+        if kind == "container":
+            return api.containers(all=True, filters={"id": sorted(keys)} if keys else None)
+        if kind == "image":
+            return api.images()
+        if kind == "network":
+            return api.networks(ids=sorted(keys)) if keys else api.networks()
+        entries = api.volumes(filters={"name": sorted(keys)} if keys else None).get("Volumes") or []
+        # The name filter matches substrings; other hits are fresh too, but keep it tight.
+        return [v for v in entries if keys is None or v["Name"] in keys]
+
+    def _inspect(self, kind: str, key: str) -> Dict[str, Any]:
+        api = self._registry.get().api
+        if kind == "container":
+            return api.inspect_container(key)
+        if kind == "image":
+            return api.inspect_image(key)
+        if kind == "network":
+            return api.inspect_network(key)
+        return api.inspect_volume(key)
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            for table in self._tables.values():
+                table.entries = {}
+                table.details = {}
+                table.dirty = set()
+                table.stale = True
+                table.version += 1
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        kind = event.get("Type", "")
+        actor = event.get("Actor") or {}
+        actor_id = actor.get("ID") or event.get("id", "")
+        action = (event.get("Action") or event.get("status", "")).split(":", 1)[0]
+        with self._lock:
+            if kind == "image":
+                # Pull/tag/untag/delete may change several entries; relist on next read.
+                self._mark_stale("image")
+            elif kind == "network":
+                self._touch("network", actor_id)
+                container_id = (actor.get("Attributes") or {}).get("container")
+                if container_id:
+                    self._touch("container", container_id)
+            elif kind == "volume":
+                if action in ("create", "destroy"):
+                    self._touch("volume", actor_id)
+            elif kind == "container" and action not in _PASSIVE_CONTAINER_ACTIONS:
+                self._touch("container", actor_id)
+            self._last_event_ns = event.get("timeNano") or event.get("time", 0) * 10**9
+
+    def _mark_stale(self, kind: str) -> None:
+        table = self._tables[kind]
+        table.stale = True
+        table.details = {}
+        table.version += 1
+
+    def _touch(self, kind: str, key: str) -> None:
+        if not key:
+            return
+        table = self._tables[kind]
+        table.dirty.add(key)
+        table.details.pop(key, None)
+        table.version += 1
+
+
+def _key(kind: str, entry: Dict[str, Any]) -> str:
+    return entry["Name"] if kind == "volume" else entry["Id"]
+
+
+def _names(kind: str, entry: Dict[str, Any]) -> List[str]:
+    if kind == "container":
+        return [name.lstrip("/") for name in (entry.get("Names") or [])[:1]]
+    if kind == "image":
+        return [tag for tag in (entry.get("RepoTags") or []) if tag != "<none>:<none>"]
+    return [entry.get("Name", "")]
+
+
+def _match(kind: str, entries: List[Dict[str, Any]], identifier: str) -> Optional[str]:
+    """Key of the one entry identifier refers to, following the tools' _find_* rules."""
+    query = identifier.lower()
+    bare = query.split(":", 1)[1] if query.startswith("sha256:") else query
+    exact, by_id, partial = [], [], []
+    for entry in entries:
+        key = _key(kind, entry)
+        names = [name.lower() for name in _names(kind, entry)]
+        entry_id = entry.get("Id", "").lower()
+        short_id = entry_id.split(":", 1)[-1]
+        if query in names or query == entry_id or (kind == "image" and query + ":latest" in names):
+            exact.append(key)
+        elif entry_id and bare and short_id.startswith(bare):
+            by_id.append(key)
+        elif any(query in name for name in names) or query in entry_id:
+            partial.append(key)
+    for matches in (exact, by_id, partial):
+        if matches:
+            return matches[0] if len(matches) == 1 else None
+    return None
+
+
+def get_object_cache(registry) -> Optional[ObjectCache]:
+    """Shared object cache for registry, or None when event-driven caches are disabled."""
+    if not registry.events_enabled():
+        return None
+    return registry.service("object_cache", lambda: ObjectCache(registry))
+
+
+def mark_changed(registry, kind: str, key: Optional[str] = None) -> None:
+    """Tell the shared object cache, if enabled, that a tool changed key (or objects of kind)."""
+    cache = get_object_cache(registry)
+    if cache is not None:
+        cache.invalidate(kind, key)
@@ -0,0 +1,174 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .name_index import NameIndex
+
+
+class ContainerResolver:
+    """
+    In-memory index of container names and IDs, kept current from the
+    daemon's /events stream, so partial-name lookups need no API call.
+
+    The index is only trusted while the event stream is connected; when it
+    drops the index is invalidated and resolve() returns None, telling the
+    caller to fall back to listing containers from the daemon.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        # Names get substring lookups; IDs only prefix lookups, since trigrams
+        # of random hex would bloat the postings.
+        self._index = NameIndex()
+        self._ids: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+        # Events received while the initial listing is in flight; replayed on top of it.
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._hub = registry.event_hub()
+        self._token = self._hub.subscribe(
+            self._on_event, types=("container",), on_reset=self._invalidate
+        )
+
+    def resolve(self, identifier: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Return (id, name) pairs matching identifier, or None if the index is
+        unavailable. An exact name wins; otherwise any container whose ID
+        starts with, or whose name contains, identifier (case-insensitive)
+        matches.
+        """
+        if not self._hub.connected:
+            return None
+        if not self._ready:
+            self._build()
+        with self._lock:
+            if not self._ready:
+                return None
+            ids = self._index.exact(identifier) or (
+                self._id_prefix(identifier) | self._index.substring(identifier)
+            )
+            return sorted(((i, self._names[i]) for i in ids), key=lambda match: match[1])
+
+    def note(self, container_id: str, name: str) -> None:
+        """Record a container a tool just created or renamed, ahead of its event."""
+        self._on_event({
+            "Type": "container",
+            "Action": "create",
+            "Actor": {"ID": container_id, "Attributes": {"name": name}},
+        })
+
+    def discard(self, container_id: str) -> None:
+        """Forget a container the daemon no longer knows about."""
+        with self._lock:
+            self._remove(container_id)
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self._token)
+        self._invalidate()
+
+    def _build(self) -> None:
+        with self._lock:
+            if self._ready or self._pending is not None:
+                return
+            self._pending = []
+        try:
+            containers = self._registry.get().api.containers(all=True)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            return
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is None:
+                # Invalidated while listing; the snapshot may have missed events.
+                return
+            self._index.clear()
+            self._ids.clear()
+            self._names.clear()
+            for container in containers:
+                names = container.get("Names") or []
+                name = names[0].lstrip("/") if names else container["Id"][:12]
+                self._add(container["Id"], name)
+            for event in pending:
+                self._apply(event)
+            self._ready = True
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._pending = None
+            self._index.clear()
+            self._ids.clear()
+            self._names.clear()
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            elif self._ready:
+                self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        actor = event.get("Actor") or {}
+        container_id = actor.get("ID") or event.get("id")
+        if not container_id:
+            return
+        action = event.get("Action") or event.get("status", "")
+        if action in ("create", "rename"):
+            name = (actor.get("Attributes") or {}).get("name", "").lstrip("/")
+            self._add(container_id, name or container_id[:12])
+        elif action == "destroy":
+            self._remove(container_id)
+
+    def _id_prefix(self, query: str) -> Set[str]:
+        query = query.lower()
+        result: Set[str] = set()
+        pos = bisect.bisect_left(self._ids, query)
+        while pos < len(self._ids) and self._ids[pos].startswith(query):
+            result.add(self._ids[pos])
+            pos += 1
+        return result
+
+    def _add(self, container_id: str, name: str) -> None:
+        if container_id not in self._names:
+            bisect.insort(self._ids, container_id)
+        self._names[container_id] = name
+        self._index.add(container_id, (name,))
+
+    def _remove(self, container_id: str) -> None:
+        if self._names.pop(container_id, None) is not None:
+            pos = bisect.bisect_left(self._ids, container_id)
+            if pos < len(self._ids) and self._ids[pos] == container_id:
+                del self._ids[pos]
+        self._index.remove(container_id)
+
+
+def is_exact(matches: List[Tuple[str, str]], identifier: str) -> bool:
+    """
+    True if matches is a single exact name or full-ID hit for identifier. Only
+    those are trusted without asking the daemon: the index can lag it, so a
+    partial hit may stand in for a container whose create event is in flight.
+    """
+    return len(matches) == 1 and identifier in matches[0]
+
+
+def get_container_resolver(registry) -> Optional[ContainerResolver]:
+    """Shared resolver for registry, or None when event-driven caches are disabled."""
+    if not registry.events_enabled():
+        return None
+    return registry.service("container_resolver", lambda: ContainerResolver(registry))
+
+
+def note_container(registry, container_id: str, name: Optional[str] = None) -> None:
+    """
+    Tell the shared resolver, if enabled, that a tool created or renamed a
+    container (name) or removed it (name None), ahead of the daemon's event.
+    """
+    resolver = get_container_resolver(registry)
+    if resolver is None:
+        return
+    if name is None:
+        resolver.discard(container_id)
+    else:
+        resolver.note(container_id, name)
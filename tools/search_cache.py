@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+
+Results = List[Dict[str, Any]]
+
+
+class SearchCache:
+    """
+    TTL cache of registry search results keyed by (term, limit).
+
+    Concurrent identical searches are coalesced: the first caller queries
+    the registry and the others wait for its result. A fresh entry for the
+    same term with a larger limit also answers a smaller one, since search
+    results are ranked. Failed searches are not cached; every caller waiting
+    on one gets its error.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl: Seconds a result stays fresh (default: DOCKER_MCP_SEARCH_TTL or 300)
+            max_entries: Cached (term, limit) pairs kept; least recently used are dropped
+            clock: Monotonic time source (for tests)
+        """
+        if ttl is None:
+            ttl = float(os.environ.get("DOCKER_MCP_SEARCH_TTL", DEFAULT_TTL))
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Results]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, term: str, limit: int, fetch: Callable[[], Results]) -> Results:
+        """Results for (term, limit), calling fetch() only if no fresh or in-flight result exists."""
+        key = (term.strip().lower(), limit)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return _copy(cached)
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return _copy(future.result())
+        try:
+            results = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(results)
+        return _copy(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+    def _lookup(self, key: Tuple[str, int]) -> Optional[Results]:
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        term, limit = key
+        for (other_term, other_limit), (expires, results) in self._entries.items():
+            # Results are ranked, so a larger search starts with the smaller one.
+            if other_term == term and other_limit > limit and expires > now:
+                return results[:limit]
+        return None
+
+
+def _copy(results: Results) -> Results:
+    return [dict(result) for result in results]
+
+
+def get_search_cache(registry) -> Optional[SearchCache]:
+    """Shared search cache for registry, or None when disabled (DOCKER_MCP_SEARCH_TTL=0)."""
+    cache = registry.service("search_cache", SearchCache)
+    return cache if cache.ttl > 0 else None
@@ -0,0 +1,215 @@
+"""
+MCP server exposing the Docker tool classes.
+
+    python -m tools.server                        # stdio (default)
+    python -m tools.server --transport sse --port 8000
+
+Tool calls are dispatched concurrently: each runs on the shared ToolExecutor
+(see async_tools) under a cap on in-flight calls, with a smaller separate cap
+for compose commands so a slow `compose up` cannot take every slot.
+
+With --metrics (or DOCKER_MCP_METRICS=1) tool calls are instrumented and a
+get_metrics tool is added; HTTP transports also serve OpenMetrics text at
+/metrics.
+"""
+import argparse
+import asyncio
+import functools
+import inspect
+import os
+from typing import Any, Callable, List, Optional
+
+try:
+    from mcp.server.fastmcp import FastMCP
+except ImportError:  # optional dependency
+    FastMCP = None
+
+from .async_tools import (
+    AsyncComposeTools,
+    AsyncContainerTools,
+    AsyncImageTools,
+    AsyncNetworkTools,
+    AsyncTools,
+    AsyncVolumeTools,
+    ToolExecutor,
+)
+from .docker_client import ClientRegistry, get_registry
+from .metrics import get_metrics, get_metrics_collector, render_openmetrics
+
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_MAX_COMPOSE_IN_FLIGHT = 4
+
+# Public methods that are not MCP tools (lifecycle helpers and generators).
+_EXCLUDED = {
+    "close", "start_background_detection", "stream_container_logs", "stream_exec", "iter_pull_progress",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _exposed_signature(method: Callable) -> inspect.Signature:
+    """Signature of a bound tool method without callback parameters (not JSON-serializable)."""
+    signature = inspect.signature(method)
+    params = [p for p in signature.parameters.values() if "Callable" not in str(p.annotation)]
+    return signature.replace(parameters=params)
+
+
+class DockerMCPServer:
+    """
+    Registers every public method of the five tool classes as an MCP tool,
+    all sharing one Docker client (the registry) and one worker pool.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[ClientRegistry] = None,
+        max_in_flight: Optional[int] = None,
+        max_compose_in_flight: Optional[int] = None,
+        call_timeout: Optional[float] = None,
+        name: str = "docker",
+        **settings: Any,
+    ):
+        """
+        Args:
+            registry: Shared client registry (default: the process-wide one)
+            max_in_flight: Concurrent tool calls (default: DOCKER_MCP_MAX_IN_FLIGHT or 16)
+            max_compose_in_flight: Concurrent compose calls, within max_in_flight
+                                   (default: DOCKER_MCP_MAX_COMPOSE_IN_FLIGHT or 4)
+            call_timeout: Per-call timeout in seconds (default: DOCKER_MCP_CALL_TIMEOUT or none)
+            name: MCP server name
+            settings: Extra FastMCP settings (e.g. host, port)
+        """
+        if FastMCP is None:
+            raise RuntimeError("The MCP server requires the 'mcp' package (pip install mcp)")
+        if max_in_flight is None:
+            max_in_flight = _env_int("DOCKER_MCP_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)
+        if max_compose_in_flight is None:
+            max_compose_in_flight = _env_int("DOCKER_MCP_MAX_COMPOSE_IN_FLIGHT", DEFAULT_MAX_COMPOSE_IN_FLIGHT)
+        if call_timeout is None and os.environ.get("DOCKER_MCP_CALL_TIMEOUT"):
+            call_timeout = float(os.environ["DOCKER_MCP_CALL_TIMEOUT"])
+        if max_in_flight < 1 or max_compose_in_flight < 1:
+            raise ValueError("In-flight limits must be >= 1")
+        self.registry = registry or get_registry()
+        self.max_in_flight = max_in_flight
+        self.max_compose_in_flight = min(max_compose_in_flight, max_in_flight)
+        # One worker per in-flight slot, so admitted calls never queue for a thread.
+        self.executor = self.registry.service("tool_executor", lambda: ToolExecutor(max_in_flight))
+        self.mcp = FastMCP(name, **settings)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._compose_slots: Optional[asyncio.Semaphore] = None
+        self.facades: List[AsyncTools] = [
+            cls(self.registry, self.executor, default_timeout=call_timeout)
+            for cls in (AsyncContainerTools, AsyncImageTools, AsyncNetworkTools, AsyncVolumeTools)
+        ]
+        self.facades.append(AsyncComposeTools(
+            self.registry, self.executor, default_timeout=call_timeout,
+            tools=AsyncComposeTools.tools_class(self.registry, detect_in_background=True),
+        ))
+        self.tool_names: List[str] = []
+        for facade in self.facades:
+            self._register(facade, compose=isinstance(facade, AsyncComposeTools))
+        if get_metrics_collector(self.registry) is not None:
+            self._register_metrics()
+
+    def _semaphores(self):
+        # Created lazily so they bind to the loop FastMCP runs.
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._compose_slots = asyncio.Semaphore(self.max_compose_in_flight)
+        return self._slots, self._compose_slots
+
+    def _register(self, facade: AsyncTools, compose: bool) -> None:
+        # Inspect the class, not the instance, so properties (e.g. client) are not evaluated.
+        for name, _ in inspect.getmembers(type(facade.sync), inspect.isfunction):
+            if name.startswith("_") or name in _EXCLUDED:
+                continue
+            method = getattr(facade.sync, name)
+            self.mcp.add_tool(self._tool(facade, name, method, compose), name=name)
+            self.tool_names.append(name)
+
+    def _tool(self, facade: AsyncTools, name: str, method: Callable, compose: bool) -> Callable:
+        call = getattr(facade, name)
+
+        @functools.wraps(method)
+        async def tool(**kwargs):
+            slots, compose_slots = self._semaphores()
+            if compose:
+                async with compose_slots, slots:
+                    return await call(**kwargs)
+            async with slots:
+                return await call(**kwargs)
+
+        tool.__signature__ = _exposed_signature(method)
+        del tool.__wrapped__
+        return tool
+
+    def _register_metrics(self) -> None:
+        registry = self.registry
+
+        def metrics(openmetrics: bool = False) -> Any:
+            """
+            Tool call latency histograms and Docker API request counts/bytes per endpoint.
+
+            Args:
+                openmetrics: Return OpenMetrics text instead of a dictionary
+            """
+            return render_openmetrics(registry) if openmetrics else get_metrics(registry)
+
+        self.mcp.add_tool(metrics, name="get_metrics")
+        self.tool_names.append("get_metrics")
+        custom_route = getattr(self.mcp, "custom_route", None)
+        if custom_route is None:
+            return
+
+        @custom_route("/metrics", methods=["GET"])
+        async def metrics_endpoint(request):
+            from starlette.responses import PlainTextResponse
+
+            return PlainTextResponse(
+                render_openmetrics(registry),
+                media_type="application/openmetrics-text; version=1.0.0; charset=utf-8",
+            )
+
+    def run(self, transport: str = "stdio") -> None:
+        """Serve until the transport closes ("stdio", "sse" or "streamable-http")."""
+        try:
+            self.mcp.run(transport=transport)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for facade in self.facades:
+            facade.close()
+        self.facades = []
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Docker MCP server")
+    parser.add_argument("--transport", choices=("stdio", "sse", "streamable-http"), default="stdio")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address for HTTP transports")
+    parser.add_argument("--port", type=int, default=8000, help="Port for HTTP transports")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Concurrent tool calls")
+    parser.add_argument("--max-compose-in-flight", type=int, default=None, help="Concurrent compose calls")
+    parser.add_argument("--call-timeout", type=float, default=None, help="Per-call timeout in seconds")
+    parser.add_argument("--metrics", action="store_true", help="Instrument tool calls (get_metrics tool, /metrics)")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        os.environ["DOCKER_MCP_METRICS"] = "1"
+    try:
+        server = DockerMCPServer(
+            max_in_flight=args.max_in_flight,
+            max_compose_in_flight=args.max_compose_in_flight,
+            call_timeout=args.call_timeout,
+            host=args.host,
+            port=args.port,
+        )
+    except (RuntimeError, ValueError) as e:
+        raise SystemExit(str(e))
+    server.run(args.transport)
+
+
+if __name__ == "__main__":
+    main()
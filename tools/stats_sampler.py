@@ -0,0 +1,249 @@
+import logging
+import math
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("timestamp", "cpu_percent", "memory_usage", "memory_limit", "rx_bytes", "tx_bytes")
+DEFAULT_RETENTION = 300
+# Samples older than this are not served as current (the stream may be reconnecting).
+MAX_SAMPLE_AGE = 5.0
+
+
+def calculate_cpu_percent(stats: Dict[str, Any]) -> float:
+    """Calculate CPU usage percentage from a stats sample."""
+    try:
+        cpu_delta = (
+            stats["cpu_stats"]["cpu_usage"]["total_usage"]
+            - stats.get("precpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0)
+        )
+        system_delta = (
+            stats["cpu_stats"]["system_cpu_usage"]
+            - stats.get("precpu_stats", {}).get("system_cpu_usage", 0)
+        )
+        if system_delta > 0:
+            return (cpu_delta / system_delta) * 100.0
+        return 0.0
+    except (KeyError, TypeError, ZeroDivisionError):
+        return 0.0
+
+
+class StatsRing:
+    """
+    Fixed-capacity ring buffer of stats samples.
+
+    Samples are stored row-major in a single array('d') of
+    capacity * len(FIELDS) floats, so memory does not grow with uptime.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Stats retention must be >= 1 sample")
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity * len(FIELDS)))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, values) -> None:
+        base = self._next * len(FIELDS)
+        self._data[base:base + len(FIELDS)] = array("d", values)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _rows(self):
+        """Row offsets from oldest to newest."""
+        start = (self._next - self._count) % self.capacity
+        for i in range(self._count):
+            yield ((start + i) % self.capacity) * len(FIELDS)
+
+    def column(self, field: str, since: Optional[float] = None) -> List[float]:
+        """Values of one field, oldest first, optionally only samples newer than since."""
+        col = FIELDS.index(field)
+        return [
+            self._data[row + col]
+            for row in self._rows()
+            if since is None or self._data[row] >= since
+        ]
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if not self._count:
+            return None
+        base = ((self._next - 1) % self.capacity) * len(FIELDS)
+        return dict(zip(FIELDS, self._data[base:base + len(FIELDS)]))
+
+
+def _rollup(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"min": 0.0, "avg": 0.0, "max": 0.0, "p95": 0.0}
+    ordered = sorted(values)
+    p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+    return {
+        "min": ordered[0],
+        "avg": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+        "p95": p95,
+    }
+
+
+class _Watch:
+    def __init__(self, container_id: str, retention: int):
+        self.container_id = container_id
+        self.ring = StatsRing(retention)
+        self.networks: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.stream = None
+        self.thread: Optional[threading.Thread] = None
+
+
+class StatsSampler:
+    """
+    Background stats collector: one streaming /stats connection per watched
+    container, feeding a per-container StatsRing so reads are served from
+    memory instead of a blocking stats(stream=False) call.
+    """
+
+    def __init__(self, registry, retention: int = DEFAULT_RETENTION):
+        self._registry = registry
+        self.retention = retention
+        self._watches: Dict[str, _Watch] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, container_id: str, retention: Optional[int] = None) -> None:
+        """Start sampling container_id (no-op if already watched with the same retention)."""
+        retention = retention or self.retention
+        with self._lock:
+            existing = self._watches.get(container_id)
+            if existing is not None and existing.ring.capacity == retention:
+                return
+            if existing is not None:
+                self._stop_watch(existing)
+            w = _Watch(container_id, retention)
+            w.thread = threading.Thread(
+                target=self._run, args=(w,), name=f"stats-{container_id[:12]}", daemon=True
+            )
+            self._watches[container_id] = w
+            w.thread.start()
+
+    def unwatch(self, container_id: str) -> bool:
+        with self._lock:
+            w = self._watches.pop(container_id, None)
+        if w is None:
+            return False
+        self._stop_watch(w)
+        return True
+
+    def watched(self) -> List[str]:
+        with self._lock:
+            return list(self._watches)
+
+    def is_watched(self, container_id: str) -> bool:
+        with self._lock:
+            return container_id in self._watches
+
+    def latest(self, container_id: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Most recent sample for container_id, or None if none has arrived yet
+        or it is older than max_age seconds.
+        """
+        with self._lock:
+            w = self._watches.get(container_id)
+        if w is None:
+            return None
+        with w.lock:
+            sample = w.ring.latest()
+            if sample is None:
+                return None
+            if max_age is not None and time.time() - sample["timestamp"] > max_age:
+                return None
+            sample["networks"] = w.networks
+            return sample
+
+    def summary(self, container_id: str, window_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """min/avg/max/p95 of every metric over the retained (or windowed) samples."""
+        with self._lock:
+            w = self._watches.get(container_id)
+        if w is None:
+            return None
+        since = time.time() - window_seconds if window_seconds else None
+        with w.lock:
+            timestamps = w.ring.column("timestamp", since)
+            metrics = {
+                field: _rollup(w.ring.column(field, since))
+                for field in FIELDS if field != "timestamp"
+            }
+        return {
+            "samples": len(timestamps),
+            "retention": w.ring.capacity,
+            "from": timestamps[0] if timestamps else None,
+            "to": timestamps[-1] if timestamps else None,
+            "metrics": metrics,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            watches, self._watches = list(self._watches.values()), {}
+        for w in watches:
+            self._stop_watch(w)
+
+    def _stop_watch(self, w: _Watch) -> None:
+        w.stop.set()
+        stream = w.stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _run(self, w: _Watch) -> None:
+        backoff = 1.0
+        while not w.stop.is_set():
+            try:
+                w.stream = self._registry.get().api.stats(w.container_id, stream=True, decode=True)
+                for stats in w.stream:
+                    if w.stop.is_set():
+                        break
+                    self._record(w, stats)
+                    backoff = 1.0
+            except docker.errors.NotFound:
+                logger.debug("Stopped sampling removed container %s", w.container_id)
+                with self._lock:
+                    if self._watches.get(w.container_id) is w:
+                        del self._watches[w.container_id]
+                return
+            except Exception as e:
+                if not w.stop.is_set():
+                    logger.debug("Stats stream for %s failed: %s", w.container_id, e)
+            finally:
+                w.stream = None
+            if w.stop.wait(backoff):
+                return
+            backoff = min(backoff * 2, 30.0)
+
+    def _record(self, w: _Watch, stats: Dict[str, Any]) -> None:
+        memory = stats.get("memory_stats") or {}
+        networks = stats.get("networks") or {}
+        values = (
+            time.time(),
+            calculate_cpu_percent(stats),
+            memory.get("usage", 0) or 0,
+            memory.get("limit", 0) or 0,
+            sum(n.get("rx_bytes", 0) for n in networks.values()),
+            sum(n.get("tx_bytes", 0) for n in networks.values()),
+        )
+        with w.lock:
+            w.ring.append(values)
+            w.networks = networks
+
+
+def get_stats_sampler(registry) -> StatsSampler:
+    """Shared stats sampler for registry."""
+    return registry.service("stats_sampler", lambda: StatsSampler(registry))
@@ -0,0 +1,31 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket shared between threads, used to cap the combined bandwidth of
+    concurrent transfers. consume(n) blocks until n bytes fit under the rate;
+    callers may overdraw the bucket, which makes the next consumers wait
+    instead, so large reads need not be split.
+    """
+
+    def __init__(self, bytes_per_second: float, burst: Optional[float] = None):
+        if bytes_per_second <= 0:
+            raise ValueError("Bandwidth limit must be > 0")
+        self.rate = float(bytes_per_second)
+        self.burst = float(burst if burst is not None else bytes_per_second)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,255 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Container event action -> resulting status, for keeping usage entries current.
+_STATUS_BY_ACTION = {
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+    "kill": "exited",
+}
+
+# More dirty containers than this are reloaded with one full listing instead.
+MAX_TARGETED_REFRESH = 50
+
+
+def mount_entry(container_id: str, name: str, status: str, mount: Dict[str, Any]) -> Dict[str, Any]:
+    """Usage entry for one container mount, as returned by get_volume_usage."""
+    return {
+        "id": container_id,
+        "name": name,
+        "status": status,
+        "mount_destination": mount.get("Destination", ""),
+        "read_write": mount.get("RW", True),
+    }
+
+
+def usage_from_containers(containers: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-container mount records from /containers/json entries (which include Mounts):
+    {container_id: {"name", "status", "mounts"}}.
+    """
+    records = {}
+    for c in containers:
+        names = c.get("Names") or []
+        records[c["Id"]] = {
+            "name": names[0].lstrip("/") if names else c["Id"][:12],
+            "status": c.get("State", ""),
+            "mounts": c.get("Mounts") or [],
+        }
+    return records
+
+
+def containers_using(
+    records: Dict[str, Dict[str, Any]],
+    container_ids: Iterable[str],
+    volume_name: str,
+    mountpoint: str,
+) -> List[Dict[str, Any]]:
+    """Entries for the given containers' first mount of the volume (by name or host path)."""
+    result = []
+    for container_id in container_ids:
+        record = records.get(container_id)
+        if record is None:
+            continue
+        for mount in record["mounts"]:
+            if mount.get("Name") == volume_name or (mountpoint and mount.get("Source") == mountpoint):
+                result.append(mount_entry(container_id, record["name"], record["status"], mount))
+                break
+    return sorted(result, key=lambda entry: entry["name"])
+
+
+def usage_snapshot(
+    containers: Iterable[Dict[str, Any]],
+    mountpoints: Dict[str, str],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Usage of each volume in mountpoints ({name: mountpoint}) from one container
+    listing, in O(containers x mounts + volumes) instead of a scan per volume.
+    """
+    records = usage_from_containers(containers)
+    by_key: Dict[str, set] = {}
+    for container_id, record in records.items():
+        for mount in record["mounts"]:
+            for key in (mount.get("Name"), mount.get("Source")):
+                if key:
+                    by_key.setdefault(key, set()).add(container_id)
+    return {
+        name: containers_using(
+            records, by_key.get(name, set()) | by_key.get(mountpoint, set()), name, mountpoint
+        )
+        for name, mountpoint in mountpoints.items()
+    }
+
+
+class VolumeUsageIndex:
+    """
+    Reverse index volume -> containers, built from one container listing and
+    kept current from container and volume mount events.
+
+    Events only mark containers dirty (or update their status); the next
+    lookup re-reads all dirty containers with one filtered listing, so the
+    shared event thread never waits on the API. Like the container resolver,
+    it is only trusted while the event stream is connected; lookups return
+    None otherwise so callers fall back to a fresh listing.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_volume: Dict[str, set] = {}
+        self._by_source: Dict[str, set] = {}
+        self._ready = False
+        self._dirty: Set[str] = set()
+        # Events received while a listing is in flight; replayed on top of it.
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._hub = registry.event_hub()
+        self._token = self._hub.subscribe(
+            self._on_event, types=("container", "volume"), on_reset=self._invalidate
+        )
+
+    def usage(self, volume_name: str, mountpoint: str = "") -> Optional[List[Dict[str, Any]]]:
+        """Containers using a volume, or None when the index is unavailable."""
+        if not self._ensure_ready():
+            return None
+        with self._lock:
+            ids = set(self._by_volume.get(volume_name, ()))
+            if mountpoint:
+                ids |= self._by_source.get(mountpoint, set())
+            return containers_using(self._records, ids, volume_name, mountpoint)
+
+    def all_usage(self, mountpoints: Dict[str, str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Usage for every volume in mountpoints ({name: mountpoint}), or None if unavailable."""
+        if not self._ensure_ready():
+            return None
+        with self._lock:
+            result = {}
+            for name, mountpoint in mountpoints.items():
+                ids = set(self._by_volume.get(name, ()))
+                if mountpoint:
+                    ids |= self._by_source.get(mountpoint, set())
+                result[name] = containers_using(self._records, ids, name, mountpoint)
+            return result
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self._token)
+        self._invalidate()
+
+    def _ensure_ready(self) -> bool:
+        if not self._hub.connected:
+            return False
+        return self._sync()
+
+    def _sync(self) -> bool:
+        """Build the index or re-read dirty containers; returns False if it cannot be trusted now."""
+        with self._lock:
+            if self._ready and not self._dirty:
+                return True
+        # One refresher at a time; concurrent lookups wait and reuse its result.
+        with self._refresh_lock:
+            with self._lock:
+                if self._ready and not self._dirty:
+                    return True
+                full = not self._ready or len(self._dirty) > MAX_TARGETED_REFRESH
+                dirty, self._dirty = self._dirty, set()
+                self._pending = []
+            try:
+                filters = None if full else {"id": sorted(dirty)}
+                containers = self._registry.get().api.containers(all=True, filters=filters)
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                    self._dirty |= dirty
+                return False
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    # Invalidated while listing; the result may have missed events.
+                    return False
+                if full:
+                    self._clear()
+                else:
+                    for container_id in dirty:
+                        self._drop(container_id)
+                for container_id, record in usage_from_containers(containers).items():
+                    self._put(container_id, record)
+                self._ready = True
+                for event in pending:
+                    self._apply(event)
+                return not self._dirty
+
+    def _clear(self) -> None:
+        self._records.clear()
+        self._by_volume.clear()
+        self._by_source.clear()
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._dirty = set()
+            self._pending = None
+            self._clear()
+
+    def _on_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            elif self._ready:
+                self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        """Apply one event to the index (called with the lock held; no API calls)."""
+        actor = event.get("Actor") or {}
+        attributes = actor.get("Attributes") or {}
+        action = event.get("Action", "")
+        if event.get("Type") == "volume":
+            # mount events carry the container ID; pick up containers we missed.
+            container_id = attributes.get("container")
+            if action == "mount" and container_id and container_id not in self._records:
+                self._dirty.add(container_id)
+            return
+        container_id = actor.get("ID", "")
+        if not container_id:
+            return
+        if action in ("create", "rename", "update"):
+            self._dirty.add(container_id)
+        elif action == "destroy":
+            self._dirty.discard(container_id)
+            self._drop(container_id)
+        elif action in _STATUS_BY_ACTION:
+            record = self._records.get(container_id)
+            if record is not None:
+                record["status"] = _STATUS_BY_ACTION[action]
+
+    def _put(self, container_id: str, record: Dict[str, Any]) -> None:
+        self._drop(container_id)
+        self._records[container_id] = record
+        for mount in record["mounts"]:
+            if mount.get("Name"):
+                self._by_volume.setdefault(mount["Name"], set()).add(container_id)
+            if mount.get("Source"):
+                self._by_source.setdefault(mount["Source"], set()).add(container_id)
+
+    def _drop(self, container_id: str) -> None:
+        record = self._records.pop(container_id, None)
+        if record is None:
+            return
+        for mount in record["mounts"]:
+            for table, key in ((self._by_volume, mount.get("Name")), (self._by_source, mount.get("Source"))):
+                ids = table.get(key)
+                if ids is not None:
+                    ids.discard(container_id)
+                    if not ids:
+                        del table[key]
+
+
+def get_volume_usage_index(registry) -> Optional[VolumeUsageIndex]:
+    """Shared volume usage index for registry, or None when event-driven caches are disabled."""
+    if not registry.events_enabled():
+        return None
+    return registry.service("volume_usage_index", lambda: VolumeUsageIndex(registry))
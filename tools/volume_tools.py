@@ -1,5 +1,24 @@
 import docker
-from typing import List, Dict, Any, Optional
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
+
+from .chunk_store import ChunkStore, ContentDefinedChunker
+from .cancellation import in_current_call
+from .compression import detect_codec, open_reader, open_writer, resolve_codec
+from .docker_client import ClientRegistry, get_registry
+from .listing import glob_regex, label_selectors, labels_match, name_hint, paginate, validate_fields
+from .metrics import instrument_tools
+from .object_cache import get_object_cache, mark_changed
+from .resolver import get_container_resolver, is_exact
+from .throttle import RateLimiter
+from .volume_index import get_volume_usage_index, usage_snapshot
+
+
+VOLUME_LIST_FIELDS = ("name", "driver", "mountpoint", "scope", "created", "labels")
 
 
 class VolumeTools:
@@ -7,31 +26,93 @@ class VolumeTools:
     Helper class for Docker volume operations.
     """
     
-    def __init__(self):
-        """Initialize Docker client. Handles connection errors."""
-        try:
-            self.client = docker.from_env()
-            self.client.ping()
-        except docker.errors.DockerException as e:
-            raise RuntimeError(f"Docker connection failed: {str(e)}")
+    def __init__(self, registry: Optional[ClientRegistry] = None):
+        """Attach to the shared Docker client. Handles connection errors."""
+        self._registry = registry or get_registry()
+        self._registry.acquire()
+        instrument_tools(self, self._registry)
+    
+    @property
+    def client(self) -> docker.DockerClient:
+        """Shared Docker client (follows reconnects of the registry)."""
+        return self._registry.get()
     
-    def get_volume_list(self) -> List[Dict[str, Any]]:
-        """Get list of all volumes as JSON-serializable dictionaries."""
+    def get_volume_list(
+        self,
+        labels: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        dangling: Optional[bool] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get list of all volumes as JSON-serializable dictionaries.
+        
+        Args:
+            labels: Only volumes with these labels ("key" or "key=value", all must match)
+            name: Only volumes whose name matches this glob (e.g. "pgdata-*")
+            dangling: True for volumes no container uses, False for volumes in use
+            sort_by: Field to sort by (name, driver, mountpoint, scope, created)
+            descending: Sort in descending order
+            limit: Maximum number of volumes to return (enables pagination)
+            cursor: next_cursor from the previous page
+            fields: Fields to include in each entry (default: all)
+        
+        Returns:
+            List of volume dictionaries, or with limit/cursor a dictionary with
+            items, next_cursor (None on the last page), total and as_of
+            (nanoseconds since the epoch: the listing reflects every change before it)
+        """
+        selectors = label_selectors(labels)
+        validate_fields(VOLUME_LIST_FIELDS, sort_by, fields)
+        pattern = glob_regex(name) if name else None
+        as_of = time.time_ns()
         try:
-            volumes = self.client.volumes.list()
-            return [
+            cache = get_object_cache(self._registry)
+            snapshot = cache.snapshot("volume") if cache else None
+            usage = None
+            if snapshot is not None and dangling is not None:
+                # Dangling is answered by the usage index; without it the daemon filters.
+                index = get_volume_usage_index(self._registry)
+                mountpoints = {v["Name"]: v.get("Mountpoint", "") for v in snapshot[0]}
+                usage = index.all_usage(mountpoints) if index else None
+                if usage is None:
+                    snapshot = None
+            if snapshot is not None:
+                volumes, as_of = snapshot
+            else:
+                filters: Dict[str, Any] = {}
+                if selectors:
+                    filters["label"] = selectors
+                hint = name_hint(name) if name else None
+                if hint:
+                    filters["name"] = hint
+                if dangling is not None:
+                    filters["dangling"] = dangling
+                volumes = self.client.api.volumes(filters=filters or None).get("Volumes") or []
+            summaries = [
                 {
-                    "name": volume.name,
-                    "driver": volume.attrs.get("Driver", "unknown"),
-                    "mountpoint": volume.attrs.get("Mountpoint", ""),
-                    "scope": volume.attrs.get("Scope", "local"),
-                    "created": volume.attrs.get("CreatedAt", ""),
-                    "labels": volume.attrs.get("Labels", {}),
+                    "name": volume["Name"],
+                    "driver": volume.get("Driver", "unknown"),
+                    "mountpoint": volume.get("Mountpoint", ""),
+                    "scope": volume.get("Scope", "local"),
+                    "created": volume.get("CreatedAt", ""),
+                    "labels": volume.get("Labels", {}),
                 }
                 for volume in volumes
+                if labels_match(volume.get("Labels"), selectors)
+                and (pattern is None or pattern.fullmatch(volume["Name"]))
+                and (usage is None or dangling == (not usage.get(volume["Name"])))
             ]
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to list volumes: {str(e)}")
+        return paginate(
+            summaries, "name", VOLUME_LIST_FIELDS,
+            sort_by=sort_by, descending=descending, limit=limit, cursor=cursor, fields=fields, as_of=as_of,
+        )
     
     def _find_volume(self, volume_identifier: str):
         """
@@ -68,11 +149,13 @@ class VolumeTools:
             volume_identifier: Volume name or partial name
         """
         try:
-            volume = self._find_volume(volume_identifier)
-            attrs = volume.attrs
+            cache = get_object_cache(self._registry)
+            attrs = cache.lookup("volume", volume_identifier) if cache else None
+            if attrs is None:
+                attrs = self._find_volume(volume_identifier).attrs
             
             return {
-                "name": volume.name,
+                "name": attrs["Name"],
                 "driver": attrs.get("Driver", "unknown"),
                 "mountpoint": attrs.get("Mountpoint", ""),
                 "scope": attrs.get("Scope", "local"),
@@ -109,6 +192,7 @@ class VolumeTools:
                 driver_opts=driver_opts or {},
                 labels=labels or {}
             )
+            mark_changed(self._registry, "volume", volume.name)
             
             return {
                 "name": volume.name,
@@ -137,6 +221,7 @@ class VolumeTools:
             volume_name = volume.name
             
             volume.remove(force=force)
+            mark_changed(self._registry, "volume", volume_name)
             
             return {
                 "name": volume_name,
@@ -162,6 +247,7 @@ class VolumeTools:
         """
         try:
             result = self.client.volumes.prune()
+            mark_changed(self._registry, "volume")
             
             volumes_deleted = result.get("VolumesDeleted", []) or []
             space_reclaimed = result.get("SpaceReclaimed", 0)
@@ -206,112 +292,718 @@ class VolumeTools:
     def _find_container(self, container_identifier: str):
         """
         Find container by ID or name (supports partial name matching).
+        Uses the event-maintained container index when available.
         """
+        resolver = get_container_resolver(self._registry)
+        matches = resolver.resolve(container_identifier) if resolver else None
+        if matches and is_exact(matches, container_identifier):
+            try:
+                container = self.client.containers.get(matches[0][0])
+                if container_identifier in (container.id, container.name):
+                    return container
+            except docker.errors.NotFound:
+                # Removed before its destroy event arrived; ask the daemon below.
+                resolver.discard(matches[0][0])
+            matches = None
+        
         try:
+            # The daemon's exact ID/name lookup wins over partial index hits.
             return self.client.containers.get(container_identifier)
         except docker.errors.NotFound:
-            all_containers = self.client.containers.list(all=True)
-            matching = [
-                c for c in all_containers
-                if container_identifier.lower() in c.name.lower()
-                or container_identifier.lower() in c.id.lower()
-            ]
-            
-            if len(matching) == 1:
-                return matching[0]
-            elif len(matching) > 1:
-                names = [c.name for c in matching]
+            pass
+        
+        if matches:
+            if len(matches) > 1:
+                names = [name for _, name in matches]
                 raise ValueError(
                     f"Multiple containers match '{container_identifier}': {', '.join(names)}. "
                     f"Please be more specific."
                 )
-            else:
-                raise ValueError(f"Container '{container_identifier}' not found.")
+            try:
+                return self.client.containers.get(matches[0][0])
+            except docker.errors.NotFound:
+                resolver.discard(matches[0][0])
+        
+        all_containers = self.client.containers.list(all=True)
+        matching = [
+            c for c in all_containers
+            if container_identifier.lower() in c.name.lower()
+            or container_identifier.lower() in c.id.lower()
+        ]
+        
+        if len(matching) == 1:
+            return matching[0]
+        elif len(matching) > 1:
+            names = [c.name for c in matching]
+            raise ValueError(
+                f"Multiple containers match '{container_identifier}': {', '.join(names)}. "
+                f"Please be more specific."
+            )
+        else:
+            raise ValueError(f"Container '{container_identifier}' not found.")
     
     def get_volume_usage(self, volume_identifier: str) -> Dict[str, Any]:
         """
         Get which containers are using a specific volume.
         
+        Answered from the event-maintained volume -> containers index when
+        available, otherwise from a single container listing.
+        
         Args:
             volume_identifier: Volume name or partial name
         """
         try:
             volume = self._find_volume(volume_identifier)
             volume_name = volume.name
+            mountpoint = volume.attrs.get("Mountpoint", "")
             
-            # Find all containers using this volume
-            containers_using = []
-            all_containers = self.client.containers.list(all=True)
-            
-            for container in all_containers:
-                mounts = container.attrs.get("Mounts", [])
-                for mount in mounts:
-                    if mount.get("Name") == volume_name or mount.get("Source") == volume.attrs.get("Mountpoint"):
-                        containers_using.append({
-                            "id": container.id,
-                            "name": container.name,
-                            "status": container.status,
-                            "mount_destination": mount.get("Destination", ""),
-                            "read_write": mount.get("RW", True),
-                        })
-                        break
+            index = get_volume_usage_index(self._registry)
+            containers_using_volume = index.usage(volume_name, mountpoint) if index else None
+            if containers_using_volume is None:
+                containers_using_volume = usage_snapshot(
+                    self.client.api.containers(all=True), {volume_name: mountpoint}
+                )[volume_name]
             
             return {
                 "volume_name": volume_name,
-                "mountpoint": volume.attrs.get("Mountpoint", ""),
-                "containers_count": len(containers_using),
-                "containers": containers_using,
-                "in_use": len(containers_using) > 0,
+                "mountpoint": mountpoint,
+                "containers_count": len(containers_using_volume),
+                "containers": containers_using_volume,
+                "in_use": len(containers_using_volume) > 0,
             }
         except ValueError:
             raise
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to get volume usage: {str(e)}")
     
+    def get_all_volume_usage(self) -> Dict[str, Any]:
+        """
+        Get container usage for every volume in one call.
+        
+        Returns:
+            Dictionary with a volume name -> usage mapping plus lists of used and
+            unused volume names
+        """
+        try:
+            volumes = self.client.api.volumes().get("Volumes") or []
+            mountpoints = {v["Name"]: v.get("Mountpoint", "") for v in volumes}
+            
+            index = get_volume_usage_index(self._registry)
+            usage = index.all_usage(mountpoints) if index else None
+            if usage is None:
+                usage = usage_snapshot(self.client.api.containers(all=True), mountpoints)
+            
+            return {
+                "volumes": {
+                    name: {
+                        "mountpoint": mountpoints[name],
+                        "containers_count": len(entries),
+                        "containers": entries,
+                        "in_use": len(entries) > 0,
+                    }
+                    for name, entries in usage.items()
+                },
+                "in_use": sorted(name for name, entries in usage.items() if entries),
+                "unused": sorted(name for name, entries in usage.items() if not entries),
+            }
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to get volume usage: {str(e)}")
+    
+    def _create_helper(self, volume_name: str, container_image: str, read_only: bool = True):
+        """Create (but never start) a container with the volume mounted at /volume."""
+        kwargs = dict(
+            image=container_image,
+            command="true",
+            volumes={volume_name: {"bind": "/volume", "mode": "ro" if read_only else "rw"}},
+            labels={"docker-mcp.helper": "volume-archive"},
+        )
+        try:
+            return self.client.containers.create(**kwargs)
+        except docker.errors.ImageNotFound:
+            # Same behavior as containers.run(): pull the helper image on demand.
+            self.client.images.pull(container_image)
+            return self.client.containers.create(**kwargs)
+    
     def backup_volume(
         self,
         volume_identifier: str,
         backup_path: str,
-        container_image: str = "alpine"
+        container_image: str = "alpine",
+        compression: Optional[str] = "auto",
+        compression_level: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
     ) -> Dict[str, Any]:
         """
-        Backup a volume to a tar file using a temporary container.
+        Backup a volume to a (optionally compressed) tar file.
+        
+        The tar is streamed from the Docker archive API of a helper container that
+        is created but never started, compressed on the fly and written straight to
+        backup_path, so the archive is never held in memory. Entries are stored
+        under "volume/".
         
         Args:
             volume_identifier: Volume name or partial name
-            backup_path: Host path for backup file (e.g., "/backups/my-volume.tar")
-            container_image: Image to use for backup (default: alpine)
+            backup_path: Host path for backup file (e.g., "/backups/my-volume.tar.gz")
+            container_image: Image for the helper container (default: alpine)
+            compression: "auto" (from backup_path extension), "none", "gzip" or "zstd"
+            compression_level: Codec level (gzip 1-9, zstd 1-22; default: codec default)
+            chunk_size: Read size from the Docker API in bytes (default: 1 MiB)
         """
         try:
             volume = self._find_volume(volume_identifier)
-            volume_name = volume.name
-            
-            # Run a temporary container to create the backup
-            container = self.client.containers.run(
-                image=container_image,
-                command=f"tar cvf /backup/backup.tar -C /volume .",
-                volumes={
-                    volume_name: {"bind": "/volume", "mode": "ro"},
-                    backup_path.rsplit("/", 1)[0] or ".": {"bind": "/backup", "mode": "rw"}
-                },
-                remove=True,
-                detach=False
+            codec = resolve_codec(compression, backup_path)
+            return self._backup_to_file(
+                volume.name, backup_path, codec, compression_level, container_image, chunk_size
             )
+        except ValueError:
+            raise
+        except docker.errors.ImageNotFound:
+            raise ValueError(f"Image '{container_image}' not found. Try pulling it first.")
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to backup volume: {str(e)}")
+        except OSError as e:
+            raise RuntimeError(f"Failed to write backup '{backup_path}': {str(e)}")
+    
+    def _backup_to_file(
+        self,
+        volume_name: str,
+        backup_path: str,
+        codec: str,
+        compression_level: Optional[int],
+        container_image: str,
+        chunk_size: int,
+        limiter: Optional[RateLimiter] = None
+    ) -> Dict[str, Any]:
+        """Stream one volume archive to backup_path; Docker and OS errors propagate."""
+        helper = None
+        tmp_path = None
+        try:
+            backup_path = os.path.abspath(backup_path)
+            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+            
+            helper = self._create_helper(volume_name, container_image)
+            started = time.perf_counter()
+            stream, _ = self.client.api.get_archive(helper.id, "/volume", chunk_size=chunk_size)
+            
+            # Write next to the target and rename, so a failed backup never
+            # leaves a truncated file at backup_path.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(backup_path), suffix=".partial")
+            bytes_read = 0
+            with os.fdopen(fd, "wb") as out:
+                writer = open_writer(out, codec, compression_level)
+                for chunk in stream:
+                    if limiter is not None:
+                        limiter.consume(len(chunk))
+                    bytes_read += len(chunk)
+                    writer.write(chunk)
+                writer.close()
+                bytes_written = out.tell()
+            os.replace(tmp_path, backup_path)
+            tmp_path = None
+            elapsed = time.perf_counter() - started
             
             return {
                 "volume_name": volume_name,
                 "backup_path": backup_path,
+                "compression": codec,
+                "bytes_read": bytes_read,
+                "bytes_written": bytes_written,
+                "compression_ratio": round(bytes_read / bytes_written, 2) if bytes_written else 0,
+                "elapsed_seconds": round(elapsed, 3),
+                "throughput_mb_s": round(bytes_read / (1024 * 1024) / elapsed, 2) if elapsed else 0,
                 "status": "backed_up",
                 "message": f"Successfully backed up volume '{volume_name}' to '{backup_path}'",
             }
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            if helper is not None:
+                try:
+                    helper.remove(force=True)
+                except docker.errors.DockerException:
+                    pass
+    
+    def restore_volume(
+        self,
+        volume_identifier: str,
+        backup_path: str,
+        container_image: str = "alpine",
+        compression: Optional[str] = "auto",
+        create_volume: bool = False,
+        chunk_size: int = 1024 * 1024
+    ) -> Dict[str, Any]:
+        """
+        Restore a (possibly compressed) tar into a volume.
+        
+        The file is decompressed on the fly and streamed to the Docker archive
+        API of a helper container (created, never started) that mounts the
+        volume read-write at /volume, so memory use does not depend on the
+        archive size. Existing files with the same names are overwritten; other
+        files are left in place. Archives from backup_volume (entries under
+        "volume/") and plain tars of the volume contents are both accepted.
+        
+        Args:
+            volume_identifier: Volume name or partial name (exact name with create_volume)
+            backup_path: Backup file (e.g., "/backups/my-volume.tar.gz")
+            container_image: Image for the helper container (default: alpine)
+            compression: "auto" (detected from the file header), "none", "gzip" or "zstd"
+            create_volume: Create the volume if no volume has exactly this name
+            chunk_size: Read size from the backup file in bytes (default: 1 MiB)
+        """
+        try:
+            volume_name, created = self._restore_target(volume_identifier, create_volume)
+            result = self._restore_from_file(volume_name, backup_path, compression, container_image, chunk_size)
+            result["volume_created"] = created
+            return result
+        except ValueError:
+            raise
+        except docker.errors.ImageNotFound:
+            raise ValueError(f"Image '{container_image}' not found. Try pulling it first.")
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to restore volume: {str(e)}")
+        except OSError as e:
+            raise RuntimeError(f"Failed to read backup '{backup_path}': {str(e)}")
+    
+    def _restore_target(
+        self,
+        volume_identifier: str,
+        create_volume: bool,
+        exact: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        Name of the volume to restore into and whether it had to be created.
+        With exact, volume_identifier must name an existing volume exactly (no
+        partial-name matching) unless create_volume is set.
+        """
+        if not create_volume and not exact:
+            return self._find_volume(volume_identifier).name, False
+        try:
+            return self.client.volumes.get(volume_identifier).name, False
+        except docker.errors.NotFound:
+            if not create_volume:
+                raise ValueError(f"Volume '{volume_identifier}' not found.")
+            name = self.client.volumes.create(name=volume_identifier).name
+            mark_changed(self._registry, "volume", name)
+            return name, True
+    
+    @staticmethod
+    def _archive_root(header: bytes) -> str:
+        """
+        put_archive destination for a tar starting with header: "/" when entries
+        are already under "volume/" (backup_volume layout), else "/volume".
+        """
+        name = header[:100].split(b"\0", 1)[0].decode("utf-8", "replace")
+        prefix = header[345:500].split(b"\0", 1)[0].decode("utf-8", "replace") if header[257:262] == b"ustar" else ""
+        path = f"{prefix}/{name}" if prefix else name
+        path = path[2:] if path.startswith("./") else path
+        return "/" if path == "volume" or path.startswith("volume/") else "/volume"
+    
+    def _restore_from_file(
+        self,
+        volume_name: str,
+        backup_path: str,
+        compression: Optional[str],
+        container_image: str,
+        chunk_size: int,
+        limiter: Optional[RateLimiter] = None
+    ) -> Dict[str, Any]:
+        """Stream backup_path into a volume; Docker and OS errors propagate."""
+        backup_path = os.path.abspath(backup_path)
+        if not os.path.isfile(backup_path):
+            raise ValueError(f"Backup file '{backup_path}' not found")
+        with open(backup_path, "rb") as f:
+            if compression in (None, "auto"):
+                codec = resolve_codec(detect_codec(f.read(4)), "")
+                f.seek(0)
+            else:
+                codec = resolve_codec(compression, backup_path)
+            reader = open_reader(f, codec)
+            started = time.perf_counter()
+            bytes_read = self._put_stream(
+                volume_name, iter(lambda: reader.read(chunk_size), b""), container_image, limiter
+            )
+            reader.close()
+        elapsed = time.perf_counter() - started
+        
+        return {
+            "volume_name": volume_name,
+            "backup_path": backup_path,
+            "compression": codec,
+            "bytes_restored": bytes_read,
+            "backup_size": os.path.getsize(backup_path),
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_mb_s": round(bytes_read / (1024 * 1024) / elapsed, 2) if elapsed else 0,
+            "status": "restored",
+            "message": f"Successfully restored volume '{volume_name}' from '{backup_path}'",
+        }
+    
+    def _put_stream(
+        self,
+        volume_name: str,
+        chunks: Iterator[bytes],
+        container_image: str,
+        limiter: Optional[RateLimiter] = None
+    ) -> int:
+        """
+        Send a volume tar, given as an iterator of byte chunks, to the archive
+        API of a helper container mounting the volume. Returns the bytes sent.
+        """
+        head = b""
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= 512:
+                break
+        destination = self._archive_root(head)
+        helper = self._create_helper(volume_name, container_image, read_only=False)
+        bytes_read = 0
+        
+        def body():
+            nonlocal bytes_read
+            for chunk in itertools.chain((head,), chunks):
+                if not chunk:
+                    continue
+                if limiter is not None:
+                    limiter.consume(len(chunk))
+                bytes_read += len(chunk)
+                yield chunk
+        
+        try:
+            # A generator body is sent with chunked transfer encoding, so at
+            # most one chunk of the archive is held in memory.
+            self.client.api.put_archive(helper.id, destination, body())
+        finally:
+            try:
+                helper.remove(force=True)
+            except docker.errors.DockerException:
+                pass
+        return bytes_read
+    
+    def _volume_sizes(self) -> Dict[str, int]:
+        """Volume sizes in bytes from /system/df ({} if the daemon cannot compute them)."""
+        try:
+            volumes = self.client.api.df().get("Volumes") or []
+        except docker.errors.DockerException:
+            return {}
+        return {
+            v["Name"]: max((v.get("UsageData") or {}).get("Size", 0), 0)
+            for v in volumes
+        }
+    
+    def _run_batch(
+        self,
+        action: str,
+        operation: Callable[[str], Dict[str, Any]],
+        jobs: List[Tuple[str, int]],
+        workers: int
+    ) -> Dict[str, Any]:
+        """
+        Run operation for every (target, size) job on a bounded pool, submitting
+        the largest first so the long jobs do not start last and stretch the batch.
+        """
+        jobs = sorted(jobs, key=lambda job: job[1], reverse=True)
+        
+        def timed(target: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                result = {"target": target, "ok": True, "result": operation(target)}
+            except (ValueError, RuntimeError) as e:
+                result = {"target": target, "ok": False, "error": str(e)}
+            except (docker.errors.DockerException, OSError) as e:
+                result = {"target": target, "ok": False, "error": f"Failed to {action} volume: {str(e)}"}
+            result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+            return result
+        
+        workers = max(1, min(workers, len(jobs)))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(in_current_call(timed), [target for target, _ in jobs]))
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for r in results if not r["ok"])
+        transferred = sum(
+            r["result"].get("bytes_read", r["result"].get("bytes_restored", 0)) for r in results if r["ok"]
+        )
+        return {
+            "action": action,
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "workers": workers,
+            "order": [target for target, _ in jobs],
+            "bytes_transferred": transferred,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_mb_s": round(transferred / (1024 * 1024) / elapsed, 2) if elapsed else 0,
+            "results": results,
+            "message": f"{action}: {len(results) - failed}/{len(results)} volume(s) succeeded",
+        }
+    
+    @staticmethod
+    def _batch_workers(max_parallel: int, max_cpu: Optional[int], codec: str) -> int:
+        """Worker count: max_parallel, further capped by CPUs when (de)compressing."""
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be >= 1")
+        if codec == "none":
+            return max_parallel
+        return min(max_parallel, max_cpu or os.cpu_count() or 1)
+    
+    def backup_volumes(
+        self,
+        backup_dir: str,
+        volume_identifiers: Optional[List[str]] = None,
+        label: Optional[str] = None,
+        compression: str = "gzip",
+        compression_level: Optional[int] = None,
+        container_image: str = "alpine",
+        max_parallel: int = 4,
+        max_cpu: Optional[int] = None,
+        max_bandwidth_mb_s: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Back up many volumes concurrently to backup_dir/<volume>.tar[.gz|.zst].
+        
+        Volumes are ordered largest-first using sizes from /system/df. Each
+        backup keeps one CPU busy compressing, so concurrency is also capped at
+        max_cpu (default: CPU count) unless compression is "none"; the combined
+        read rate of all backups is capped at max_bandwidth_mb_s.
+        
+        Args:
+            backup_dir: Directory for the backup files (created if missing)
+            volume_identifiers: Volume names or partial names
+            label: Also include volumes with this label ("key" or "key=value")
+            compression: "none", "gzip" or "zstd" (default: gzip)
+            compression_level: Codec level (gzip 1-9, zstd 1-22; default: codec default)
+            container_image: Image for the helper containers (default: alpine)
+            max_parallel: Maximum concurrent backups (default: 4)
+            max_cpu: CPU cap on concurrent compressing backups (default: CPU count)
+            max_bandwidth_mb_s: Combined bandwidth cap in MB/s (default: unlimited)
+        """
+        codec = resolve_codec(compression, "")
+        workers = self._batch_workers(max_parallel, max_cpu, codec)
+        limiter = RateLimiter(max_bandwidth_mb_s * 1024 * 1024) if max_bandwidth_mb_s else None
+        extension = {"none": ".tar", "gzip": ".tar.gz", "zstd": ".tar.zst"}[codec]
+        try:
+            names = self._select_volumes(volume_identifiers, label)
+            sizes = self._volume_sizes()
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to select volumes: {str(e)}")
+        
+        def backup(volume_name: str) -> Dict[str, Any]:
+            path = os.path.join(backup_dir, volume_name + extension)
+            return self._backup_to_file(
+                volume_name, path, codec, compression_level, container_image, 1024 * 1024, limiter
+            )
+        
+        return self._run_batch("backup", backup, [(n, sizes.get(n, 0)) for n in names], workers)
+    
+    def restore_volumes(
+        self,
+        backup_dir: str,
+        volume_names: Optional[List[str]] = None,
+        container_image: str = "alpine",
+        create_volumes: bool = True,
+        max_parallel: int = 4,
+        max_cpu: Optional[int] = None,
+        max_bandwidth_mb_s: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Restore many volumes concurrently from backup_dir/<volume>.tar[.gz|.zst]
+        (the layout written by backup_volumes), largest backup file first, with
+        the same CPU and bandwidth caps as backup_volumes.
+        
+        Args:
+            backup_dir: Directory holding the backup files
+            volume_names: Only restore these volumes (default: every backup in backup_dir)
+            container_image: Image for the helper containers (default: alpine)
+            create_volumes: Create volumes that do not exist yet (default: True); when
+                            False, each backup restores only into the volume with
+                            exactly its name, and is reported as failed if none exists
+            max_parallel: Maximum concurrent restores (default: 4)
+            max_cpu: CPU cap on concurrent decompressing restores (default: CPU count)
+            max_bandwidth_mb_s: Combined bandwidth cap in MB/s (default: unlimited)
+        """
+        try:
+            entries = os.listdir(backup_dir)
+        except OSError as e:
+            raise ValueError(f"Cannot read backup directory '{backup_dir}': {str(e)}")
+        backups = {}
+        for entry in entries:
+            for suffix in (".tar.gz", ".tgz", ".tar.zst", ".tzst", ".tar"):
+                if entry.endswith(suffix):
+                    backups[entry[:-len(suffix)]] = os.path.join(backup_dir, entry)
+                    break
+        if volume_names is not None:
+            missing = [name for name in volume_names if name not in backups]
+            if missing:
+                raise ValueError(f"No backup found in '{backup_dir}' for: {', '.join(missing)}")
+            backups = {name: backups[name] for name in volume_names}
+        compressed = any(resolve_codec("auto", path) != "none" for path in backups.values())
+        workers = self._batch_workers(max_parallel, max_cpu, "gzip" if compressed else "none")
+        limiter = RateLimiter(max_bandwidth_mb_s * 1024 * 1024) if max_bandwidth_mb_s else None
+        
+        def restore(volume_name: str) -> Dict[str, Any]:
+            # Backup file names are volume names; never restore into a partial match.
+            target, created = self._restore_target(volume_name, create_volumes, exact=True)
+            result = self._restore_from_file(
+                target, backups[volume_name], "auto", container_image, 1024 * 1024, limiter
+            )
+            result["volume_created"] = created
+            return result
+        
+        jobs = [(name, os.path.getsize(path)) for name, path in backups.items()]
+        return self._run_batch("restore", restore, jobs, workers)
+    
+    def _select_volumes(self, volume_identifiers: Optional[List[str]], label: Optional[str]) -> List[str]:
+        """Targets for a batch operation: explicit identifiers plus volumes matching a label."""
+        names = [self._find_volume(identifier).name for identifier in volume_identifiers or []]
+        if label:
+            volumes = self.client.api.volumes(filters={"label": label}).get("Volumes") or []
+            names.extend(v["Name"] for v in volumes if v["Name"] not in names)
+        if not names:
+            raise ValueError("No volumes selected. Pass volume_identifiers and/or label.")
+        return names
+    
+    def backup_volume_incremental(
+        self,
+        volume_identifier: str,
+        store_dir: str,
+        container_image: str = "alpine",
+        chunk_compression: Optional[str] = "gzip",
+        compression_level: Optional[int] = None,
+        min_chunk_size: int = 1024 * 1024,
+        max_chunk_size: int = 8 * 1024 * 1024
+    ) -> Dict[str, Any]:
+        """
+        Incremental backup of a volume into a content-addressed chunk store.
+        
+        The volume tar (same stream as backup_volume) is split into
+        content-defined chunks; each unique chunk is stored once under
+        store_dir/chunks and every snapshot gets a manifest under
+        store_dir/manifests/<volume>/. Chunks already in the store from earlier
+        snapshots are not written again, so a snapshot of a volume that changed
+        a little only costs the changed chunks. Snapshots are restored with
+        restore_volume_incremental.
+        
+        Args:
+            volume_identifier: Volume name or partial name
+            store_dir: Chunk store directory (created if missing, shared across volumes)
+            container_image: Image for the helper container (default: alpine)
+            chunk_compression: Per-chunk codec: "none", "gzip" or "zstd" (default: gzip)
+            compression_level: Codec level (gzip 1-9, zstd 1-22; default: codec default)
+            min_chunk_size: Minimum chunk size in bytes (default: 1 MiB)
+            max_chunk_size: Maximum chunk size in bytes (default: 8 MiB)
+        """
+        helper = None
+        try:
+            volume = self._find_volume(volume_identifier)
+            volume_name = volume.name
+            chunker = ContentDefinedChunker(min_chunk_size, max_chunk_size)
+            store = ChunkStore(store_dir, chunk_compression, compression_level)
+            
+            helper = self._create_helper(volume_name, container_image)
+            started = time.perf_counter()
+            stream, _ = self.client.api.get_archive(helper.id, "/volume", chunk_size=min_chunk_size)
+            manifest = store.write_snapshot(volume_name, stream, chunker)
+            elapsed = time.perf_counter() - started
+            
+            total = manifest["total_bytes"]
+            return {
+                "volume_name": volume_name,
+                "store_dir": store.root,
+                "manifest_path": manifest["manifest_path"],
+                "snapshot": manifest["snapshot"],
+                "chunk_compression": store.codec,
+                "bytes_read": total,
+                "chunks": manifest["chunk_count"],
+                "new_chunks": manifest["new_chunks"],
+                "reused_chunks": manifest["chunk_count"] - manifest["new_chunks"],
+                "new_bytes": manifest["new_bytes"],
+                "bytes_written": manifest["stored_bytes"],
+                "dedup_ratio": round(total / manifest["new_bytes"], 2) if manifest["new_bytes"] else None,
+                "elapsed_seconds": round(elapsed, 3),
+                "throughput_mb_s": round(total / (1024 * 1024) / elapsed, 2) if elapsed else 0,
+                "status": "backed_up",
+                "message": (
+                    f"Successfully backed up volume '{volume_name}': {manifest['new_chunks']} of "
+                    f"{manifest['chunk_count']} chunks were new"
+                ),
+            }
         except ValueError:
             raise
         except docker.errors.ImageNotFound:
             raise ValueError(f"Image '{container_image}' not found. Try pulling it first.")
         except docker.errors.DockerException as e:
             raise RuntimeError(f"Failed to backup volume: {str(e)}")
+        except OSError as e:
+            raise RuntimeError(f"Failed to write to chunk store '{store_dir}': {str(e)}")
+        finally:
+            if helper is not None:
+                try:
+                    helper.remove(force=True)
+                except docker.errors.DockerException:
+                    pass
+    
+    def restore_volume_incremental(
+        self,
+        volume_identifier: str,
+        store_dir: str,
+        snapshot: Optional[str] = None,
+        source_volume: Optional[str] = None,
+        container_image: str = "alpine",
+        create_volume: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Restore a snapshot written by backup_volume_incremental into a volume.
+        
+        The snapshot's chunks are read from the store one at a time, checked
+        against their hashes and streamed to the archive API as in
+        restore_volume, so memory use does not depend on the volume size.
+        Existing files with the same names are overwritten; other files are
+        left in place.
+        
+        Args:
+            volume_identifier: Volume name or partial name (exact name with create_volume)
+            store_dir: Chunk store directory given to backup_volume_incremental
+            snapshot: Snapshot ID from the backup result (default: the latest snapshot)
+            source_volume: Volume the snapshot was taken of (default: the restored volume)
+            container_image: Image for the helper container (default: alpine)
+            create_volume: Create the volume if no volume has exactly this name
+        """
+        try:
+            if not os.path.isdir(os.path.join(store_dir, "manifests")):
+                raise ValueError(f"'{store_dir}' is not a chunk store")
+            store = ChunkStore(store_dir, compression=None)
+            if source_volume is None:
+                source_volume = volume_identifier if create_volume else self._find_volume(volume_identifier).name
+            manifest_path = store.snapshot_path(source_volume, snapshot)
+            chunks = store.iter_snapshot(manifest_path)
+            volume_name, created = self._restore_target(volume_identifier, create_volume)
+            
+            started = time.perf_counter()
+            bytes_read = self._put_stream(volume_name, chunks, container_image)
+            elapsed = time.perf_counter() - started
+            snapshot_id = os.path.basename(manifest_path)[:-len(".json")]
+            return {
+                "volume_name": volume_name,
+                "store_dir": store.root,
+                "source_volume": source_volume,
+                "snapshot": snapshot_id,
+                "bytes_restored": bytes_read,
+                "elapsed_seconds": round(elapsed, 3),
+                "throughput_mb_s": round(bytes_read / (1024 * 1024) / elapsed, 2) if elapsed else 0,
+                "volume_created": created,
+                "status": "restored",
+                "message": f"Successfully restored volume '{volume_name}' from snapshot '{snapshot_id}'",
+            }
+        except ValueError:
+            raise
+        except docker.errors.ImageNotFound:
+            raise ValueError(f"Image '{container_image}' not found. Try pulling it first.")
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to restore volume: {str(e)}")
+        except OSError as e:
+            raise RuntimeError(f"Failed to read chunk store '{store_dir}': {str(e)}")
     
     def close(self):
-        """Close Docker client connection."""
-        if hasattr(self, "client"):
-            self.client.close()
+        """Release the shared Docker client connection."""
+        if getattr(self, "_registry", None) is not None:
+            self._registry.release()
+            self._registry = None
\ No newline at end of file